@@ -1,22 +1,160 @@
 """
-This script runs the application using a development server.
+This script runs the application using a development server, or one of the
+production servers of servers.py when SERVER_MODE is 'threaded' or 'prefork'.
 """
 
+import atexit
 import bottle
 import os
 import sys
 
 # routes contains the HTTP handlers for our server and must be imported.
 import routes
+from logics.json_utils import start_record_writer, stop_record_writer, get_history_stats, set_log_worker
+from theory_algorithm import prebuild_theory
+from methods.render_cache import DEFAULT_CACHE_DIR, IMMUTABLE_CACHE_CONTROL, start_image_sweeper, stop_image_sweeper
+from methods.render_pool import start_render_pool, stop_render_pool
+from logics.batch_utils import start_batch_pool, stop_batch_pool
+from logics.lazy_imports import importtime_report
+from servers import ThreadedServer, PreforkServer, DEFAULT_KEEPALIVE_TIMEOUT
 
 if '--debug' in sys.argv[1:] or 'SERVER_DEBUG' in os.environ:
     # Debug mode will enable more verbose output in the console window.
     # It must be set at the beginning of the script.
     bottle.debug(True)
 
+if '--importtime' in sys.argv[1:] or 'SERVER_IMPORTTIME' in os.environ:
+    # Report what importing the application costs (a `python -X importtime` summary),
+    # e.g. to check that matplotlib is not loaded at start-up any more
+    print(importtime_report('routes'), file=sys.stderr)
+
+def start_background_writer():
+    """Starts write-behind of algorithm run records, configured through the
+    environment, and makes sure queued records are drained on exit.
+    Set RECORD_WRITER=off to keep writing records inside the request."""
+    # Load the history statistics now (rebuilding them from the log if the
+    # stats file is missing) instead of on the first algorithm request
+    get_history_stats()
+
+    if os.environ.get('RECORD_WRITER', 'on').lower() in ('0', 'off', 'false', 'no'):
+        return None
+
+    def env_number(name, default, cast):
+        try:
+            return cast(os.environ.get(name, default))
+        except ValueError:
+            return default
+
+    writer = start_record_writer(
+        max_queue_size=env_number('RECORD_QUEUE_SIZE', 1000, int),
+        flush_interval=env_number('RECORD_FLUSH_INTERVAL', 0.5, float),
+        flush_size=env_number('RECORD_FLUSH_SIZE', 200, int),
+        on_full=os.environ.get('RECORD_QUEUE_POLICY', 'block'),
+    )
+    atexit.register(stop_record_writer)
+    return writer
+
+def prepare_theory():
+    """Compiles all theory pages up front so Markdown rendering never runs
+    inside a request. Set THEORY_PREBUILD=off to compile them lazily."""
+    if os.environ.get('THEORY_PREBUILD', 'on').lower() in ('0', 'off', 'false', 'no'):
+        return
+    prebuild_theory()
+
+def start_render_sweeper():
+    """Starts the thread that keeps the directory of rendered graph images under
+    RENDER_CACHE_BYTES, sweeping every RENDER_SWEEP_INTERVAL seconds (0 disables it)."""
+    try:
+        interval = float(os.environ.get('RENDER_SWEEP_INTERVAL', '60'))
+    except ValueError:
+        interval = 60.0
+    if interval <= 0:
+        return None
+    sweeper = start_image_sweeper(interval)
+    atexit.register(stop_image_sweeper)
+    return sweeper
+
+def start_render_workers():
+    """Starts the pool of render processes (RENDER_WORKERS, 'auto' by default,
+    0 renders inside the request). Must run before the other background
+    threads are started, because the workers are forked from this process."""
+    pool = start_render_pool()
+    if pool is not None:
+        atexit.register(stop_render_pool)
+    return pool
+
+def start_batch_workers():
+    """Starts the pool of processes that run the jobs of /api/<algorithm>/batch
+    (BATCH_WORKERS, 0 by default: jobs run in the request thread). Like the
+    render pool it must be started before the other background threads."""
+    pool = start_batch_pool()
+    if pool is not None:
+        atexit.register(stop_batch_pool)
+    return pool
+
+def static_headers(filepath):
+    """Extra headers for a static file. Rendered graph images are named by the
+    hash of their content, so they can be cached by browsers and proxies forever.
+    A production server serving /static itself should send the same header for
+    /static/dynamic/graphs/."""
+    if filepath.startswith(DEFAULT_CACHE_DIR[len('static/'):] + '/'):
+        return {'Cache-Control': IMMUTABLE_CACHE_CONTROL}
+    return None
+
+def start_worker(worker_id):
+    """Runs in every process forked by the prefork server, before it serves
+    requests: each worker logs runs under its own id and starts its own render
+    pool and record writer. Only the first worker sweeps the image directory."""
+    base = os.environ.get('ALGORITHM_LOG_WORKER')
+    set_log_worker(f'{base}{worker_id}' if base else worker_id)
+    start_render_workers()
+    start_batch_workers()
+    start_background_writer()
+    if worker_id.startswith('w0'):
+        start_render_sweeper()
+
+def stop_worker(worker_id):
+    """Runs in a prefork worker after it stopped serving (atexit handlers are
+    not run in forked workers)."""
+    stop_record_writer()
+    stop_image_sweeper()
+    stop_render_pool()
+    stop_batch_pool()
+
+def env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+def server_options(mode):
+    """Returns the bottle server adapter and its options for SERVER_MODE:
+    'dev' (single-threaded wsgiref, the default), 'threaded' (SERVER_THREADS
+    threads with keep-alive) or 'prefork' (SERVER_WORKERS processes with
+    SERVER_THREADS threads each). SERVER_KEEPALIVE sets the idle timeout."""
+    if mode == 'dev':
+        return 'wsgiref', {}
+    try:
+        keepalive = float(os.environ.get('SERVER_KEEPALIVE', DEFAULT_KEEPALIVE_TIMEOUT))
+    except ValueError:
+        keepalive = DEFAULT_KEEPALIVE_TIMEOUT
+    options = {'threads': env_int('SERVER_THREADS', 8), 'keepalive_timeout': keepalive}
+    if mode == 'threaded':
+        return ThreadedServer, options
+    if mode == 'prefork':
+        options.update(workers=env_int('SERVER_WORKERS', os.cpu_count() or 1),
+                       on_worker_start=start_worker, on_worker_exit=stop_worker)
+        return PreforkServer, options
+    raise ValueError(f"Unknown SERVER_MODE {mode!r}, expected 'dev', 'threaded' or 'prefork'")
+
 def wsgi_app():
     """Returns the application to make available through wfastcgi. This is used
     when the site is published to Microsoft Azure."""
+    prepare_theory()
+    start_render_workers()
+    start_batch_workers()
+    start_background_writer()
+    start_render_sweeper()
     return bottle.default_app()
 
 if __name__ == '__main__':
@@ -33,7 +171,34 @@ if __name__ == '__main__':
         """Handler for static files, used with the development server.
         When running under a production server such as IIS or Apache,
         the server should be configured to serve the static files."""
-        return bottle.static_file(filepath, root=STATIC_ROOT)
+        response = bottle.static_file(filepath, root=STATIC_ROOT)
+        # Set on the response rather than passed as headers=, which bottle 0.12 lacks;
+        # error responses (missing file, denied path) are not cached
+        if response.status_code < 400:
+            for name, value in (static_headers(filepath) or {}).items():
+                response.set_header(name, value)
+        return response
+
+    MODE = os.environ.get('SERVER_MODE', 'dev').lower()
+    if MODE == 'prefork' and not hasattr(os, 'fork'):
+        print("SERVER_MODE=prefork needs os.fork, using the threaded server", file=sys.stderr)
+        MODE = 'threaded'
+    server, options = server_options(MODE)
 
-    # Starts a local test server.
-    bottle.run(server='wsgiref', host=HOST, port=PORT)
+    # In prefork mode everything imported and prepared so far is shared copy-on-write
+    # by the workers, which start their own pools and threads (start_worker)
+    prepare_theory()
+    if MODE != 'prefork':
+        start_render_workers()
+        start_batch_workers()
+        start_background_writer()
+        start_render_sweeper()
+
+    # Starts the server (a local test server by default).
+    try:
+        bottle.run(server=server, host=HOST, port=PORT, **options)
+    finally:
+        # Drain queued run records before the process exits
+        stop_record_writer()
+        stop_render_pool()
+        stop_batch_pool()
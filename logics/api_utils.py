@@ -0,0 +1,310 @@
+import os
+import json
+import time
+
+from methods.bfs_spanning_tree import bfs_tree, draw_bfs_graph, DISCONNECTED_ERROR
+from methods.dfs_spanning_tree import create_spanning_tree, save_graph_image
+from methods.beam_search_spanning_tree import beam_search_spanning_tree, draw_graph
+from methods.graph_coloring_algorithm import greedy_graph_coloring, draw_colored_graph
+from methods.graph import Graph
+from logics.json_utils import save_algorithm_record
+from logics.record_codec import encode_edges
+
+API_ALGORITHMS = ['bfs', 'dfs', 'beam', 'coloring']
+
+
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+# Largest graph accepted by the API
+API_MAX_VERTICES = _env_int('API_MAX_VERTICES', 1000)
+
+# Beam search keeps every partial tree it generates, so its run time grows exponentially
+# with the number of vertices on sparse graphs (about 3 s for 12 vertices)
+API_MAX_BEAM_VERTICES = _env_int('API_MAX_BEAM_VERTICES', 10)
+
+# Largest accepted request body
+API_MAX_BODY_BYTES = _env_int('API_MAX_BODY_BYTES', 8 * 1024 * 1024)
+
+
+class ApiError(ValueError):
+    """Invalid API request; status is the HTTP status code to answer with."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _vertex(value, n, name):
+    """Validates a 1-based vertex number and returns it 0-based."""
+    if isinstance(value, bool) or not isinstance(value, int) or not (1 <= value <= n):
+        raise ApiError(f"'{name}' must be a vertex number between 1 and {n}")
+    return value - 1
+
+
+def _weight(value, name):
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        raise ApiError(f"'{name}' must be a positive number")
+    return value
+
+
+def parse_graph(job, algorithm, max_vertices=None):
+    """
+    Function: parse_graph
+    Description:
+        Reads the graph of an API job. The graph is given either as an edge list or
+        as matrices, vertices are numbered from 1 as on the web pages:
+            {"num_vertices": 4, "edges": [[1, 2], [2, 3, 5], ...]}      (optional third item: weight)
+            {"adjacency_matrix": [[0, 1], [1, 0]], "weight_matrix": [[0, 5], [5, 0]]}
+        Beam search needs a positive weight for every edge.
+
+    Parameters:
+        job (dict): Decoded JSON job.
+        algorithm (str): 'bfs', 'dfs', 'beam' or 'coloring'.
+        max_vertices (int): Largest accepted graph; API_MAX_VERTICES (API_MAX_BEAM_VERTICES for beam) by default.
+
+    Returns:
+        tuple: (n, graph) with the Graph (methods/graph.py); it is weighted only for 'beam'.
+        Raises ApiError on invalid input.
+    """
+    weighted = algorithm == 'beam'
+    limit = max_vertices or (API_MAX_BEAM_VERTICES if weighted else API_MAX_VERTICES)
+
+    if 'adjacency_matrix' in job:
+        adjacency = job['adjacency_matrix']
+        if not isinstance(adjacency, list) or not adjacency:
+            raise ApiError("'adjacency_matrix' must be a non-empty list of rows")
+        n = len(adjacency)
+    else:
+        n = job.get('num_vertices')
+        if isinstance(n, bool) or not isinstance(n, int) or n < 1:
+            raise ApiError("'num_vertices' must be a positive integer")
+    if n > limit:
+        raise ApiError(f"Graphs with more than {limit} vertices are not accepted for {algorithm}", 413)
+
+    if 'adjacency_matrix' in job:
+        weight_matrix = job.get('weight_matrix')
+        if weighted and weight_matrix is None:
+            raise ApiError("'weight_matrix' is required for beam search")
+        for matrix, name in ((adjacency, 'adjacency_matrix'), (weight_matrix, 'weight_matrix')):
+            if matrix is not None and (not isinstance(matrix, list) or len(matrix) != n
+                                       or any(not isinstance(row, list) or len(row) != n for row in matrix)):
+                raise ApiError(f"'{name}' must be a {n} x {n} matrix")
+        for i in range(n):
+            if adjacency[i][i] != 0:
+                raise ApiError(f"Self-loop detected at vertex {i + 1}")
+            for j in range(n):
+                if adjacency[i][j] not in (0, 1) or isinstance(adjacency[i][j], bool):
+                    raise ApiError(f"Invalid value at ({i + 1},{j + 1}) - must be 0 or 1")
+                if adjacency[i][j] != adjacency[j][i]:
+                    raise ApiError(f"Matrix must be symmetric at ({i + 1},{j + 1})")
+                if weighted and adjacency[i][j]:
+                    _weight(weight_matrix[i][j], f'weight_matrix[{i + 1}][{j + 1}]')
+        return n, Graph.from_matrix(adjacency, weight_matrix if weighted else None)
+
+    edges = job.get('edges', [])
+    if not isinstance(edges, list):
+        raise ApiError("'edges' must be a list of [u, v] or [u, v, weight] items")
+    # The graph is built from the edges directly: no n x n matrix for an edge-list job
+    parsed = []
+    for index, edge in enumerate(edges):
+        if not isinstance(edge, list) or len(edge) not in (2, 3):
+            raise ApiError(f"'edges[{index}]' must be [u, v] or [u, v, weight]")
+        u = _vertex(edge[0], n, f'edges[{index}][0]')
+        v = _vertex(edge[1], n, f'edges[{index}][1]')
+        if u == v:
+            raise ApiError(f"Self-loop detected at vertex {u + 1}")
+        if weighted:
+            if len(edge) != 3:
+                raise ApiError(f"'edges[{index}]' needs a weight for beam search")
+            parsed.append((u, v, _weight(edge[2], f'edges[{index}][2]')))
+        else:
+            parsed.append((u, v))
+    return n, Graph.from_edges(n, parsed, weighted)
+
+
+def _image_url(path):
+    # Pages get file paths with or without the leading slash, the coloring page a data URI
+    if path is None or path.startswith(('/', 'data:')):
+        return path
+    return '/' + path
+
+
+def _encoded_tree(n, edges):
+    # The tree matrix of the record as a record_codec edge list, built from the tree edges
+    return encode_edges(n, sorted((min(u, v), max(u, v), 1) for u, v in edges))
+
+
+def run_api_job(algorithm, job):
+    """
+    Function: run_api_job
+    Description:
+        Runs one algorithm on the graph of a decoded JSON job and returns the result
+        as a JSON-ready dict. No page is rendered and a picture is drawn only when
+        the job asks for it with "image": true. The run is saved to the history
+        like runs started from the web pages.
+
+    Parameters and return value: see execute_api_job.
+    """
+    payload, status, record = execute_api_job(algorithm, job)
+    if record is not None:
+        save_algorithm_record(**record)
+    return payload, status
+
+
+def execute_api_job(algorithm, job, max_vertices=None):
+    """
+    Function: execute_api_job
+    Description:
+        Does the work of run_api_job without saving the run, so it can also run in a
+        worker process (see logics/batch_utils.py); the caller saves the returned record.
+
+    Parameters:
+        algorithm (str): 'bfs', 'dfs', 'beam' or 'coloring'.
+        job (dict): The graph (see parse_graph) and the options:
+            - 'start_vertex' (int): Start vertex, numbered from 1 (bfs, dfs, beam; default 1).
+            - 'beam_width' (int): Beam width of beam search (default 2).
+            - 'image' (bool): Also draw the picture and return its URL (default false).
+        max_vertices (int): Largest accepted graph (see parse_graph).
+
+    Returns:
+        tuple:
+            payload (dict): The result, with vertices numbered from 1:
+                - bfs/dfs: 'visit_order' and 'tree_edges' ([parent, child] in visit order),
+                - beam: 'tree_edges' ([u, v, weight]) and 'total_weight',
+                - coloring: 'colors' (color of every vertex) and 'num_colors',
+                plus 'image' when requested, or an 'error' message.
+            status (int): HTTP status code (200; 400 for invalid input, 404 for an unknown
+                algorithm, 413 for a too large graph, 422 if no spanning tree exists).
+            record (dict or None): Arguments of save_algorithm_record for the run,
+                None if the job was rejected before the algorithm ran.
+    """
+    algorithm = algorithm.lower()
+    if algorithm not in API_ALGORITHMS:
+        return {'error': f"Unknown algorithm: {algorithm}"}, 404, None
+    if not isinstance(job, dict):
+        return {'error': "The job must be a JSON object"}, 400, None
+
+    started = time.perf_counter()
+    try:
+        n, graph = parse_graph(job, algorithm, max_vertices)
+        start_vertex = _vertex(job.get('start_vertex', 1), n, 'start_vertex') + 1
+        beam_width = job.get('beam_width', 2)
+        if isinstance(beam_width, bool) or not isinstance(beam_width, int) or beam_width < 1:
+            raise ApiError("'beam_width' must be a positive integer")
+        with_image = job.get('image', False)
+        if not isinstance(with_image, bool):
+            raise ApiError("'image' must be true or false")
+    except ApiError as e:
+        return {'error': str(e)}, e.status, None
+
+    payload = {'algorithm': algorithm, 'num_vertices': n}
+    error = None
+    result_matrix = None
+    image = None
+
+    if algorithm == 'bfs':
+        # The edge list is all the API needs: no n x n tree matrix is built
+        _, visit_order, tree_edges = bfs_tree(graph, start_vertex - 1)
+        if len(visit_order) != n:
+            error = DISCONNECTED_ERROR
+        else:
+            payload['start_vertex'] = start_vertex
+            payload['visit_order'] = [v + 1 for v in visit_order]
+            payload['tree_edges'] = [[u + 1, v + 1] for u, v in tree_edges]
+            if with_image:
+                image = draw_bfs_graph(None, graph, n, tree_edges)
+            result_matrix = _encoded_tree(n, tree_edges)
+
+    elif algorithm == 'dfs':
+        G, T, result_matrix, visit_order, error = create_spanning_tree(graph, start_vertex)
+        if error is None:
+            # In preorder a parent comes before its children, so orienting the tree edges
+            # by preorder position gives the DFS discovery edges in discovery order
+            position = {vertex - 1: index for index, vertex in enumerate(visit_order)}
+            oriented = [(u, v) if position[u] < position[v] else (v, u) for u, v in T.edges]
+            oriented.sort(key=lambda edge: position[edge[1]])
+            payload['start_vertex'] = start_vertex
+            payload['visit_order'] = visit_order
+            payload['tree_edges'] = [[u + 1, v + 1] for u, v in oriented]
+            if with_image:
+                image = save_graph_image(G, T, root=start_vertex - 1)
+            result_matrix = _encoded_tree(n, oriented)
+
+    elif algorithm == 'beam':
+        result = beam_search_spanning_tree(n, graph, None, start_vertex - 1, beam_width)
+        if isinstance(result, str):
+            error = result
+        else:
+            result_matrix = result
+            tree_edges = [[i + 1, j + 1, graph.weight(i, j)] for i in range(n) for j in range(i + 1, n) if result[i][j]]
+            payload['start_vertex'] = start_vertex
+            payload['tree_edges'] = tree_edges
+            payload['total_weight'] = sum(edge[2] for edge in tree_edges)
+            if with_image:
+                image = draw_graph(result, graph, None, n)
+
+    else:
+        coloring, num_colors, _ = greedy_graph_coloring(graph)
+        result_matrix = [{'vertex': v, 'color_id': c} for v, c in sorted(coloring.items())]
+        payload['colors'] = [coloring[v] for v in range(n)]
+        payload['num_colors'] = num_colors
+        if with_image:
+            image = draw_colored_graph(graph, coloring, num_colors)
+
+    duration_ms = (time.perf_counter() - started) * 1000
+    record = dict(
+        algorithm=algorithm,
+        input_data={
+            'num_vertices': n,
+            # Edge lists in the form of record_codec, so the record grows with the edges, not n^2
+            'adjacency_matrix': encode_edges(n, ((u, v, 1) for u, v in graph.edges())),
+            'weight_matrix': encode_edges(n, graph.weighted_edges()) if graph.weights is not None else None,
+            'start_vertex': start_vertex
+        },
+        result_matrix=result_matrix,
+        error_message=error,
+        duration_ms=duration_ms
+    )
+
+    if error is not None:
+        return {'algorithm': algorithm, 'error': error}, 422, record
+    if with_image:
+        # None when the picture took longer than RENDER_TIMEOUT
+        payload['image'] = _image_url(image)
+    payload['duration_ms'] = round(duration_ms, 3)
+    return payload, 200, record
+
+
+def get_api_data(request, algorithm):
+    """
+    Function: get_api_data
+    Description:
+        Handles POST /api/<algorithm>: decodes the JSON body and runs the job (see run_api_job).
+
+    Parameters:
+        request (object): The HTTP request object with a JSON body.
+        algorithm (str): 'bfs', 'dfs', 'beam' or 'coloring'.
+
+    Returns:
+        tuple: (payload, status) as returned by run_api_job.
+    """
+    if algorithm.lower() not in API_ALGORITHMS:
+        return {'error': f"Unknown algorithm: {algorithm}"}, 404
+
+    length = request.content_length
+    if length > API_MAX_BODY_BYTES:
+        return {'error': f"The request body is larger than {API_MAX_BODY_BYTES} bytes"}, 413
+    body = request.body.read(API_MAX_BODY_BYTES + 1)
+    if len(body) > API_MAX_BODY_BYTES:
+        return {'error': f"The request body is larger than {API_MAX_BODY_BYTES} bytes"}, 413
+    try:
+        job = json.loads(body)
+    except (ValueError, UnicodeDecodeError):
+        return {'error': "The request body must be valid JSON"}, 400
+
+    return run_api_job(algorithm, job)
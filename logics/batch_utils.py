@@ -0,0 +1,235 @@
+"""
+Streaming batch runs of the JSON API: newline-delimited JSON jobs in, one JSON
+result line out per job.
+
+The request body is read line by line while the results are written, so a batch
+of any size needs memory for only a few jobs at a time. Every result line holds
+the 0-based 'index' of its job line, the job's 'id' if it had one and the HTTP
+'status' the job would get from /api/<algorithm>.
+
+With BATCH_WORKERS > 0 (see app.py) the jobs run in a pool of worker processes
+and the results are written in the order the jobs finish; at most
+BATCH_WINDOW jobs per worker are in flight. Without the pool the jobs run one
+after another in the request thread, in input order.
+"""
+
+import os
+import json
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+from logics.api_utils import execute_api_job, API_ALGORITHMS, API_MAX_BODY_BYTES
+from logics.json_utils import save_algorithm_record
+from methods.render_pool import forget_render_pool
+
+# Jobs in flight per pool worker
+try:
+    BATCH_WINDOW = max(1, int(os.environ.get('BATCH_WINDOW', '4')))
+except ValueError:
+    BATCH_WINDOW = 4
+
+# Longest accepted job line
+MAX_LINE_BYTES = API_MAX_BODY_BYTES
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _init_worker():
+    # A worker forked after the render pool was started must not use the parent's
+    # pool object; pictures requested by batch jobs are drawn in the worker itself
+    forget_render_pool()
+
+
+def _ping():
+    return os.getpid()
+
+
+def default_workers():
+    """Number of batch workers from BATCH_WORKERS ('auto' = one per CPU; 0 = no pool, the default)."""
+    value = os.environ.get('BATCH_WORKERS', '0').lower()
+    if value == 'auto':
+        return os.cpu_count() or 1
+    try:
+        return max(0, int(value))
+    except ValueError:
+        return 0
+
+
+def start_batch_pool(workers=None):
+    """
+    Starts the pool of batch workers (once per process). Returns the pool, or None
+    when the configured number of workers is 0. Like the render pool it has to be
+    started before other background threads, because the workers are forked.
+    """
+    global _pool, _pool_workers
+    workers = default_workers() if workers is None else workers
+    if workers <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+            _pool_workers = workers
+            # Fork every worker now, while the process has no request threads yet
+            for future in [_pool.submit(_ping) for _ in range(workers)]:
+                future.result()
+    return _pool
+
+
+def stop_batch_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def iter_body_lines(stream, length, max_line=None):
+    """
+    Yields the non-empty lines of a request body of the given length, read from the
+    stream piece by piece. A line longer than max_line is skipped and yielded as None.
+    """
+    max_line = MAX_LINE_BYTES if max_line is None else max_line
+    remaining = length
+    while remaining > 0:
+        line = stream.readline(min(remaining, max_line + 1))
+        if not line:
+            break
+        remaining -= len(line)
+        if len(line) > max_line:
+            # Skip the rest of the oversized line
+            while remaining > 0 and not line.endswith(b'\n'):
+                line = stream.readline(min(remaining, 65536))
+                if not line:
+                    break
+                remaining -= len(line)
+            yield None
+        elif line.strip():
+            yield line
+
+
+def _decode_job(line):
+    # Returns (job, None), or (None, outcome) for a line that is not a job
+    if line is None:
+        return None, ({'error': f"The job line is longer than {MAX_LINE_BYTES} bytes"}, 413, None)
+    try:
+        return json.loads(line), None
+    except (ValueError, UnicodeDecodeError):
+        return None, ({'error': "The job line must be valid JSON"}, 400, None)
+
+
+def _result_line(index, job, payload, status):
+    line = {'index': index}
+    if isinstance(job, dict) and 'id' in job:
+        line['id'] = job['id']
+    line['status'] = status
+    line.update(payload)
+    return (json.dumps(line) + '\n').encode('utf-8')
+
+
+def _finish(index, job, outcome):
+    # Saves the run in this process (workers do not write the history) and encodes the result
+    payload, status, record = outcome
+    if record is not None:
+        save_algorithm_record(**record)
+    return _result_line(index, job, payload, status)
+
+
+def _execute_here(algorithm, job):
+    # Runs one job in this process; a failing job becomes an error result, not a broken stream
+    try:
+        return execute_api_job(algorithm, job)
+    except Exception as e:
+        return {'error': f"Internal error: {e}"}, 500, None
+
+
+def _run_inline(algorithm, lines):
+    for index, line in enumerate(lines):
+        job, rejected = _decode_job(line)
+        if rejected is not None:
+            yield _finish(index, None, rejected)
+            continue
+        yield _finish(index, job, _execute_here(algorithm, job))
+
+
+def _run_pooled(pool, algorithm, lines, window):
+    pending = {}
+
+    def collect(futures):
+        for future in futures:
+            index, job = pending.pop(future)
+            try:
+                outcome = future.result()
+            except Exception as e:
+                outcome = {'error': f"Internal error: {e}"}, 500, None
+            yield _finish(index, job, outcome)
+
+    for index, line in enumerate(lines):
+        job, rejected = _decode_job(line)
+        if rejected is not None:
+            yield _finish(index, None, rejected)
+            continue
+        try:
+            pending[pool.submit(execute_api_job, algorithm, job)] = (index, job)
+        except BrokenProcessPool:
+            # A worker died (e.g. killed by the OS): the rest of the batch runs here
+            yield _finish(index, job, _execute_here(algorithm, job))
+            continue
+        # Write what is done already; wait only when the window is full
+        yield from collect([future for future in pending if future.done()])
+        while len(pending) >= window:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            yield from collect(done)
+
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        yield from collect(done)
+
+
+def run_batch(algorithm, lines):
+    """
+    Function: run_batch
+    Description:
+        Runs the algorithm on every job line and yields one encoded NDJSON result line per
+        job as soon as it is available. Jobs are the objects accepted by /api/<algorithm>.
+
+    Parameters:
+        algorithm (str): 'bfs', 'dfs', 'beam' or 'coloring'.
+        lines (iterable): Job lines (bytes), e.g. from iter_body_lines.
+
+    Returns:
+        generator: Result lines (bytes ending with a newline).
+    """
+    pool = _pool
+    if pool is None:
+        return _run_inline(algorithm, lines)
+    return _run_pooled(pool, algorithm, lines, _pool_workers * BATCH_WINDOW)
+
+
+def get_batch_data(request, algorithm):
+    """
+    Function: get_batch_data
+    Description:
+        Handles POST /api/<algorithm>/batch: streams the NDJSON request body through run_batch.
+
+    Parameters:
+        request (object): The HTTP request; the body is read from wsgi.input as it is consumed.
+        algorithm (str): 'bfs', 'dfs', 'beam' or 'coloring'.
+
+    Returns:
+        tuple:
+            body (generator or dict): Result lines, or an 'error' payload.
+            status (int): 200, 404 for an unknown algorithm, 411 without Content-Length.
+    """
+    algorithm = algorithm.lower()
+    if algorithm not in API_ALGORITHMS:
+        return {'error': f"Unknown algorithm: {algorithm}"}, 404
+    length = request.content_length
+    if length < 0:
+        return {'error': "The batch request needs a Content-Length"}, 411
+
+    # Read the raw input instead of request.body, which would buffer the whole batch first
+    stream = request.environ['wsgi.input']
+    return run_batch(algorithm, iter_body_lines(stream, length)), 200
@@ -1,5 +1,7 @@
+import time
 from datetime import datetime
-from methods.beam_search_spanning_tree import beam_search_spanning_tree
+from methods.beam_search_spanning_tree import beam_search_spanning_tree, draw_graph
+from methods.graph import Graph
 from logics.json_utils import save_algorithm_record
 
 def get_data(request):
@@ -9,7 +11,7 @@ def get_data(request):
         Processes an HTTP request containing input data for constructing a graph and
         running the Beam Search Spanning Tree algorithm on it.
         Extracts and validates form inputs, builds adjacency and weight matrices,
-        executes the algorithm, handles possible errors,
+        executes the algorithm, draws the resulting tree, handles possible errors,
         and saves the input and result (or error) using save_algorithm_record.
 
     Parameters:
@@ -26,6 +28,7 @@ def get_data(request):
                 - 'weights' (list of lists of int): Weight matrix.
             result (object): Algorithm result (matrix or error message string).
             result_is_error (bool): True if result is an error message, False otherwise.
+            image_path (str | None): Path of the tree image (unique per result), or None.
     """
     # Default number of vertices if the user does not specify one
     default_n = 2
@@ -40,9 +43,12 @@ def get_data(request):
     # Initialize variables to hold the algorithm result and error status
     result = None
     result_is_error = False
+    image_path = None
 
     # Process the input only if the HTTP method is POST (form submission)
     if request.method == 'POST':
+        # Measure the processing time of the request for the history statistics
+        started = time.perf_counter()
         try:
             # Retrieve and validate the number of vertices from form input
             n_str = request.forms.get('n', str(default_n)).strip()
@@ -89,13 +95,19 @@ def get_data(request):
             # Define fixed start vertex and beam width for the algorithm
             start = 0
             beam_width = 2
+            # The weighted graph is built once and shared by the algorithm and the drawing
+            graph = Graph.from_matrix(adjacency, weights)
             # Execute the beam search spanning tree algorithm
-            tree_result = beam_search_spanning_tree(n, adjacency, weights, start, beam_width)
+            tree_result = beam_search_spanning_tree(n, graph, None, start, beam_width)
 
             # Determine if the result is an error (string) or valid output (matrix)
             result_is_error = isinstance(tree_result, str)
             result = tree_result
 
+            # Draw the graph with the tree; the image is named by the hash of its content
+            if not result_is_error:
+                image_path = draw_graph(result, graph, None, n)
+
             # Save the input and result or error message to a JSON record
             save_algorithm_record(
                 algorithm='beam',
@@ -105,13 +117,15 @@ def get_data(request):
                     'weight_matrix': weights
                 },
                 result_matrix=None if result_is_error else result,
-                error_message=result if result_is_error else None
+                error_message=result if result_is_error else None,
+                duration_ms=(time.perf_counter() - started) * 1000
             )
 
         except Exception as e:
             # Handle exceptions, prepare an error message, and mark as error
             result = f"Error: {e}"
             result_is_error = True
+            image_path = None
 
             # Save the error and last known input data for logging
             save_algorithm_record(
@@ -122,8 +136,9 @@ def get_data(request):
                     'weight_matrix': form_data['weights']
                 },
                 result_matrix=None,
-                error_message=result
+                error_message=result,
+                duration_ms=(time.perf_counter() - started) * 1000
             )
 
-    # Return the form data, the algorithm's output or error, and the error flag
-    return form_data, result, result_is_error
\ No newline at end of file
+    # Return the form data, the algorithm's output or error, the error flag and the image path
+    return form_data, result, result_is_error, image_path
\ No newline at end of file
@@ -1,5 +1,7 @@
 import os
+import time
 from methods.bfs_spanning_tree import bfs_spanning_tree, draw_bfs_graph
+from methods.graph import Graph
 from theory_algorithm import get_theory
 from bottle import request
 from logics.json_utils import save_algorithm_record
@@ -41,6 +43,8 @@ def get_bfs_data(request):
 
     # Обработка POST-запроса (пользователь нажал "Build Graph")
     if request.method == 'POST':
+        # Засекаем время обработки запроса для статистики
+        started = time.perf_counter()
         try:
             # Получаем количество вершин и проверяем корректность
             num_vertices_str = request.forms.get('num_vertices')
@@ -79,8 +83,11 @@ def get_bfs_data(request):
                     if adjacency_matrix[i][j] != adjacency_matrix[j][i]:
                         raise ValueError(f"Matrix must be symmetric at ({i},{j})")
 
+            # Граф строится один раз: его используют и обход, и рисунок
+            graph = Graph.from_matrix(adjacency_matrix)
+
             # Выполнение BFS и построение остовного дерева
-            result_matrix, tree_vertices, bfs_edges = bfs_spanning_tree(num_vertices, adjacency_matrix, start_vertex)
+            result_matrix, tree_vertices, bfs_edges = bfs_spanning_tree(num_vertices, graph, start_vertex)
 
             # Обработка возможной ошибки в виде строки
             if isinstance(result_matrix, str):
@@ -90,14 +97,15 @@ def get_bfs_data(request):
                 bfs_edges = None
             else:
                 # Отрисовка изображения графа на основе результата
-                graph_image_path = draw_bfs_graph(result_matrix, adjacency_matrix, num_vertices, bfs_edges)
+                graph_image_path = draw_bfs_graph(result_matrix, graph, num_vertices, bfs_edges)
 
         except Exception as e:
             # Обработка исключений и вывод сообщения об ошибке
             error_message = str(e)
 
         # Сохранение записи в JSON только после нажатия "Build Graph"
-        save_algorithm_record('bfs', form_data, result_matrix, error_message)
+        duration_ms = (time.perf_counter() - started) * 1000
+        save_algorithm_record('bfs', form_data, result_matrix, error_message, duration_ms)
 
     # При GET-запросе или при наличии ошибки — используем дефолтные значения
     if request.method == 'GET' or error_message:
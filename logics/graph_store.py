@@ -0,0 +1,217 @@
+"""
+Content-addressed storage of input graphs for the run log.
+
+Users often resubmit the same graph (changing only the start vertex), so the
+matrices of a run are stored once under a hash of their canonical form and
+run records keep only the hash. Every submission of a graph bumps its hit
+counter, in the JSON Lines store as in the SQLite one.
+"""
+
+import os
+import json
+import struct
+import hashlib
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the threads of one process are serialized
+    fcntl = None
+
+from logics.record_codec import encode_matrix
+
+# Input fields that make up the graph of a run
+GRAPH_FIELDS = ('adjacency_matrix', 'weight_matrix')
+
+DEFAULT_GRAPHS_FILE = 'graphs.jsonl'
+
+# Sidecar of the graphs file with one 8-byte hit counter per stored graph
+HITS_SUFFIX = '.hits'
+_COUNTER = struct.Struct('<Q')
+
+
+def _canonical_json(value):
+    return json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+
+def extract_graph(input_data):
+    """
+    Returns the canonical graph of a run's input (matrices as sorted edge lists),
+    or None if the input holds no graph at all.
+    """
+    graph = {}
+    for key in GRAPH_FIELDS:
+        if key in input_data and input_data[key] is not None:
+            # Both dense and already encoded matrices end up in the same canonical form
+            value = input_data[key]
+            graph[key] = value if isinstance(value, dict) else encode_matrix(value)
+    return graph or None
+
+
+def graph_hash(graph):
+    """Returns the content hash (hex) of a canonical graph."""
+    return hashlib.blake2b(_canonical_json(graph).encode('utf-8'), digest_size=16).hexdigest()
+
+
+class JsonlGraphStore:
+    """
+    Append-only graph store next to the JSON Lines run log.
+
+    Every distinct graph is written once as {"hash": ..., "graph": ...}. Only the
+    offset and the number (slot) of every graph line are kept in memory: a hash
+    that is not known yet makes the store read the lines appended since its last
+    read (by this or any other worker process), and a graph is read from the file
+    when it is asked for. The hit counter of the graph in slot i is the i-th
+    8-byte counter of <graphs file>.hits, incremented by every intern().
+
+    Parameters:
+        path (str): Path of the graphs file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.hits_path = path + HITS_SUFFIX
+        self._entries = {}  # hash -> (offset of the line holding the graph, slot)
+        self._end = 0       # end of the last line read
+        self._lock = threading.Lock()
+
+    def _read_new_lines(self):
+        """Indexes the complete lines appended since the last call; returns False if the last line is unfinished."""
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return True
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            if size < self._end:
+                # The file was replaced: index it from the start
+                self._entries, self._end = {}, 0
+            f.seek(self._end)
+            offset = self._end
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # Still being written; read again on the next miss
+                key, has_graph = _scan_line(line)
+                if has_graph and key not in self._entries:
+                    self._entries[key] = (offset, len(self._entries))
+                offset += len(line)
+            self._end = offset
+        return offset == size
+
+    @contextmanager
+    def _file_lock(self):
+        """Holds the graphs file open for appending, locked against other processes."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'ab') as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            yield f
+
+    def intern(self, graph):
+        """Stores the graph if it is new, counts the hit and returns its hash."""
+        key = graph_hash(graph)
+        with self._lock, self._file_lock() as f:
+            # Another worker may have stored the graph: its lines are read under the
+            # file lock, so the check and the append are one step
+            complete = True
+            if key not in self._entries:
+                complete = self._read_new_lines()
+            self._migrate_hits()
+            if key not in self._entries:
+                # A line cut short by a crash must not swallow the new one
+                data = (('' if complete else '\n') + _graph_line(key, graph) + '\n').encode('utf-8')
+                f.write(data)
+                # After the flush the position is the end of our own line
+                f.flush()
+                offset = f.tell() - len(data) + (0 if complete else 1)
+                self._entries[key] = (offset, len(self._entries))
+            self._add_hit(self._entries[key][1])
+        return key
+
+    def get(self, key):
+        """Returns the canonical graph stored under the hash, or None."""
+        with self._lock:
+            if key not in self._entries:
+                self._read_new_lines()
+            offset = self._entries.get(key, (None, None))[0]
+        if offset is None:
+            return None
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            entry = json.loads(f.readline())
+        return entry['graph'] if entry.get('hash') == key else None
+
+    def hits(self, key):
+        """Returns how many runs submitted the graph."""
+        with self._lock:
+            if key not in self._entries:
+                self._read_new_lines()
+            if key not in self._entries:
+                return 0
+            if not os.path.exists(self.hits_path):
+                with self._file_lock():
+                    self._migrate_hits()
+            slot = self._entries[key][1]
+        try:
+            with open(self.hits_path, 'rb') as f:
+                f.seek(slot * _COUNTER.size)
+                data = f.read(_COUNTER.size)
+        except FileNotFoundError:
+            return 0
+        return _COUNTER.unpack(data)[0] if len(data) == _COUNTER.size else 0
+
+    def _add_hit(self, slot):
+        # Called under the file lock: the read-modify-write of the counter is not shared
+        with open(self.hits_path, 'r+b' if os.path.exists(self.hits_path) else 'w+b') as f:
+            f.seek(slot * _COUNTER.size)
+            data = f.read(_COUNTER.size)
+            count = _COUNTER.unpack(data)[0] if len(data) == _COUNTER.size else 0
+            f.seek(slot * _COUNTER.size)
+            f.write(_COUNTER.pack(count + 1))
+
+    def _migrate_hits(self):
+        """
+        Creates the counters of a graphs file written before they existed (called under
+        the file lock), where every submission of a graph was one more line of its hash.
+        """
+        if os.path.exists(self.hits_path):
+            return
+        self._read_new_lines()
+        counts = [0] * len(self._entries)
+        try:
+            with open(self.path, 'rb') as f:
+                for line in f:
+                    key, _ = _scan_line(line)
+                    if key in self._entries:
+                        counts[self._entries[key][1]] += 1
+        except FileNotFoundError:
+            pass
+        with open(self.hits_path, 'wb') as f:
+            f.write(b''.join(_COUNTER.pack(count) for count in counts))
+
+
+# Lines written by JsonlGraphStore start with the hash, so the index is built
+# without decoding the graphs; other lines are decoded
+_HASH_PREFIX = b'{"hash":"'
+_HASH_LENGTH = 32
+
+
+def _graph_line(key, graph):
+    return '{"hash":"%s","graph":%s}' % (key, _canonical_json(graph))
+
+
+def _scan_line(line):
+    """Returns (hash, whether the line holds the graph) of a graphs file line; hash is None if damaged."""
+    end = len(_HASH_PREFIX) + _HASH_LENGTH
+    if line.startswith(_HASH_PREFIX) and line[end:end + 1] == b'"' and line.rstrip().endswith(b'}'):
+        return line[len(_HASH_PREFIX):end].decode('ascii'), line[end + 1:end + 2] == b','
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return None, False
+    if not isinstance(entry, dict) or not entry.get('hash'):
+        return None, False
+    return entry['hash'], 'graph' in entry
@@ -1,9 +1,10 @@
 # logics/greedy_utils.py
 
+import time
 from methods.graph_coloring_algorithm import greedy_graph_coloring, draw_colored_graph
+from methods.graph import Graph
 from logics.json_utils import save_algorithm_record
-import matplotlib.pyplot as plt
-import matplotlib.colors
+from methods.svg_render import palette
 
 def get_data(request):
     """
@@ -32,6 +33,7 @@ def get_data(request):
     # Only handle logic if request is POST (form submission)
     if request.method == 'POST':
         input_for_log = {}  # Data to be saved in logs
+        started = time.perf_counter()  # Processing time of the request for the history statistics
 
         try:
             # Read and validate number of vertices
@@ -55,36 +57,23 @@ def get_data(request):
             form_data['adjacency_matrix'] = adjacency
             input_for_log['adjacency_matrix'] = adjacency
 
+            # The graph is built once and shared by the coloring and the drawing
+            graph = Graph.from_matrix(adjacency)
+
             # Run the greedy coloring algorithm
-            coloring_result, num_colors_used, _ = greedy_graph_coloring(adjacency)
-
-            # Build the color palette (HEX strings) based on number of colors used
-            palette = []
-            if num_colors_used > 0:
-                if num_colors_used <= 10:
-                    cmap = plt.cm.get_cmap('tab10')
-                    palette = [matplotlib.colors.to_hex(cmap(i)) for i in range(num_colors_used)]
-                elif num_colors_used <= 20:
-                    cmap = plt.cm.get_cmap('tab20')
-                    palette = [matplotlib.colors.to_hex(cmap(i)) for i in range(num_colors_used)]
-                else:
-                    cmap = plt.cm.get_cmap('viridis')
-                    palette = [
-                        matplotlib.colors.to_hex(cmap(i / (num_colors_used - 1 if num_colors_used > 1 else 1)))
-                        for i in range(num_colors_used)
-                    ]
-
-                # Ensure the palette has enough colors (as a fallback)
-                while len(palette) < num_colors_used:
-                    palette.append(matplotlib.colors.to_hex(cmap(len(palette) % cmap.N)))
+            coloring_result, num_colors_used, _ = greedy_graph_coloring(graph)
+
+            # Build the color palette (HEX strings) based on number of colors used. For up to
+            # 8 vertices it is matplotlib's 'tab10', without importing matplotlib
+            colors = palette(num_colors_used)
 
             # Build a table of results to display in the HTML
             coloring_result_table = []
             for vertex, color_id in sorted(coloring_result.items()):
                 hex_color = "#808080"  # Default to grey if something goes wrong
                 if color_id > 0:
-                    idx = (color_id - 1) % len(palette) if palette else 0
-                    hex_color = palette[idx]
+                    idx = (color_id - 1) % len(colors) if colors else 0
+                    hex_color = colors[idx]
 
                 coloring_result_table.append({
                     'vertex': vertex + 1,
@@ -96,7 +85,7 @@ def get_data(request):
             num_colors_used_info = f"Number of colors used: {num_colors_used}"
 
             # Generate graph image
-            graph_image_base64 = draw_colored_graph(adjacency, coloring_result, num_colors_used)
+            graph_image_base64 = draw_colored_graph(graph, coloring_result, num_colors_used)
 
             # Save the run to a log for tracking / audit purposes
             save_algorithm_record(
@@ -106,7 +95,8 @@ def get_data(request):
                     {'vertex': v, 'color_id': c}
                     for v, c in sorted(coloring_result.items())
                 ],
-                error_message=None
+                error_message=None,
+                duration_ms=(time.perf_counter() - started) * 1000
             )
 
         except ValueError as ve:
@@ -116,7 +106,8 @@ def get_data(request):
                 algorithm='coloring',
                 input_data=form_data,
                 result_matrix=None,
-                error_message=error_message
+                error_message=error_message,
+                duration_ms=(time.perf_counter() - started) * 1000
             )
             coloring_result_table = None
             graph_image_base64 = None
@@ -129,7 +120,8 @@ def get_data(request):
                 algorithm='coloring',
                 input_data=form_data,
                 result_matrix=None,
-                error_message=error_message
+                error_message=error_message,
+                duration_ms=(time.perf_counter() - started) * 1000
             )
             coloring_result_table = None
             graph_image_base64 = None
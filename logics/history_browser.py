@@ -0,0 +1,276 @@
+"""
+Newest-first, cursor-based paging over the JSON Lines run log.
+
+Every segment gets a sidecar <segment>.idx with the end offset of each line
+as an 8-byte integer. A page is read by seeking into the index and the
+segment, so opening page 1 of a multi-gigabyte log costs the same as opening
+page 1 of an empty one. The index is extended lazily: only the bytes appended
+since the last request are scanned, by one request at a time, and an index
+that does not match its segment is rebuilt.
+
+A position in one segment stream is (sequence, k): the records still to be
+shown are lines [0, k) of segment `sequence` and everything in older segments.
+The cursor handed to the client holds one position per worker stream.
+"""
+
+import os
+import json
+import base64
+import threading
+from array import array
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the threads of one process are serialized
+    fcntl = None
+
+from logics import run_log
+
+_ENTRY_SIZE = array('Q').itemsize
+_SCAN_CHUNK = 1 << 20
+
+# Serializes index refreshes of the threads of this process
+_refresh_lock = threading.Lock()
+
+# index path -> (inode, entries already validated by this process)
+_checked = {}
+
+
+class SegmentIndex:
+    """
+    Line-end offsets of one segment file, kept in <segment>.idx.
+
+    Parameters:
+        path (str): Path of the segment file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.index_path = path + run_log.INDEX_SUFFIX
+        self.count = 0
+        self._index_file = None
+        self._segment_file = None
+
+    def refresh(self):
+        """Indexes the lines appended since the last call and returns the number of lines."""
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            self.count = 0
+            return 0
+
+        # Concurrent first requests would each append the same offsets: the state is
+        # read and extended by one thread (and, with fcntl, one process) at a time
+        with _refresh_lock, open(self.index_path, 'a+b') as index:
+            if fcntl is not None:
+                fcntl.flock(index.fileno(), fcntl.LOCK_EX)
+            count = self._checked_count(index, size)
+            indexed_end = self._read_entries(index, count - 1, count)[0] if count else 0
+
+            if indexed_end < size:
+                offsets = array('Q')
+                with open(self.path, 'rb') as f:
+                    f.seek(indexed_end)
+                    position = indexed_end
+                    while True:
+                        chunk = f.read(_SCAN_CHUNK)
+                        if not chunk:
+                            break
+                        start = 0
+                        while True:
+                            newline = chunk.find(b'\n', start)
+                            if newline < 0:
+                                break
+                            offsets.append(position + newline + 1)
+                            start = newline + 1
+                        position += len(chunk)
+                # A trailing line without newline is still being written; it is indexed next time
+                if offsets:
+                    index.seek(0, os.SEEK_END)
+                    offsets.tofile(index)
+                    index.flush()
+                    count += len(offsets)
+                    _checked[self.index_path] = (os.fstat(index.fileno()).st_ino, count)
+
+        self.count = count
+        return count
+
+    def _checked_count(self, index, size):
+        """
+        Returns the number of valid entries of the open index, emptying it if it is damaged.
+
+        Offsets must be a whole number of entries, strictly increasing, end inside the
+        segment and on a line boundary. Entries already checked by this process are not
+        read again, so only the first refresh of a segment reads its whole index.
+        """
+        status = os.fstat(index.fileno())
+        count = status.st_size // _ENTRY_SIZE
+        inode, checked = _checked.get(self.index_path, (None, 0))
+        if inode != status.st_ino or checked > count:
+            checked = 0
+
+        valid = status.st_size % _ENTRY_SIZE == 0
+        if valid and count > checked:
+            first = max(checked - 1, 0)
+            entries = self._read_entries(index, first, count)
+            valid = (len(entries) == count - first and entries[-1] <= size
+                     and (first or entries[0] > 0)
+                     and all(a < b for a, b in zip(entries, entries[1:])))
+            if valid:
+                with open(self.path, 'rb') as f:
+                    f.seek(entries[-1] - 1)
+                    valid = f.read(1) == b'\n'
+        elif valid and count and self._read_entries(index, count - 1, count)[0] > size:
+            # The index does not belong to this file (e.g. a rewritten segment)
+            valid = False
+
+        if not valid:
+            # Start over: the whole segment is scanned again
+            index.truncate(0)
+            count = 0
+        _checked[self.index_path] = (status.st_ino, count)
+        return count
+
+    @staticmethod
+    def _read_entries(index, first, end):
+        index.seek(first * _ENTRY_SIZE)
+        entries = array('Q')
+        entries.frombytes(index.read((end - first) * _ENTRY_SIZE))
+        return entries
+
+    def _entry(self, k):
+        self._index_file.seek(k * _ENTRY_SIZE)
+        entry = array('Q')
+        entry.frombytes(self._index_file.read(_ENTRY_SIZE))
+        return entry[0]
+
+    def read(self, k):
+        """Returns the decoded record on line k (0-based), or None if the line is damaged."""
+        if self._index_file is None:
+            self._index_file = open(self.index_path, 'rb')
+            self._segment_file = open(self.path, 'rb')
+        start = self._entry(k - 1) if k else 0
+        end = self._entry(k)
+        self._segment_file.seek(start)
+        line = self._segment_file.read(end - start).strip()
+        try:
+            return json.loads(line) if line else None
+        except ValueError:
+            return None
+
+    def close(self):
+        for f in (self._index_file, self._segment_file):
+            if f is not None:
+                f.close()
+        self._index_file = self._segment_file = None
+
+
+class _Stream:
+    """Newest-first reader over the segments of one worker."""
+
+    def __init__(self, segments, position=None):
+        self.segments = dict(segments)  # sequence -> path
+        self.sequences = sorted(self.segments)
+        self.indexes = {}
+        if position is None:
+            seq = self.sequences[-1] if self.sequences else 0
+            position = (seq, self._index(seq).count if seq else 0)
+        else:
+            # A position handed out earlier points at most at the end of its segment (which
+            # only grows) and never past the newest segment
+            seq, k = position
+            if (k < 0 or not self.sequences or seq > self.sequences[-1]
+                    or (seq in self.segments and k > self._index(seq).count)):
+                raise ValueError("Invalid cursor")
+        self.seq, self.k = position
+        self.head = None
+
+    def _index(self, seq):
+        if seq not in self.indexes:
+            index = SegmentIndex(self.segments[seq])
+            index.refresh()
+            self.indexes[seq] = index
+        return self.indexes[seq]
+
+    def peek(self):
+        """Returns the newest record not yet consumed, or None when the stream is exhausted."""
+        while self.head is None:
+            if self.k <= 0 or self.seq not in self.segments:
+                older = [seq for seq in self.sequences if seq < self.seq]
+                if not older:
+                    return None
+                self.seq = older[-1]
+                self.k = self._index(self.seq).count
+                continue
+            self.head = self._index(self.seq).read(self.k - 1)
+            if self.head is None:
+                # Damaged line: skip it
+                self.k -= 1
+        return self.head
+
+    def consume(self):
+        record, self.head = self.head, None
+        self.k -= 1
+        return record
+
+    def close(self):
+        for index in self.indexes.values():
+            index.close()
+
+
+def encode_cursor(positions):
+    raw = json.dumps(positions, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decodes a cursor produced by browse_segments; raises ValueError if it is malformed."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        positions = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return {str(key): (int(value[0]), int(value[1])) for key, value in positions.items()}
+    except (ValueError, TypeError, KeyError, IndexError, AttributeError):
+        raise ValueError("Invalid cursor")
+
+
+def browse_segments(algorithm_key, log_dir=run_log.DEFAULT_LOG_DIR, cursor=None, limit=20):
+    """
+    Returns one page of records of an algorithm, newest first.
+
+    Parameters:
+        algorithm_key (str): Normalized algorithm name.
+        log_dir (str): Directory holding the segment files.
+        cursor (str or None): Cursor of the previous page, None for the first page.
+        limit (int): Number of records per page.
+
+    Returns:
+        tuple: (records, next_cursor); next_cursor is None on the last page.
+    """
+    positions = decode_cursor(cursor) if cursor else None
+
+    streams = {}
+    for worker, segments in run_log.list_numbered_segments(algorithm_key, log_dir):
+        key = worker or ''
+        if positions is not None and key not in positions:
+            # A worker that appeared after the first page only holds newer records
+            continue
+        streams[key] = _Stream(segments, positions.get(key) if positions else None)
+
+    records = []
+    try:
+        while len(records) < limit:
+            # Several workers: take the stream whose next record is the newest
+            heads = [(stream.peek(), key) for key, stream in streams.items()]
+            heads = [(record.get('timestamp') or '', key) for record, key in heads if record is not None]
+            if not heads:
+                break
+            _, key = max(heads)
+            records.append(streams[key].consume())
+
+        has_more = any(stream.peek() is not None for stream in streams.values())
+        next_cursor = encode_cursor({key: [s.seq, s.k] for key, s in streams.items()}) if has_more else None
+    finally:
+        for stream in streams.values():
+            stream.close()
+
+    return records, next_cursor
@@ -0,0 +1,164 @@
+"""
+Running aggregates over the algorithm run history.
+
+The counters are updated in O(1) for every stored record, so the numbers
+behind /stats (runs per algorithm, error rate, average vertex count, p95
+runtime) never require a scan of the log. Runtimes go into a histogram with
+logarithmic buckets, which bounds the error of the p95 estimate to ~9%.
+"""
+
+import os
+import json
+import math
+import threading
+
+# Bucket i holds runtimes in (BASE^(i-1), BASE^i] milliseconds
+_BUCKET_BASE = 2 ** 0.125
+
+
+def _bucket(duration_ms):
+    if duration_ms <= 1:
+        return 0
+    return math.ceil(math.log(duration_ms, _BUCKET_BASE))
+
+
+def _empty_counters():
+    return {
+        'runs': 0,
+        'errors': 0,
+        'vertices_sum': 0,
+        'vertices_count': 0,
+        'duration_sum_ms': 0.0,
+        'duration_count': 0,
+        'duration_buckets': {}
+    }
+
+
+def _percentile(buckets, count, fraction):
+    """Returns the upper bound of the bucket containing the requested percentile."""
+    if not count:
+        return None
+    rank = math.ceil(count * fraction)
+    seen = 0
+    for bucket in sorted(buckets, key=int):
+        seen += buckets[bucket]
+        if seen >= rank:
+            return round(_BUCKET_BASE ** int(bucket), 2)
+    return None
+
+
+class HistoryStats:
+    """
+    Per-algorithm counters of the run history. Thread-safe.
+    """
+
+    def __init__(self, counters=None):
+        self._counters = counters or {}
+        self._lock = threading.Lock()
+
+    def update(self, algorithm_key, record):
+        """Adds one stored record to the aggregates."""
+        input_data = record.get('input_data') or {}
+        try:
+            num_vertices = int(input_data.get('num_vertices'))
+        except (TypeError, ValueError):
+            num_vertices = None
+        duration_ms = record.get('duration_ms')
+
+        with self._lock:
+            counters = self._counters.setdefault(algorithm_key, _empty_counters())
+            counters['runs'] += 1
+            if record.get('error_message'):
+                counters['errors'] += 1
+            if num_vertices is not None:
+                counters['vertices_sum'] += num_vertices
+                counters['vertices_count'] += 1
+            if isinstance(duration_ms, (int, float)):
+                counters['duration_sum_ms'] += duration_ms
+                counters['duration_count'] += 1
+                bucket = str(_bucket(duration_ms))
+                counters['duration_buckets'][bucket] = counters['duration_buckets'].get(bucket, 0) + 1
+
+    def merge(self, other):
+        """Returns new stats combining these counters with another HistoryStats."""
+        merged = {}
+        for source in (self.to_dict(), other.to_dict()):
+            for algorithm_key, counters in source.items():
+                target = merged.setdefault(algorithm_key, _empty_counters())
+                for key, value in counters.items():
+                    if key == 'duration_buckets':
+                        for bucket, count in value.items():
+                            target[key][bucket] = target[key].get(bucket, 0) + count
+                    else:
+                        target[key] += value
+        return HistoryStats(merged)
+
+    def to_dict(self):
+        with self._lock:
+            return json.loads(json.dumps(self._counters))
+
+    def snapshot(self):
+        """
+        Returns the aggregates as served by /stats.
+
+        Returns:
+            dict: {'total': {...}, 'algorithms': {name: {...}}} where every entry has
+            runs, errors, error_rate, avg_vertices, avg_runtime_ms and p95_runtime_ms.
+        """
+        counters = self.to_dict()
+        total = _empty_counters()
+        for algorithm_counters in counters.values():
+            for key, value in algorithm_counters.items():
+                if key == 'duration_buckets':
+                    for bucket, count in value.items():
+                        total[key][bucket] = total[key].get(bucket, 0) + count
+                else:
+                    total[key] += value
+
+        return {
+            'total': self._summary(total),
+            'algorithms': {key: self._summary(value) for key, value in sorted(counters.items())}
+        }
+
+    @staticmethod
+    def _summary(counters):
+        runs = counters['runs']
+        return {
+            'runs': runs,
+            'errors': counters['errors'],
+            'error_rate': round(counters['errors'] / runs, 4) if runs else 0.0,
+            'avg_vertices': (round(counters['vertices_sum'] / counters['vertices_count'], 2)
+                             if counters['vertices_count'] else None),
+            'avg_runtime_ms': (round(counters['duration_sum_ms'] / counters['duration_count'], 2)
+                               if counters['duration_count'] else None),
+            'p95_runtime_ms': _percentile(counters['duration_buckets'], counters['duration_count'], 0.95)
+        }
+
+    def save(self, path):
+        """Writes the counters atomically (temporary file + rename)."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Per process and thread, so concurrent saves never rename each other's file
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.to_dict(), f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Reads counters saved by save(); returns None if the file is missing or damaged."""
+        try:
+            with open(path, 'r') as f:
+                return cls(json.load(f))
+        except (OSError, ValueError):
+            return None
+
+    @classmethod
+    def rebuild(cls, data):
+        """Builds the counters from a dict-of-lists history ({'bfs': [...], ...})."""
+        stats = cls()
+        for algorithm_key, records in data.items():
+            for record in records:
+                stats.update(algorithm_key, record)
+        return stats
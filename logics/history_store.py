@@ -0,0 +1,219 @@
+"""
+Indexed SQLite storage for algorithm run records.
+
+The store keeps one row per run with the fields used for filtering extracted
+into indexed columns (algorithm, timestamp, number of vertices, error flag)
+and the full record as JSON, so the history can be queried page by page
+without loading it into memory.
+"""
+
+import os
+import json
+import sqlite3
+import threading
+
+from logics.graph_store import graph_hash
+
+DEFAULT_DB_PATH = 'static/dynamic/logos/history.sqlite3'
+
+# Upper bound of one page returned by query()
+MAX_PAGE_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    algorithm TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    num_vertices INTEGER,
+    is_error INTEGER NOT NULL,
+    error_message TEXT,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_algorithm ON runs (algorithm, timestamp);
+CREATE INDEX IF NOT EXISTS idx_runs_timestamp ON runs (timestamp);
+CREATE INDEX IF NOT EXISTS idx_runs_num_vertices ON runs (num_vertices);
+CREATE INDEX IF NOT EXISTS idx_runs_is_error ON runs (is_error, timestamp);
+CREATE INDEX IF NOT EXISTS idx_runs_algorithm_id ON runs (algorithm, id);
+CREATE TABLE IF NOT EXISTS graphs (
+    hash TEXT PRIMARY KEY,
+    graph TEXT NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 1
+);
+"""
+
+
+def _as_int(value):
+    """Converts num_vertices (int, numeric string or garbage) to int or None."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class SQLiteHistoryStore:
+    """
+    SQLite-backed run history. Every thread gets its own connection,
+    the database runs in WAL mode so readers never block the writer.
+
+    Parameters:
+        db_path (str): Path of the SQLite database file.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def append_records(self, algorithm_key, records):
+        """Inserts a group of records of one algorithm in a single transaction."""
+        rows = [
+            (
+                algorithm_key,
+                record.get('timestamp') or '',
+                _as_int((record.get('input_data') or {}).get('num_vertices')),
+                1 if record.get('error_message') else 0,
+                record.get('error_message'),
+                json.dumps(record, separators=(',', ':'), ensure_ascii=False)
+            )
+            for record in records
+        ]
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                'INSERT INTO runs (algorithm, timestamp, num_vertices, is_error, error_message, record) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                rows
+            )
+
+    def query(self, algorithm=None, is_error=None, min_vertices=None, max_vertices=None,
+              since=None, until=None, limit=50, offset=0):
+        """
+        Returns one page of runs matching the filters, newest first.
+
+        Parameters:
+            algorithm (str or None): Only runs of this algorithm.
+            is_error (bool or None): Only failed (True) or successful (False) runs.
+            min_vertices, max_vertices (int or None): Bounds on the number of vertices.
+            since, until (str or None): ISO timestamp bounds (inclusive).
+            limit (int): Page size (capped at MAX_PAGE_SIZE).
+            offset (int): Number of matching runs to skip.
+
+        Returns:
+            dict: {'total': int, 'records': list of dict}; every record carries its 'id' and 'algorithm'.
+        """
+        clauses, params = [], []
+        if algorithm:
+            clauses.append('algorithm = ?')
+            params.append(algorithm)
+        if is_error is not None:
+            clauses.append('is_error = ?')
+            params.append(1 if is_error else 0)
+        if min_vertices is not None:
+            clauses.append('num_vertices >= ?')
+            params.append(min_vertices)
+        if max_vertices is not None:
+            clauses.append('num_vertices <= ?')
+            params.append(max_vertices)
+        if since:
+            clauses.append('timestamp >= ?')
+            params.append(since)
+        if until:
+            clauses.append('timestamp <= ?')
+            params.append(until)
+        where = (' WHERE ' + ' AND '.join(clauses)) if clauses else ''
+
+        limit = max(0, min(int(limit), MAX_PAGE_SIZE))
+        offset = max(0, int(offset))
+
+        conn = self._connection()
+        total = conn.execute('SELECT COUNT(*) FROM runs' + where, params).fetchone()[0]
+        rows = conn.execute(
+            'SELECT id, algorithm, record FROM runs' + where + ' ORDER BY id DESC LIMIT ? OFFSET ?',
+            params + [limit, offset]
+        ).fetchall()
+
+        records = []
+        for row in rows:
+            record = json.loads(row['record'])
+            record['id'] = row['id']
+            record['algorithm'] = row['algorithm']
+            records.append(record)
+        return {'total': total, 'records': records}
+
+    def page_before(self, algorithm, before_id=None, limit=20):
+        """
+        Keyset pagination over the runs of one algorithm, newest first.
+
+        Returns:
+            tuple: (records, next_before_id); next_before_id is None on the last page.
+        """
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        sql = 'SELECT id, record FROM runs WHERE algorithm = ?'
+        params = [algorithm]
+        if before_id is not None:
+            sql += ' AND id < ?'
+            params.append(before_id)
+        # One extra row tells whether there is a next page
+        rows = self._connection().execute(sql + ' ORDER BY id DESC LIMIT ?', params + [limit + 1]).fetchall()
+
+        records = []
+        for row in rows[:limit]:
+            record = json.loads(row['record'])
+            record['id'] = row['id']
+            records.append(record)
+        next_before_id = rows[limit - 1]['id'] if len(rows) > limit else None
+        return records, next_before_id
+
+    def intern(self, graph):
+        """Stores the graph once under its content hash, counts the hit and returns the hash."""
+        key = graph_hash(graph)
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                'INSERT INTO graphs (hash, graph, hits) VALUES (?, ?, 1) '
+                'ON CONFLICT (hash) DO UPDATE SET hits = hits + 1',
+                (key, json.dumps(graph, sort_keys=True, separators=(',', ':'), ensure_ascii=False))
+            )
+        return key
+
+    def get(self, key):
+        """Returns the graph stored under the hash, or None."""
+        row = self._connection().execute('SELECT graph FROM graphs WHERE hash = ?', (key,)).fetchone()
+        return json.loads(row['graph']) if row else None
+
+    def hits(self, key):
+        """Returns how many runs submitted the graph."""
+        row = self._connection().execute('SELECT hits FROM graphs WHERE hash = ?', (key,)).fetchone()
+        return row['hits'] if row else 0
+
+    def load_records(self):
+        """Returns the whole history in the legacy dict-of-lists view."""
+        data = {}
+        for row in self._connection().execute('SELECT algorithm, record FROM runs ORDER BY id'):
+            data.setdefault(row['algorithm'], []).append(json.loads(row['record']))
+        return data
+
+    def close(self):
+        """Closes the connections of all threads."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
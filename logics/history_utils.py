@@ -0,0 +1,130 @@
+from logics.json_utils import (
+    query_algorithm_records, load_history_stats_snapshot, browse_algorithm_records, KNOWN_ALGORITHMS
+)
+
+
+def _optional_int(request, name):
+    """Reads an optional integer query parameter, raising ValueError on bad input."""
+    value = request.query.get(name, '').strip()
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"Parameter '{name}' must be an integer")
+
+
+def get_history_data(request):
+    """
+    Function: get_history_data
+    Description:
+        Reads the filter and pagination parameters of a /history request and
+        returns the matching page of run records.
+
+    Parameters:
+        request (object): The HTTP request object with optional query parameters:
+            - 'algorithm' (str): 'bfs', 'dfs', 'beam' or 'coloring'.
+            - 'errors' (str): '1'/'true' for failed runs only, '0'/'false' for successful runs only.
+            - 'min_vertices', 'max_vertices' (int): Bounds on the number of vertices.
+            - 'since', 'until' (str): ISO timestamps, e.g. 2025-05-14T10:00:00.
+            - 'limit' (int): Page size (default 50).
+            - 'offset' (int): Number of records to skip (default 0).
+
+    Returns:
+        tuple:
+            payload (dict): Matching records, 'total', 'limit' and 'offset', or an 'error' message.
+            status (int): HTTP status code (200, or 400 for invalid parameters).
+    """
+    try:
+        algorithm = request.query.get('algorithm', '').strip().lower() or None
+        if algorithm and algorithm not in KNOWN_ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+
+        errors = request.query.get('errors', '').strip().lower()
+        if errors in ('', 'any'):
+            is_error = None
+        elif errors in ('1', 'true', 'yes'):
+            is_error = True
+        elif errors in ('0', 'false', 'no'):
+            is_error = False
+        else:
+            raise ValueError("Parameter 'errors' must be true or false")
+
+        limit = _optional_int(request, 'limit')
+        offset = _optional_int(request, 'offset')
+        limit = 50 if limit is None else limit
+        offset = 0 if offset is None else offset
+        if limit < 1 or offset < 0:
+            raise ValueError("Parameters 'limit' and 'offset' must be positive")
+
+        page = query_algorithm_records(
+            algorithm=algorithm,
+            is_error=is_error,
+            min_vertices=_optional_int(request, 'min_vertices'),
+            max_vertices=_optional_int(request, 'max_vertices'),
+            since=request.query.get('since', '').strip() or None,
+            until=request.query.get('until', '').strip() or None,
+            limit=limit,
+            offset=offset
+        )
+    except ValueError as e:
+        return {'error': str(e)}, 400
+
+    page['limit'] = limit
+    page['offset'] = offset
+    return page, 200
+
+
+def get_stats_data():
+    """
+    Function: get_stats_data
+    Description:
+        Returns the running aggregates of the run history for /stats: number of runs,
+        error rate, average vertex count and runtime percentiles, in total and per algorithm.
+        The numbers are maintained incrementally, so the call never scans the log.
+
+    Returns:
+        dict: {'total': {...}, 'algorithms': {'bfs': {...}, ...}}
+    """
+    return load_history_stats_snapshot()
+
+
+def get_history_page_data(request, algorithm):
+    """
+    Function: get_history_page_data
+    Description:
+        Returns one page of the run history of an algorithm for /history/<algorithm>,
+        newest first. Pages are addressed by an opaque cursor, so a page is read
+        straight from the log instead of loading the whole history.
+
+    Parameters:
+        request (object): The HTTP request object with optional query parameters:
+            - 'cursor' (str): Cursor of the page returned as 'next_cursor' by the previous page.
+            - 'limit' (int): Page size (1-100, default 20).
+        algorithm (str): 'bfs', 'dfs', 'beam' or 'coloring'.
+
+    Returns:
+        tuple:
+            payload (dict): 'algorithm', 'records', 'next_cursor', 'limit', or an 'error' message.
+            status (int): HTTP status code (200, 400 for invalid parameters, 404 for an unknown algorithm).
+    """
+    algorithm = algorithm.lower()
+    if algorithm not in KNOWN_ALGORITHMS:
+        return {'error': f"Unknown algorithm: {algorithm}", 'algorithm': algorithm}, 404
+
+    try:
+        limit = _optional_int(request, 'limit')
+        limit = 20 if limit is None else limit
+        if not (1 <= limit <= 100):
+            raise ValueError("Parameter 'limit' must be between 1 and 100")
+        cursor = request.query.get('cursor', '').strip() or None
+        records, next_cursor = browse_algorithm_records(algorithm, cursor, limit)
+    except ValueError as e:
+        return {'error': str(e), 'algorithm': algorithm}, 400
+
+    return {
+        'algorithm': algorithm,
+        'records': records,
+        'next_cursor': next_cursor,
+        'limit': limit
+    }, 200
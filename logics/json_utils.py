@@ -1,33 +1,143 @@
 import os
 import json
+import threading
 from datetime import datetime
 
+from logics import run_log
+from logics.record_writer import RecordWriter
+from logics.history_store import SQLiteHistoryStore, DEFAULT_DB_PATH, MAX_PAGE_SIZE
+from logics.record_codec import encode_record, decode_record, decode_matrix, ENCODING_NAME
+from logics.graph_store import JsonlGraphStore, GRAPH_FIELDS, DEFAULT_GRAPHS_FILE, extract_graph
+from logics.history_stats import HistoryStats
+from logics.history_browser import browse_segments
+
+# Storage mode for run records:
+#     'jsonl'  - append-only JSON Lines segments (one O(1) append per record)
+#     'sqlite' - indexed SQLite database, supports filtered queries without a full scan
+#     'json'   - legacy single input_data.json file (read-modify-write of the whole history)
+LOG_MODE = os.environ.get('ALGORITHM_LOG_MODE', 'jsonl')
+
+# Legacy JSON file, the directory with JSON Lines segments and the SQLite database
+JSON_PATH = 'static/dynamic/logos/input_data.json'
+LOG_DIR = os.environ.get('ALGORITHM_LOG_DIR', run_log.DEFAULT_LOG_DIR)
+DB_PATH = os.environ.get('ALGORITHM_LOG_DB', DEFAULT_DB_PATH)
+
+# Optional worker identifier: every worker process then writes its own segments
+LOG_WORKER_ID = run_log.clean_worker_id(os.environ.get('ALGORITHM_LOG_WORKER'))
+
+# Size limit of an active segment before it is rotated
+try:
+    MAX_SEGMENT_BYTES = int(os.environ.get('ALGORITHM_LOG_SEGMENT_BYTES', run_log.DEFAULT_MAX_SEGMENT_BYTES))
+except ValueError:
+    MAX_SEGMENT_BYTES = run_log.DEFAULT_MAX_SEGMENT_BYTES
+
+# Matrix encoding of new records: 'edges' (sorted edge lists) or 'dense' (n x n lists)
+RECORD_ENCODING = os.environ.get('ALGORITHM_LOG_ENCODING', 'edges')
+
+# Store every distinct input graph once and reference it from run records by hash
+# (JSON Lines and SQLite modes; the legacy JSON file always keeps full matrices)
+DEDUPLICATE_GRAPHS = os.environ.get('ALGORITHM_LOG_DEDUP', 'on').lower() not in ('0', 'off', 'false', 'no')
+
+KNOWN_ALGORITHMS = ['bfs', 'dfs', 'beam', 'coloring']
+
+# Background writer; None means records are written synchronously by the caller
+_record_writer = None
+
+# SQLite store, created on first use in 'sqlite' mode
+_history_store = None
+
+# Graph store of the JSON Lines mode, created on first use
+_graph_store = None
+
+# Running aggregates of this process, loaded (or rebuilt from the log) on first use
+_history_stats = None
+
+# Serializes the writes of this process (request threads, the background writer and
+# its synchronous fallback): segment rotation, the stats update and the stats file
+# must not interleave. Reentrant, because a write may first load the stats
+_write_lock = threading.RLock()
+
+
 # Function: save_algorithm_record
 # Description:
 #     Saves the input and result of a specific algorithm execution (such as BFS, DFS, Beam Search, or Graph Coloring)
-#     into a JSON file for logging and history tracking purposes.
-#     Handles creation of directories if missing, filters input data per algorithm,
-#     timestamps the record, appends it to existing JSON data, and writes it back.
+#     into the run log for logging and history tracking purposes.
+#     Filters input data per algorithm, timestamps the record and hands it to the configured storage
+#     (an O(1) append to a JSON Lines segment, or the legacy input_data.json file).
 #
 # Parameters:
 #     algorithm (str): The name of the algorithm (e.g., 'bfs', 'dfs', 'beam', 'coloring').
 #     input_data (dict): The raw input data used for the algorithm execution.
 #     result_matrix (list or None): The result of the algorithm (usually a matrix or list), or None if there was an error.
 #     error_message (str or None): Error message if an error occurred, otherwise None.
+#     duration_ms (float or None): Processing time of the request in milliseconds, if measured.
 #
 # Returns:
 #     None
-def save_algorithm_record(algorithm, input_data, result_matrix, error_message):
-    # Path to the JSON file where records will be saved
-    json_path = 'static/dynamic/logos/input_data.json'
-    
-    # Ensure the directory for the JSON file exists, create if necessary
-    os.makedirs(os.path.dirname(json_path), exist_ok=True)
+def save_algorithm_record(algorithm, input_data, result_matrix, error_message, duration_ms=None):
+    algorithm_key, record = build_algorithm_record(algorithm, input_data, result_matrix, error_message, duration_ms)
+
+    # Hand the record to the background writer if it is running, otherwise write it right away
+    writer = _record_writer
+    if writer is not None:
+        writer.submit(algorithm_key, record)
+    else:
+        write_algorithm_records(algorithm_key, [record])
+
+
+# Function: start_record_writer
+# Description:
+#     Starts the background writer so save_algorithm_record only enqueues records.
+#     Records are then written in groups by a dedicated thread.
+#
+# Parameters:
+#     **options: RecordWriter options (max_queue_size, flush_interval, flush_size, on_full, put_timeout).
+#
+# Returns:
+#     RecordWriter: The running writer.
+def start_record_writer(**options):
+    global _record_writer
+    if _record_writer is None:
+        _record_writer = RecordWriter(write_algorithm_records, **options).start()
+    return _record_writer
+
+
+# Function: stop_record_writer
+# Description:
+#     Writes every queued record and stops the background writer.
+#     Called by app.py on shutdown; afterwards records are written synchronously again.
+def stop_record_writer(timeout=5.0):
+    global _record_writer
+    writer, _record_writer = _record_writer, None
+    if writer is not None:
+        writer.close(timeout)
 
+
+# Function: set_log_worker
+# Description:
+#     Makes this process write its own segments and stats file under the given worker id.
+#     Called by the prefork server in every forked worker: the stores and statistics the
+#     parent may have opened are dropped, so the worker opens and loads its own.
+#     Characters that segment names cannot carry (e.g. '-') are replaced by '_'.
+def set_log_worker(worker_id):
+    global LOG_WORKER_ID, _history_store, _graph_store, _history_stats
+    LOG_WORKER_ID = run_log.clean_worker_id(worker_id)
+    _history_store = None
+    _graph_store = None
+    _history_stats = None
+
+
+# Function: build_algorithm_record
+# Description:
+#     Validates the algorithm name and builds the record that is stored in the run log.
+#
+# Returns:
+#     tuple: (algorithm_key, record)
+def build_algorithm_record(algorithm, input_data, result_matrix, error_message, duration_ms=None):
     # Normalize algorithm name to lowercase for consistent keys
     algorithm_key = algorithm.lower()
     # Validate algorithm key to accept only known algorithms
-    if algorithm_key not in ['bfs', 'dfs', 'beam', 'coloring']:
+    if algorithm_key not in KNOWN_ALGORITHMS:
         raise ValueError(f"Unknown algorithm: {algorithm}")
 
     # Filter input data fields according to the algorithm type
@@ -61,25 +171,327 @@ def save_algorithm_record(algorithm, input_data, result_matrix, error_message):
         'timestamp': datetime.now().strftime('%Y-%m-%dT%H:%M:%S'),
         'error_message': error_message
     }
+    if duration_ms is not None:
+        record['duration_ms'] = round(duration_ms, 3)
+
+    # Store matrices as edge lists so the record grows with the number of edges, not n^2;
+    # matrices handed over already as edge lists (by the API) are expanded for 'dense'
+    if RECORD_ENCODING == 'edges':
+        record = encode_record(record)
+    else:
+        record = decode_record(dict(record, encoding=ENCODING_NAME))
+
+    return algorithm_key, record
+
+
+# Function: write_algorithm_records
+# Description:
+#     Persists already built records of one algorithm using the configured LOG_MODE.
+#
+# Parameters:
+#     algorithm_key (str): Normalized algorithm name.
+#     records (list of dict): Records to store, in order.
+def write_algorithm_records(algorithm_key, records):
+    with _write_lock:
+        _write_algorithm_records(algorithm_key, records)
+
+
+def _write_algorithm_records(algorithm_key, records):
+    # Load (or rebuild) the aggregates before the write so the new records are not counted twice
+    stats = get_history_stats()
+
+    graph_store = get_graph_store() if DEDUPLICATE_GRAPHS else None
+    if graph_store is not None:
+        records = [_deduplicate_record(record, graph_store) for record in records]
+
+    if LOG_MODE == 'json':
+        _append_to_json_file(algorithm_key, records)
+    elif LOG_MODE == 'sqlite':
+        get_history_store().append_records(algorithm_key, records)
+    else:
+        run_log.append_records(
+            algorithm_key, records,
+            log_dir=LOG_DIR,
+            worker_id=LOG_WORKER_ID,
+            max_segment_bytes=MAX_SEGMENT_BYTES
+        )
+
+    # O(1) update of the running aggregates, persisted next to the log
+    for record in records:
+        stats.update(algorithm_key, record)
+    stats.save(_stats_path())
+
+
+# Function: load_algorithm_records
+# Description:
+#     Reads the whole history in the legacy dict-of-lists view ({'bfs': [...], 'dfs': [...], ...}),
+#     regardless of the storage mode. Compactly encoded records are decoded back to matrices.
+def load_algorithm_records():
+    # Make queued records visible to the reader
+    if _record_writer is not None:
+        _record_writer.flush()
+    return {
+        algorithm_key: [_expand_record(record) for record in records]
+        for algorithm_key, records in _load_stored_records().items()
+    }
+
 
+def _load_stored_records():
+    # Records exactly as stored (graph references and compact matrices are kept)
+    if LOG_MODE == 'json':
+        return _load_json_file()
+    if LOG_MODE == 'sqlite':
+        return get_history_store().load_records()
+    return run_log.load_records(LOG_DIR, KNOWN_ALGORITHMS)
+
+
+# Function: get_history_stats
+# Description:
+#     Returns the running aggregates of this process. On first use they are read from the
+#     stats file next to the log, or rebuilt from the log itself if that file is missing.
+def get_history_stats():
+    global _history_stats
+    if _history_stats is None:
+        with _write_lock:
+            if _history_stats is None:
+                stats = HistoryStats.load(_stats_path())
+                if stats is None:
+                    stats = HistoryStats.rebuild(_load_worker_records())
+                    stats.save(_stats_path())
+                _history_stats = stats
+    return _history_stats
+
+
+# Function: load_history_stats_snapshot
+# Description:
+#     Returns the aggregates served by /stats. With per-worker segments every worker keeps
+#     its own stats file; the files of the other workers are merged into the live numbers.
+def load_history_stats_snapshot():
+    stats = get_history_stats()
+    directory = os.path.dirname(_stats_path())
+    own_name = os.path.basename(_stats_path())
+    if os.path.isdir(directory):
+        for name in sorted(os.listdir(directory)):
+            if name != own_name and name.startswith('stats') and name.endswith('.json'):
+                other = HistoryStats.load(os.path.join(directory, name))
+                if other is not None:
+                    stats = stats.merge(other)
+    return stats.snapshot()
+
+
+# Function: browse_algorithm_records
+# Description:
+#     Returns one page of the records of an algorithm, newest first, without reading the whole log.
+#     JSON Lines segments are read through their line-offset indexes, SQLite uses keyset pagination.
+#
+# Parameters:
+#     algorithm_key (str): Normalized algorithm name.
+#     cursor (str or None): Opaque cursor returned with the previous page, None for the first page.
+#     limit (int): Number of records per page.
+#
+# Returns:
+#     tuple: (records, next_cursor); next_cursor is None on the last page.
+#     Raises ValueError if the cursor is malformed.
+def browse_algorithm_records(algorithm_key, cursor=None, limit=20):
+    if _record_writer is not None:
+        _record_writer.flush()
+
+    if LOG_MODE == 'sqlite':
+        try:
+            before_id = int(cursor) if cursor else None
+        except ValueError:
+            raise ValueError("Invalid cursor")
+        records, next_id = get_history_store().page_before(algorithm_key, before_id, limit)
+        next_cursor = str(next_id) if next_id is not None else None
+    elif LOG_MODE == 'json':
+        # The legacy file can only be read as a whole; the cursor is a plain offset
+        try:
+            offset = int(cursor) if cursor else 0
+        except ValueError:
+            raise ValueError("Invalid cursor")
+        newest_first = list(reversed(_load_json_file().get(algorithm_key, [])))
+        records = newest_first[offset:offset + limit]
+        next_cursor = str(offset + limit) if offset + limit < len(newest_first) else None
+    else:
+        records, next_cursor = browse_segments(algorithm_key, LOG_DIR, cursor, limit)
+
+    return [_expand_record(record) for record in records], next_cursor
+
+
+def _stats_path():
+    # The aggregates live next to the log of the current mode
+    if LOG_MODE == 'json':
+        directory = os.path.dirname(JSON_PATH)
+    elif LOG_MODE == 'sqlite':
+        directory = os.path.dirname(DB_PATH)
+    else:
+        directory = LOG_DIR
+    name = f'stats-{LOG_WORKER_ID}.json' if LOG_WORKER_ID else 'stats.json'
+    return os.path.join(directory, name)
+
+
+def _load_worker_records():
+    # Records this process is responsible for when its stats file has to be rebuilt.
+    # In JSON Lines mode that is only its own segments (the shared ones without a worker
+    # id): the segments of worker processes are counted by their stats-<worker>.json
+    # files, which load_history_stats_snapshot merges in
+    if LOG_MODE != 'jsonl':
+        # Shared storage: the history is counted by the stats file without a worker id
+        return _load_stored_records() if LOG_WORKER_ID is None else {}
+    data = {}
+    for algorithm_key in KNOWN_ALGORITHMS:
+        for worker_id, paths in run_log.list_segments(algorithm_key, LOG_DIR):
+            if worker_id == LOG_WORKER_ID:
+                data[algorithm_key] = [record for path in paths for record in run_log.iter_segment(path)]
+    return data
+
+
+# Function: get_history_store
+# Description:
+#     Returns the shared SQLite store (one connection per thread is opened on demand).
+def get_history_store():
+    global _history_store
+    if _history_store is None:
+        _history_store = SQLiteHistoryStore(DB_PATH)
+    return _history_store
+
+
+# Function: get_graph_store
+# Description:
+#     Returns the store of deduplicated input graphs for the current LOG_MODE,
+#     or None for the legacy JSON file.
+def get_graph_store():
+    global _graph_store
+    if LOG_MODE == 'sqlite':
+        return get_history_store()
+    if LOG_MODE == 'json':
+        return None
+    if _graph_store is None:
+        _graph_store = JsonlGraphStore(os.path.join(LOG_DIR, DEFAULT_GRAPHS_FILE))
+    return _graph_store
+
+
+# Function: load_graph
+# Description:
+#     Returns a stored input graph with dense matrices and the number of runs that submitted it.
+#
+# Returns:
+#     dict or None: {'graph_hash': str, 'hits': int, 'adjacency_matrix': ..., 'weight_matrix': ...}
+def load_graph(graph_hash):
+    store = get_graph_store()
+    graph = store.get(graph_hash) if store is not None else None
+    if graph is None:
+        return None
+    # Queued runs count as hits too
+    if _record_writer is not None:
+        _record_writer.flush()
+    result = {key: decode_matrix(value) for key, value in graph.items()}
+    result['graph_hash'] = graph_hash
+    result['hits'] = store.hits(graph_hash)
+    return result
+
+
+def _deduplicate_record(record, graph_store):
+    # Replace the matrices of the input with the hash of the stored graph
+    input_data = record.get('input_data')
+    if not isinstance(input_data, dict):
+        return record
+    graph = extract_graph(input_data)
+    if graph is None:
+        return record
+
+    slim_input = {key: value for key, value in input_data.items() if key not in GRAPH_FIELDS}
+    slim_input['graph_hash'] = graph_store.intern(graph)
+    return dict(record, input_data=slim_input)
+
+
+def _expand_record(record):
+    # Put the referenced graph back into the input and decode compact matrices
+    input_data = record.get('input_data')
+    if isinstance(input_data, dict) and input_data.get('graph_hash'):
+        store = get_graph_store()
+        graph = store.get(input_data['graph_hash']) if store is not None else None
+        if graph is not None:
+            input_data = dict(input_data)
+            for key, value in graph.items():
+                input_data[key] = decode_matrix(value)
+            record = dict(record, input_data=input_data)
+    return decode_record(record)
+
+
+# Function: query_algorithm_records
+# Description:
+#     Returns one page of run records matching the filters, newest first.
+#     In 'sqlite' mode the query runs on the indexes; the file based modes fall back to a scan.
+#
+# Parameters:
+#     algorithm (str or None), is_error (bool or None), min_vertices / max_vertices (int or None),
+#     since / until (ISO timestamp str or None), limit (int), offset (int).
+#
+# Returns:
+#     dict: {'total': int, 'records': list of dict}
+def query_algorithm_records(algorithm=None, is_error=None, min_vertices=None, max_vertices=None,
+                            since=None, until=None, limit=50, offset=0):
+    if _record_writer is not None:
+        _record_writer.flush()
+
+    if LOG_MODE == 'sqlite':
+        page = get_history_store().query(algorithm, is_error, min_vertices, max_vertices,
+                                         since, until, limit, offset)
+        page['records'] = [_expand_record(record) for record in page['records']]
+        return page
+
+    matches = []
+    for algorithm_key, records in load_algorithm_records().items():
+        if algorithm and algorithm_key != algorithm:
+            continue
+        for record in records:
+            try:
+                num_vertices = int((record.get('input_data') or {}).get('num_vertices'))
+            except (TypeError, ValueError):
+                num_vertices = None
+            timestamp = record.get('timestamp') or ''
+            if is_error is not None and bool(record.get('error_message')) != is_error:
+                continue
+            if min_vertices is not None and (num_vertices is None or num_vertices < min_vertices):
+                continue
+            if max_vertices is not None and (num_vertices is None or num_vertices > max_vertices):
+                continue
+            if (since and timestamp < since) or (until and timestamp > until):
+                continue
+            matches.append(dict(record, algorithm=algorithm_key))
+
+    matches.sort(key=lambda record: record.get('timestamp') or '', reverse=True)
+    limit = max(0, min(int(limit), MAX_PAGE_SIZE))
+    offset = max(0, int(offset))
+    return {'total': len(matches), 'records': matches[offset:offset + limit]}
+
+
+def _load_json_file():
     # Try loading existing JSON data from file or start a new dictionary if fails
     try:
-        if os.path.exists(json_path):
-            with open(json_path, 'r') as f:
-                data = json.load(f)
-        else:
-            data = {}
+        if os.path.exists(JSON_PATH):
+            with open(JSON_PATH, 'r') as f:
+                return json.load(f)
     except json.JSONDecodeError:
         # If JSON is invalid, overwrite with fresh dictionary
-        data = {}
+        pass
+    return {}
+
+
+def _append_to_json_file(algorithm_key, records):
+    # Ensure the directory for the JSON file exists, create if necessary
+    os.makedirs(os.path.dirname(JSON_PATH), exist_ok=True)
+
+    data = _load_json_file()
 
     # Ensure there is a list to hold records for the current algorithm
     if algorithm_key not in data:
         data[algorithm_key] = []
 
-    # Append the new record to the list for this algorithm
-    data[algorithm_key].append(record)
+    # Append the new records to the list for this algorithm
+    data[algorithm_key].extend(records)
 
     # Write the updated data dictionary back to the JSON file with pretty formatting
-    with open(json_path, 'w') as f:
-        json.dump(data, f, indent=4)
\ No newline at end of file
+    with open(JSON_PATH, 'w') as f:
+        json.dump(data, f, indent=4)
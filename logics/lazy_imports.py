@@ -0,0 +1,110 @@
+"""
+Deferred imports of the heavy scientific libraries, and an import-time report.
+
+matplotlib, networkx and numpy take most of the start-up time of a worker
+process, yet pages like the home page never need them. Modules bind those
+libraries with lazy_import() instead of a top-level import: the returned
+object imports the real module the first time one of its attributes is used.
+
+    nx = lazy_import('networkx')
+    G = nx.Graph()   # networkx is imported here
+
+Run `python app.py --importtime` (or `python -m logics.lazy_imports`) to print a
+`python -X importtime` summary of what importing the application costs.
+"""
+
+import os
+import sys
+import importlib
+import subprocess
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access.
+
+    Parameters:
+        name (str): Full name of the module, e.g. 'matplotlib.colors'.
+    """
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            # import_module holds the import lock, so concurrent first uses are safe
+            module = importlib.import_module(self.__dict__['_name'])
+            self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attribute):
+        return getattr(self._load(), attribute)
+
+    def __repr__(self):
+        state = 'loaded' if self.__dict__['_module'] is not None else 'not loaded'
+        return f"<lazy module '{self.__dict__['_name']}' ({state})>"
+
+
+def lazy_import(name):
+    """Returns the module if it is already imported, a LazyModule for it otherwise."""
+    module = sys.modules.get(name)
+    return module if module is not None else LazyModule(name)
+
+
+def parse_importtime(output):
+    """
+    Parses the stderr of `python -X importtime`.
+
+    Returns:
+        list: (module, self_us, cumulative_us, depth) for every imported module, in import order.
+    """
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        # Nested imports are indented by two spaces per level
+        stripped = name.lstrip(' ')
+        depth = (len(name) - len(stripped) - 1) // 2
+        rows.append((stripped, int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def importtime_report(module='routes', top=15):
+    """
+    Imports the module in a fresh interpreter with -X importtime and returns a text
+    summary: total time of the import and the slowest modules it imports directly
+    (cumulative, i.e. including everything they import in turn).
+
+    Parameters:
+        module (str): Module whose import is measured.
+        top (int): Number of imports listed.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    rows = parse_importtime(result.stderr)
+    ends = [i for i, row in enumerate(rows) if row[0] == module and row[3] == 0]
+    if result.returncode != 0 or not ends:
+        return f"Import-time report failed:\n{result.stderr[-2000:]}"
+
+    # A module is printed after everything it imports (one level deeper),
+    # so its subtree is the run of nested rows right before it
+    end = ends[-1]
+    first = end
+    while first > 0 and rows[first - 1][3] > 0:
+        first -= 1
+    direct = [row for row in rows[first:end] if row[3] == 1]
+
+    lines = [f"Importing '{module}' took {rows[end][2] / 1000:.1f} ms "
+             f"({end - first + 1} modules). Slowest direct imports:"]
+    for name, self_us, cumulative_us, _ in sorted(direct, key=lambda row: -row[2])[:top]:
+        lines.append(f"  {cumulative_us / 1000:9.1f} ms  {name}")
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    print(importtime_report(*sys.argv[1:2]))
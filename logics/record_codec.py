@@ -0,0 +1,120 @@
+"""
+Compact encoding of the matrices stored in run records.
+
+Adjacency, weight and result matrices are mostly zeros, so new records store
+them as sorted edge lists instead of n x n lists:
+
+    {'n': 4, 'symmetric': True, 'edges': [[0, 1], [1, 2], [2, 3]]}
+    {'n': 3, 'symmetric': True, 'edges': [[0, 1, 5], [1, 2, 4]]}
+
+Pairs are used when every stored value is 1, weighted triples otherwise.
+Symmetric matrices keep only the upper triangle (including the diagonal).
+Records encoded this way carry 'encoding': 'edges' and are decoded back to
+plain matrices by decode_record, so readers never see the difference.
+"""
+
+ENCODING_NAME = 'edges'
+
+# Matrix fields of a record: (section, key); section None means the top level
+MATRIX_FIELDS = (
+    ('input_data', 'adjacency_matrix'),
+    ('input_data', 'weight_matrix'),
+    (None, 'result_matrix'),
+)
+
+
+def _is_square_int_matrix(matrix):
+    if not isinstance(matrix, list) or not matrix:
+        return False
+    n = len(matrix)
+    for row in matrix:
+        if not isinstance(row, list) or len(row) != n:
+            return False
+        for value in row:
+            if type(value) is not int:
+                return False
+    return True
+
+
+def encode_matrix(matrix):
+    """
+    Encodes a square integer matrix as an edge list.
+    Anything else (None, error values, coloring lists) is returned unchanged.
+    """
+    if not _is_square_int_matrix(matrix):
+        return matrix
+
+    n = len(matrix)
+    symmetric = all(matrix[i][j] == matrix[j][i] for i in range(n) for j in range(i + 1, n))
+
+    entries = []
+    for i, row in enumerate(matrix):
+        # For symmetric matrices the upper triangle is enough
+        for j in range(i if symmetric else 0, n):
+            if row[j]:
+                entries.append((i, j, row[j]))
+    return _edge_dict(n, symmetric, entries)
+
+
+def encode_edges(n, entries):
+    """
+    Encodes a symmetric matrix given by the (i, j, value) entries of its upper
+    triangle in row order, as encode_matrix would, without building the matrix.
+    """
+    return _edge_dict(n, True, list(entries))
+
+
+def _edge_dict(n, symmetric, entries):
+    if all(value == 1 for _, _, value in entries):
+        edges = [[i, j] for i, j, _ in entries]
+    else:
+        edges = [[i, j, value] for i, j, value in entries]
+    return {'n': n, 'symmetric': symmetric, 'edges': edges}
+
+
+def decode_matrix(value):
+    """Restores a matrix encoded by encode_matrix; other values are returned unchanged."""
+    if not (isinstance(value, dict) and 'edges' in value and 'n' in value):
+        return value
+
+    n = value['n']
+    symmetric = value.get('symmetric', False)
+    matrix = [[0] * n for _ in range(n)]
+    for edge in value['edges']:
+        i, j = edge[0], edge[1]
+        weight = edge[2] if len(edge) > 2 else 1
+        matrix[i][j] = weight
+        if symmetric:
+            matrix[j][i] = weight
+    return matrix
+
+
+def encode_record(record):
+    """Returns a copy of the record with its matrices stored as edge lists."""
+    encoded = dict(record)
+    if isinstance(record.get('input_data'), dict):
+        encoded['input_data'] = dict(record['input_data'])
+
+    for section, key in MATRIX_FIELDS:
+        target = encoded if section is None else encoded.get(section)
+        if isinstance(target, dict) and key in target:
+            target[key] = encode_matrix(target[key])
+
+    encoded['encoding'] = ENCODING_NAME
+    return encoded
+
+
+def decode_record(record):
+    """Returns the record with dense matrices, whatever encoding it was stored with."""
+    if record.get('encoding') != ENCODING_NAME:
+        return record
+
+    decoded = {key: value for key, value in record.items() if key != 'encoding'}
+    if isinstance(record.get('input_data'), dict):
+        decoded['input_data'] = dict(record['input_data'])
+
+    for section, key in MATRIX_FIELDS:
+        target = decoded if section is None else decoded.get(section)
+        if isinstance(target, dict) and key in target:
+            target[key] = decode_matrix(target[key])
+    return decoded
@@ -0,0 +1,176 @@
+"""
+Background write-behind for algorithm run records.
+
+Request handlers only put the finished record into a bounded queue; a dedicated
+thread takes records off the queue and writes them in groups ("group commit"),
+so many records share one file append and disk latency never lands on the
+response time of a page.
+"""
+
+import sys
+import time
+import queue
+import threading
+
+# What submit() does when the queue is full:
+#     'block' - wait up to put_timeout seconds for free space, then write synchronously
+#     'drop'  - discard the record and count it in RecordWriter.dropped
+#     'sync'  - write the record immediately in the calling thread
+QUEUE_FULL_POLICIES = ('block', 'drop', 'sync')
+
+
+class _FlushMarker:
+    """Queue item that wakes up flush() once everything queued before it is written."""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class RecordWriter:
+    """
+    Bounded queue + writer thread for run records.
+
+    Parameters:
+        write_batch (callable): Function (algorithm_key, records) that persists a group of records.
+        max_queue_size (int): Maximum number of records waiting to be written.
+        flush_interval (float): Maximum time in seconds a record waits before being written.
+        flush_size (int): Maximum number of records written in one group.
+        on_full (str): Backpressure policy, one of QUEUE_FULL_POLICIES.
+        put_timeout (float): How long the 'block' policy waits for space in the queue.
+    """
+
+    def __init__(self, write_batch, max_queue_size=1000, flush_interval=0.5, flush_size=200,
+                 on_full='block', put_timeout=1.0):
+        if on_full not in QUEUE_FULL_POLICIES:
+            raise ValueError(f"Unknown queue policy: {on_full}")
+
+        self.write_batch = write_batch
+        self.flush_interval = flush_interval
+        self.flush_size = max(1, flush_size)
+        self.on_full = on_full
+        self.put_timeout = put_timeout
+
+        self.dropped = 0  # Records discarded by the 'drop' policy
+        self.written = 0  # Records successfully handed to write_batch
+
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Starts the writer thread (once)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='record-writer', daemon=True)
+            self._thread.start()
+        return self
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(self, algorithm_key, record):
+        """
+        Queues a record for writing, applying the backpressure policy if the queue is full.
+        After close() the record is written synchronously so nothing is lost.
+        """
+        if not self.running or self._stopping.is_set():
+            self._write_group(algorithm_key, [record])
+            return
+
+        try:
+            if self.on_full == 'block':
+                self._queue.put((algorithm_key, record), timeout=self.put_timeout)
+            else:
+                self._queue.put_nowait((algorithm_key, record))
+        except queue.Full:
+            if self.on_full == 'drop':
+                self.dropped += 1
+            else:
+                # 'sync', or 'block' after the timeout: the caller pays for the write
+                self._write_group(algorithm_key, [record])
+
+    def flush(self, timeout=None):
+        """Blocks until every record queued before the call has been written."""
+        if not self.running:
+            return True
+        marker = _FlushMarker()
+        self._queue.put(marker)
+        return marker.done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """Drains the queue, stops the writer thread and waits for it to finish."""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._queue.put(None)  # Wake the thread up if it is waiting for records
+        self._thread.join(timeout)
+        self._thread = None
+        # Anything submitted while the thread was shutting down
+        self._drain_remaining()
+
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            batch, markers, stop = [], [], False
+            deadline = time.monotonic() + self.flush_interval
+
+            # Collect a group of records: until flush_size, the deadline, a flush request or stop
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, _FlushMarker):
+                    markers.append(item)
+                else:
+                    batch.append(item)
+
+                if stop or markers or len(batch) >= self.flush_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            self._write_batch(batch)
+            for marker in markers:
+                marker.done.set()
+
+            if stop:
+                self._drain_remaining()
+                return
+
+    def _drain_remaining(self):
+        """Writes everything still sitting in the queue without waiting."""
+        batch = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, _FlushMarker):
+                item.done.set()
+            elif item is not None:
+                batch.append(item)
+        self._write_batch(batch)
+
+    def _write_batch(self, batch):
+        # Group records by algorithm, keeping their relative order
+        groups = {}
+        for algorithm_key, record in batch:
+            groups.setdefault(algorithm_key, []).append(record)
+        for algorithm_key, records in groups.items():
+            self._write_group(algorithm_key, records)
+
+    def _write_group(self, algorithm_key, records):
+        try:
+            self.write_batch(algorithm_key, records)
+            self.written += len(records)
+        except Exception as e:
+            # A failed log write must never take the web server down
+            print(f"Failed to write {len(records)} {algorithm_key} record(s): {e}", file=sys.stderr)
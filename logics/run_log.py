@@ -0,0 +1,263 @@
+"""
+Append-only JSON Lines storage for algorithm run records.
+
+Every record is written as a single line to a segment file named after the
+algorithm (and optionally the worker process that produced it), so saving a
+run is one O(1) append instead of re-reading and re-dumping the whole history.
+When the active segment grows past a size limit it is renamed to a numbered
+segment and a fresh one is started.
+
+Layout of the log directory:
+    bfs.jsonl               active segment for BFS
+    bfs.000001.jsonl        rotated (closed) segments, oldest first
+    dfs-w2.jsonl            active segment written by worker "w2"
+"""
+
+import os
+import re
+import json
+
+# Directory holding the segment files
+DEFAULT_LOG_DIR = 'static/dynamic/logos/runs'
+
+# Active segments are rotated once they would grow past this size
+DEFAULT_MAX_SEGMENT_BYTES = 4 * 1024 * 1024
+
+# Suffix of the line-offset index kept next to a segment
+INDEX_SUFFIX = '.idx'
+
+# <algorithm>[-<worker>][.<sequence>].jsonl
+_SEGMENT_RE = re.compile(r'^(?P<algorithm>[a-z]+)(?:-(?P<worker>\w+))?(?:\.(?P<seq>\d+))?\.jsonl$')
+
+# Characters a worker id may not contain in a segment name
+_WORKER_UNSAFE_RE = re.compile(r'[^A-Za-z0-9_]')
+
+
+def clean_worker_id(worker_id):
+    """
+    Returns the worker id as used in segment names: characters other than
+    letters, digits and '_' become '_' (so 'node-1' writes 'bfs-node_1.jsonl',
+    which _SEGMENT_RE lists again), None for an empty id.
+    """
+    if not worker_id:
+        return None
+    return _WORKER_UNSAFE_RE.sub('_', str(worker_id))
+
+
+def _segment_base(algorithm_key, worker_id=None):
+    """Returns the segment name prefix for an algorithm and optional worker."""
+    if worker_id:
+        return f'{algorithm_key}-{worker_id}'
+    return algorithm_key
+
+
+def segment_path(algorithm_key, log_dir=DEFAULT_LOG_DIR, worker_id=None):
+    """
+    Returns the path of the active (writable) segment.
+
+    Parameters:
+        algorithm_key (str): Normalized algorithm name ('bfs', 'dfs', 'beam', 'coloring').
+        log_dir (str): Directory holding the segment files.
+        worker_id (str or None): Worker identifier for per-worker segments.
+
+    Returns:
+        str: Path of the active segment file.
+    """
+    return os.path.join(log_dir, _segment_base(algorithm_key, worker_id) + '.jsonl')
+
+
+def list_numbered_segments(algorithm_key, log_dir=DEFAULT_LOG_DIR):
+    """
+    Lists all segments of an algorithm grouped by worker, oldest first, with their
+    sequence numbers. The active segment gets the number it will have once rotated,
+    so a (sequence, line) position stays valid across a rotation.
+
+    Returns:
+        list of (worker_id, [(sequence, path)]): One entry per worker (None for the shared segment).
+    """
+    groups = {}
+    if not os.path.isdir(log_dir):
+        return []
+
+    for name in os.listdir(log_dir):
+        match = _SEGMENT_RE.match(name)
+        if not match or match.group('algorithm') != algorithm_key:
+            continue
+        seq = int(match.group('seq')) if match.group('seq') else None
+        groups.setdefault(match.group('worker'), []).append((seq, os.path.join(log_dir, name)))
+
+    result = []
+    for worker, entries in sorted(groups.items(), key=lambda item: item[0] or ''):
+        rotated = sorted((seq, path) for seq, path in entries if seq is not None)
+        active = [path for seq, path in entries if seq is None]
+        if active:
+            # The active segment sorts after every rotated one
+            rotated.append(((rotated[-1][0] if rotated else 0) + 1, active[0]))
+        result.append((worker, rotated))
+    return result
+
+
+def list_segments(algorithm_key, log_dir=DEFAULT_LOG_DIR):
+    """
+    Lists all segments of an algorithm grouped by worker, oldest first.
+
+    Returns:
+        list of (worker_id, [paths]): Rotated segments in sequence order followed
+        by the active segment, for each worker (None for the shared segment).
+    """
+    return [
+        (worker, [path for _, path in entries])
+        for worker, entries in list_numbered_segments(algorithm_key, log_dir)
+    ]
+
+
+def _rotate(path, algorithm_key, log_dir, worker_id):
+    """Renames the active segment to the next numbered segment."""
+    base = _segment_base(algorithm_key, worker_id)
+    last_seq = 0
+    for name in os.listdir(log_dir):
+        match = _SEGMENT_RE.match(name)
+        if (match and match.group('seq') and match.group('algorithm') == algorithm_key
+                and match.group('worker') == (worker_id or None)):
+            last_seq = max(last_seq, int(match.group('seq')))
+    rotated_path = os.path.join(log_dir, f'{base}.{last_seq + 1:06d}.jsonl')
+    os.replace(path, rotated_path)
+    # The line-offset index (see history_browser) belongs to the renamed segment
+    if os.path.exists(path + INDEX_SUFFIX):
+        os.replace(path + INDEX_SUFFIX, rotated_path + INDEX_SUFFIX)
+
+
+def encode_line(record):
+    """Serializes a record as one compact JSON line (with trailing newline)."""
+    return json.dumps(record, separators=(',', ':'), ensure_ascii=False) + '\n'
+
+
+def append_records(algorithm_key, records, log_dir=DEFAULT_LOG_DIR, worker_id=None,
+                   max_segment_bytes=DEFAULT_MAX_SEGMENT_BYTES):
+    """
+    Appends records to the active segment of an algorithm in a single write.
+
+    Parameters:
+        algorithm_key (str): Normalized algorithm name.
+        records (list of dict): Records to append, in order.
+        log_dir (str): Directory holding the segment files.
+        worker_id (str or None): Worker identifier for per-worker segments.
+        max_segment_bytes (int): Size limit that triggers rotation of the active segment.
+
+    Returns:
+        None
+    """
+    if not records:
+        return
+
+    os.makedirs(log_dir, exist_ok=True)
+    path = segment_path(algorithm_key, log_dir, worker_id)
+    payload = ''.join(encode_line(record) for record in records).encode('utf-8')
+
+    # Rotate before the write so a single batch is never split across segments
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        size = 0
+    if size and size + len(payload) > max_segment_bytes:
+        _rotate(path, algorithm_key, log_dir, worker_id)
+
+    # Binary append mode maps to O_APPEND, so concurrent writers never interleave lines
+    with open(path, 'ab') as f:
+        f.write(payload)
+
+
+def iter_segment(path):
+    """
+    Yields the records stored in one segment file.
+    Lines that cannot be decoded (e.g. a write cut short by a crash) are skipped.
+    """
+    try:
+        with open(path, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        return
+
+
+def iter_records(algorithm_key, log_dir=DEFAULT_LOG_DIR):
+    """
+    Yields all records of an algorithm in the order they were written.
+    Records written by several workers are merged by timestamp.
+    """
+    groups = list_segments(algorithm_key, log_dir)
+
+    if len(groups) == 1:
+        for path in groups[0][1]:
+            yield from iter_segment(path)
+        return
+
+    # Several workers wrote in parallel: sort their records by timestamp (stable)
+    merged = [record for _, paths in groups for path in paths for record in iter_segment(path)]
+    merged.sort(key=lambda record: record.get('timestamp') or '')
+    yield from merged
+
+
+def load_records(log_dir=DEFAULT_LOG_DIR, algorithms=('bfs', 'dfs', 'beam', 'coloring')):
+    """
+    Reads the log back into the legacy view of input_data.json.
+
+    Returns:
+        dict: Algorithm name -> list of records, only for algorithms that have records.
+    """
+    data = {}
+    for algorithm_key in algorithms:
+        records = list(iter_records(algorithm_key, log_dir))
+        if records:
+            data[algorithm_key] = records
+    return data
+
+
+def migrate_json_log(json_path, log_dir=DEFAULT_LOG_DIR, max_segment_bytes=DEFAULT_MAX_SEGMENT_BYTES):
+    """
+    One-shot migration of a legacy input_data.json file into segment files.
+
+    The records are appended to the log in their original order and the source
+    file is renamed to <json_path>.migrated so it is never imported twice.
+
+    Returns:
+        dict: Algorithm name -> number of migrated records.
+    """
+    if not os.path.exists(json_path):
+        return {}
+
+    with open(json_path, 'r') as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError:
+            data = {}
+
+    migrated = {}
+    for algorithm_key, records in data.items():
+        if not isinstance(records, list):
+            continue
+        algorithm_key = algorithm_key.lower()
+        append_records(algorithm_key, records, log_dir, max_segment_bytes=max_segment_bytes)
+        migrated[algorithm_key] = len(records)
+
+    os.replace(json_path, json_path + '.migrated')
+    return migrated
+
+
+if __name__ == '__main__':
+    # Usage: python -m logics.run_log [path/to/input_data.json] [log_dir]
+    import sys
+
+    source = sys.argv[1] if len(sys.argv) > 1 else 'static/dynamic/logos/input_data.json'
+    target = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_LOG_DIR
+    counts = migrate_json_log(source, target)
+    for name, count in sorted(counts.items()):
+        print(f'{name}: {count} records migrated')
+    if not counts:
+        print('Nothing to migrate')
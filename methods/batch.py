@@ -0,0 +1,231 @@
+"""
+Offline batch runner: runs the algorithms over files of graphs without the web app.
+
+    python -m methods.batch graphs/ more.jsonl -a bfs -a coloring -o results.jsonl --summary summary.json
+
+Inputs are JSON Lines files (one graph per line) and directories, of which every
+*.jsonl file and every *.json file (one graph, or a list of graphs) is read.
+Graphs use the format of the JSON API (see logics/api_utils.parse_graph), e.g.
+{"id": "g1", "num_vertices": 3, "edges": [[1, 2], [2, 3]], "start_vertex": 1}.
+Every graph is run with each --algorithm, or with its own "algorithm" field when
+no --algorithm is given. Pictures are never drawn and runs are not added to the
+web app's history.
+
+Jobs are sent to a pool of worker processes in chunks; at most a few chunks per
+worker are in flight, so corpora of any size are streamed. One JSON result line
+is written per graph and algorithm, in the order the chunks finish; 'source'
+(file:line) and 'id' identify the graph. A timing summary goes to stderr.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from array import array
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from logics.api_utils import execute_api_job, API_ALGORITHMS
+
+# Chunks in flight per worker
+CHUNKS_PER_WORKER = 4
+
+
+def iter_sources(paths):
+    """
+    Yields (source, text) for every graph of the given files and directories, where
+    source is 'path:line' (JSON Lines) or 'path#index' (graphs of a JSON list file).
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            names = sorted(name for name in os.listdir(path) if name.endswith(('.json', '.jsonl')))
+            yield from iter_sources([os.path.join(path, name) for name in names])
+        elif path.endswith('.json'):
+            with open(path, encoding='utf-8') as f:
+                text = f.read()
+            try:
+                data = json.loads(text)
+            except ValueError:
+                yield path, text  # Reported as invalid JSON by the worker
+                continue
+            if isinstance(data, list):
+                for index, graph in enumerate(data):
+                    yield f'{path}#{index}', json.dumps(graph)
+            else:
+                yield path, text
+        else:
+            with open(path, encoding='utf-8') as f:
+                for number, line in enumerate(f, 1):
+                    if line.strip():
+                        yield f'{path}:{number}', line
+
+
+def iter_chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_chunk(chunk, algorithms, max_vertices=None):
+    """
+    Runs the algorithms on a chunk of (source, text) graphs and returns the result
+    lines: (encoded JSON line, algorithm, status, seconds) per graph and algorithm.
+    Runs in the worker processes.
+    """
+    results = []
+    for source, text in chunk:
+        try:
+            job = json.loads(text)
+        except ValueError:
+            job = None
+        names = algorithms or [job.get('algorithm') if isinstance(job, dict) else None]
+        for algorithm in names:
+            started = time.perf_counter()
+            if job is None:
+                payload, status = {'error': "The graph must be valid JSON"}, 400
+            elif not algorithm:
+                payload, status = {'error': "No algorithm: pass --algorithm or set 'algorithm' in the graph"}, 400
+            else:
+                if isinstance(job, dict):
+                    job = dict(job, image=False)
+                try:
+                    payload, status, _ = execute_api_job(algorithm, job, max_vertices)
+                except Exception as e:
+                    payload, status = {'error': f"Internal error: {e}"}, 500
+            seconds = time.perf_counter() - started
+
+            line = {'source': source}
+            if isinstance(job, dict) and 'id' in job:
+                line['id'] = job['id']
+            line['algorithm'] = algorithm
+            line['status'] = status
+            line.update(payload)
+            results.append((json.dumps(line) + '\n', algorithm, status, seconds))
+    return results
+
+
+class Summary:
+    """Counts and run times of the results, per algorithm."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.runs = {}
+
+    def add(self, algorithm, status, seconds):
+        stats = self.runs.setdefault(algorithm or '-', {'runs': 0, 'errors': 0, 'seconds': 0.0, 'times': array('d')})
+        stats['runs'] += 1
+        stats['errors'] += status != 200
+        stats['seconds'] += seconds
+        stats['times'].append(seconds)
+
+    def as_dict(self):
+        wall = time.perf_counter() - self.started
+        total = sum(stats['runs'] for stats in self.runs.values())
+        algorithms = {}
+        for name, stats in sorted(self.runs.items()):
+            times = sorted(stats['times'])
+            algorithms[name] = {
+                'runs': stats['runs'],
+                'errors': stats['errors'],
+                'cpu_seconds': round(stats['seconds'], 6),
+                'mean_ms': round(stats['seconds'] / stats['runs'] * 1000, 3),
+                'p95_ms': round(times[min(len(times) - 1, int(len(times) * 0.95))] * 1000, 3),
+                'max_ms': round(times[-1] * 1000, 3),
+            }
+        return {
+            'runs': total,
+            'errors': sum(stats['errors'] for stats in self.runs.values()),
+            'wall_seconds': round(wall, 6),
+            'runs_per_second': round(total / wall, 1) if wall > 0 else None,
+            'algorithms': algorithms,
+        }
+
+    def text(self):
+        summary = self.as_dict()
+        lines = [f"{summary['runs']} runs ({summary['errors']} errors) in {summary['wall_seconds']:.2f} s, "
+                 f"{summary['runs_per_second']} runs/s"]
+        for name, stats in summary['algorithms'].items():
+            lines.append(f"  {name:9} {stats['runs']:8} runs {stats['errors']:6} errors  "
+                         f"mean {stats['mean_ms']:9.3f} ms  p95 {stats['p95_ms']:9.3f} ms  max {stats['max_ms']:9.3f} ms")
+        return '\n'.join(lines)
+
+
+def run(paths, algorithms, output, workers=None, chunk_size=64, max_vertices=None):
+    """
+    Runs the batch and writes the result lines to output (a text file object).
+
+    Parameters:
+        paths (list): Input files and directories.
+        algorithms (list): Algorithms to run on every graph; empty to use each graph's 'algorithm'.
+        workers (int): Worker processes (one per CPU by default); 0 runs everything in this process.
+        chunk_size (int): Graphs sent to a worker at a time.
+        max_vertices (int): Largest accepted graph (the API limits by default).
+
+    Returns:
+        Summary: Counts and timings.
+    """
+    summary = Summary()
+    chunks = iter_chunks(iter_sources(paths), max(1, chunk_size))
+    workers = (os.cpu_count() or 1) if workers is None else workers
+
+    def write(results):
+        for line, algorithm, status, seconds in results:
+            output.write(line)
+            summary.add(algorithm, status, seconds)
+
+    if workers <= 0:
+        for chunk in chunks:
+            write(run_chunk(chunk, algorithms, max_vertices))
+        return summary
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for chunk in chunks:
+            pending.add(pool.submit(run_chunk, chunk, algorithms, max_vertices))
+            while len(pending) >= workers * CHUNKS_PER_WORKER:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    write(future.result())
+        for future in pending:
+            write(future.result())
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m methods.batch', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('inputs', nargs='+', help="JSON Lines files, JSON files or directories of graphs")
+    parser.add_argument('-a', '--algorithm', action='append', choices=API_ALGORITHMS, default=[],
+                        help="algorithm to run (repeatable); by default each graph's 'algorithm' field")
+    parser.add_argument('-o', '--output', default='-', help="result file (JSON Lines), '-' for stdout")
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help="worker processes (default: one per CPU, 0: no pool)")
+    parser.add_argument('--chunk-size', type=int, default=64, help="graphs per task sent to a worker")
+    parser.add_argument('--max-vertices', type=int, default=None, help="largest accepted graph")
+    parser.add_argument('--summary', help="also write the timing summary as JSON to this file")
+    args = parser.parse_args(argv)
+
+    for path in args.inputs:
+        if not os.path.exists(path):
+            parser.error(f"{path} does not exist")
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        summary = run(args.inputs, args.algorithm, output, args.workers, args.chunk_size, args.max_vertices)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(summary.text(), file=sys.stderr)
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            json.dump(summary.as_dict(), f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
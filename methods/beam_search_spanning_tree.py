@@ -1,19 +1,25 @@
 import heapq
-import os
-import networkx as nx
-import matplotlib.pyplot as plt
+from logics.lazy_imports import lazy_import
+from methods.render_cache import render_key, cached_render_path
+from methods.svg_render import render_svg, renderer_for
+from methods.graph_render import render_png
+from methods.render_pool import offloaded, RenderTimeout
+from methods.graph_layout import spanning_tree_layout
+from methods.graph import as_graph
+
+# networkx is loaded on first use, not when the app starts
+nx = lazy_import('networkx')
 
 # Function to build a spanning tree using the Beam Search method
-# Inputs: number of vertices, adjacency matrix, weight matrix, optional start vertex, beam width
+# Inputs: number of vertices, adjacency matrix and weight matrix (or a weighted Graph, see methods/graph.py,
+#         with weight_matrix None), optional start vertex, beam width
 # Returns: result adjacency matrix if successful, otherwise an error message
 def beam_search_spanning_tree(n, adjacency_matrix, weight_matrix, start=0, beam_width=2):
     result_matrix = [[0] * n for _ in range(n)]
+    graph = as_graph(adjacency_matrix, weight_matrix)
 
-    edges = []  # List to store all possible edges with their weights
-    for i in range(n):
-        for j in range(i + 1, n):
-            if adjacency_matrix[i][j] and weight_matrix[i][j]:
-                edges.append((weight_matrix[i][j], i, j))  # Store as (weight, vertex1, vertex2)
+    # All possible edges with their weights, stored as (weight, vertex1, vertex2); zero weights mean no edge
+    edges = [(weight, i, j) for i, j, weight in graph.weighted_edges() if weight]
 
     pq = [(0, [], {start})]  # Priority queue with tuples: (total weight, list of edges, set of visited vertices)
 
@@ -42,29 +48,42 @@ def beam_search_spanning_tree(n, adjacency_matrix, weight_matrix, start=0, beam_
                     if len(new_edges) == n - 1:
                         for uu, vv, _ in new_edges:
                             result_matrix[uu][vv] = result_matrix[vv][uu] = 1  # Fill symmetric matrix
-                        draw_graph(result_matrix, adjacency_matrix, weight_matrix, n)
                         return result_matrix  # Return the result matrix
 
                     # Push the new state into the priority queue
                     heapq.heappush(pq, (new_total_weight, new_edges, new_visited))
 
     # If spanning tree could not be constructed (graph is disconnected)
-    draw_graph(None, adjacency_matrix, weight_matrix, n)
     return "The spanning tree is not built: the graph is disconnected."
 
 # Function to visualize the input graph and the resulting spanning tree (if built)
-# Inputs: result adjacency matrix (spanning tree), input adjacency matrix, weight matrix, number of vertices
+# Inputs: result adjacency matrix (spanning tree), input adjacency matrix and weight matrix
+#         (or a weighted Graph with weight_matrix None), number of vertices
+# Returns: path of the image, named by the hash of the inputs so every result has its own URL,
+#          or None if rendering took longer than RENDER_TIMEOUT
+# Repeated renders of the same graph and tree are served from the render cache
+# The image format (matplotlib PNG or lightweight SVG) is set by GRAPH_RENDERER / GRAPH_RENDERER_BEAM
 def draw_graph(result_matrix, adjacency_matrix, weight_matrix, n):
+    graph = as_graph(adjacency_matrix, weight_matrix)
+    key = render_key('beam', n=n, edges=graph.edge_list(), tree=result_matrix)
+    fmt = renderer_for('beam')
+    # PNG is drawn in the render pool (methods/render_pool.py), SVG right here
+    render = _render_graph_svg if fmt == 'svg' else offloaded(_render_graph_png)
+    try:
+        return cached_render_path(key, lambda: render(result_matrix, graph, n), fmt)
+    except RenderTimeout:
+        return None  # The page is shown without the picture
+
+
+# Function to prepare the drawing: graph, node positions, all edges and tree edges (1-based)
+# The input graph is a Graph (methods/graph.py)
+def _graph_drawing(result_matrix, graph, n):
     G = nx.Graph()  # Create an empty graph
 
     for i in range(1, n + 1):
         G.add_node(i)  # Add graph nodes (1-based index for display)
 
-    all_edges = []  # List of all edges in the input graph
-    for i in range(n):
-        for j in range(i + 1, n):
-            if adjacency_matrix[i][j]:
-                all_edges.append((i + 1, j + 1))  # Convert to 1-based index
+    all_edges = [(i + 1, j + 1) for i, j in graph.edges()]  # All edges of the input graph, 1-based
 
     tree_edges = []  # Edges included in the spanning tree (if any)
     if result_matrix:
@@ -73,24 +92,20 @@ def draw_graph(result_matrix, adjacency_matrix, weight_matrix, n):
                 if result_matrix[i][j]:
                     tree_edges.append((i + 1, j + 1))
 
-    pos = nx.spring_layout(G, seed=42)  # Position nodes using force-directed layout
-    plt.figure(figsize=(6, 6))
+    # Position nodes: tree layered from the start vertex 0 (node 1), see methods/graph_layout.py
+    pos = spanning_tree_layout(G.nodes, all_edges, tree_edges, root=1)
+    return G, pos, all_edges, tree_edges
 
-    # Draw all graph edges in gray
-    nx.draw_networkx_edges(G, pos, edgelist=all_edges, edge_color='gray', width=1.5)
 
-    # Highlight spanning tree edges in red (if available)
-    if result_matrix:
-        nx.draw_networkx_edges(G, pos, edgelist=tree_edges, edge_color='red', width=2.5)
-
-    # Draw nodes and labels
-    nx.draw_networkx_nodes(G, pos, node_color='lightblue', node_size=1000)
-    nx.draw_networkx_labels(G, pos, font_size=14)
-
-    # Set title and save the figure to a static path
-    plt.title("Spanning Tree (red edges)")
-    plt.tight_layout()
-    static_path = 'static/dynamic/graphs/spanning_tree.png'
-    os.makedirs(os.path.dirname(static_path), exist_ok=True)
-    plt.savefig(static_path)
-    plt.close()
\ No newline at end of file
+# Function to draw the graph as SVG markup (no matplotlib) and return the bytes
+def _render_graph_svg(result_matrix, graph, n):
+    G, pos, all_edges, tree_edges = _graph_drawing(result_matrix, graph, n)
+    return render_svg(pos, all_edges, tree_edges, title="Spanning Tree (red edges)").encode('utf-8')
+
+
+# Function to draw the graph with matplotlib and return the PNG bytes
+# Uses its own Figure (no pyplot global state), so it is safe to call from several threads
+def _render_graph_png(result_matrix, graph, n):
+    G, pos, all_edges, tree_edges = _graph_drawing(result_matrix, graph, n)
+    # Graph edges in gray, spanning tree edges in red, light blue nodes with labels
+    return render_png(pos, all_edges, tree_edges, title="Spanning Tree (red edges)")
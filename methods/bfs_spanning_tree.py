@@ -1,12 +1,74 @@
-import os
-import networkx as nx
-import matplotlib.pyplot as plt
+from collections import deque
+
+from logics.lazy_imports import lazy_import
+from methods.render_cache import render_key, cached_render_path
+from methods.svg_render import render_svg, renderer_for
+from methods.graph_render import render_png
+from methods.render_pool import offloaded, RenderTimeout
+from methods.graph_layout import spanning_tree_layout
+from methods.graph import as_graph
+
+# networkx загружается при первой отрисовке, а не при старте приложения
+nx = lazy_import('networkx')
+
+# Сообщение об ошибке для несвязного графа
+DISCONNECTED_ERROR = "The spanning tree is not built: the graph is disconnected."
+
+
+def bfs_tree(adjacency, start_vertex):
+    """
+    Обход в ширину по спискам соседей за O(V + E).
+
+    Входные параметры:
+    - adjacency: для каждой вершины - последовательность ее соседей (Graph из methods/graph.py,
+      списки соседей и т.п.).
+    - start_vertex (int): стартовая вершина (от 0).
+
+    Возвращает:
+    - parent (List[int]): родитель каждой вершины в дереве обхода; у стартовой вершины -
+      она сама, у недостижимых вершин -1.
+    - order (List[int]): вершины в порядке посещения (только достижимые).
+    - edges (List[Tuple[int, int]]): ребра дерева (родитель, потомок) в порядке посещения.
+    """
+    parent = [-1] * len(adjacency)
+    parent[start_vertex] = start_vertex
+    order = [start_vertex]
+    # deque: извлечение из начала очереди за O(1) вместо O(n) у list.pop(0)
+    queue = deque([start_vertex])
+    popleft, push, visit = queue.popleft, queue.append, order.append
+
+    while queue:
+        current = popleft()
+        for neighbor in adjacency[current]:
+            # -1 - вершина еще не посещена
+            if parent[neighbor] < 0:
+                parent[neighbor] = current
+                push(neighbor)
+                visit(neighbor)
+
+    # Ребра дерева восстанавливаются по массиву родителей, в порядке посещения
+    edges = [(parent[vertex], vertex) for vertex in order[1:]]
+    return parent, order, edges
+
+
+def tree_matrix(num_vertices, edges):
+    """
+    Матрица смежности остовного дерева по его ребрам. Строится только там, где
+    матрица действительно нужна (страница BFS, история запусков).
+    """
+    matrix = [[0] * num_vertices for _ in range(num_vertices)]
+    for u, v in edges:
+        matrix[u][v] = 1
+        matrix[v][u] = 1
+    return matrix
+
+
 """
     Строит остовное дерево графа методом обхода в ширину (BFS).
 
     Входные параметры:
     - num_vertices (int): количество вершин в графе.
-    - adjacency_matrix (List[List[int]]): матрица смежности графа.
+    - adjacency_matrix (List[List[int]] | Graph): матрица смежности графа или уже построенный Graph.
     - start_vertex (int): индекс стартовой вершины (от 0 до num_vertices-1).
 
     Возвращает:
@@ -20,54 +82,56 @@ import matplotlib.pyplot as plt
         - None.
     """
 def bfs_spanning_tree(num_vertices, adjacency_matrix, start_vertex):
-    # Инициализируем результирующую матрицу смежности для остовного дерева нулями
-    result_matrix = [[0] * num_vertices for _ in range(num_vertices)]
-    # Массив для отслеживания посещенных вершин
-    visited = [False] * num_vertices
-    # Отмечаем стартовую вершину как посещенную
-    visited[start_vertex] = True
-    # Очередь для BFS, начинаем со стартовой вершины
-    queue = [start_vertex]
-    # Список вершин, включенных в остовное дерево
-    tree_vertices = [start_vertex]
-    # Список ребер остовного дерева
-    edges = []
-
-    # Основной цикл обхода в ширину
-    while queue:
-        current = queue.pop(0)  # Извлекаем вершину из очереди
-        # Перебираем всех соседей текущей вершины
-        for neighbor in range(num_vertices):
-            # Если сосед связан ребром и еще не посещен
-            if adjacency_matrix[current][neighbor] == 1 and not visited[neighbor]:
-                visited[neighbor] = True  # Отмечаем как посещенного
-                queue.append(neighbor)    # Добавляем в очередь
-                tree_vertices.append(neighbor)  # Добавляем в список вершин дерева
-                edges.append((current, neighbor))  # Добавляем ребро в список
-                # Обновляем результирующую матрицу смежности остовного дерева
-                result_matrix[current][neighbor] = 1
-                result_matrix[neighbor][current] = 1
+    # Обход идет по спискам соседей графа (bfs_tree), а не по строкам матрицы для каждой вершины
+    parent, tree_vertices, edges = bfs_tree(as_graph(adjacency_matrix), start_vertex)
 
     # Проверяем, что остовное дерево охватывает все вершины (граф связный)
     if len(tree_vertices) != num_vertices:
-        return "The spanning tree is not built: the graph is disconnected.", None, None
+        return DISCONNECTED_ERROR, None, None
 
     # Возвращаем матрицу остовного дерева, список вершин и ребер
-    return result_matrix, tree_vertices, edges
+    return tree_matrix(num_vertices, edges), tree_vertices, edges
 
 
 def draw_bfs_graph(result_matrix, adjacency_matrix, num_vertices, bfs_edges=None):
+    # Граф запроса (или построенный из матрицы) - рисунок берет из него ребра
+    graph = as_graph(adjacency_matrix)
+    # Ключ кэша: одинаковый граф и одинаковое дерево дают одинаковую картинку
+    key = render_key(
+        'bfs',
+        num_vertices=num_vertices,
+        edges=graph.edge_list(),
+        tree_edges=[list(edge) for edge in bfs_edges] if bfs_edges else []
+    )
+    # Повторная отправка того же графа берёт готовую картинку из кэша без рисования.
+    # Имя файла - хэш содержимого, поэтому у каждого результата свой URL
+    # и одновременные пользователи не перезаписывают картинки друг друга
+    # Формат картинки (PNG через matplotlib или быстрый SVG) задаётся настройкой GRAPH_RENDERER
+    fmt = renderer_for('bfs')
+    # PNG рисуется в пуле процессов (methods/render_pool.py), SVG - сразу здесь
+    render = _render_bfs_svg if fmt == 'svg' else offloaded(_render_bfs_png)
+    try:
+        static_path = cached_render_path(key, lambda: render(graph, num_vertices, bfs_edges), fmt)
+    except RenderTimeout:
+        # Рисунок не успел построиться: страница покажется без изображения
+        return None
+
+    # Возвращаем путь к сохраненному файлу (для использования, например, на вебе)
+    return f"/{static_path}"
+
+
+def _bfs_drawing(graph, num_vertices, bfs_edges=None):
+    """
+    Готовит данные для рисунка: граф, координаты вершин, все ребра и ребра дерева
+    (вершины нумеруются с 1). graph - Graph из methods/graph.py.
+    """
     G = nx.Graph()  # Создаем пустой граф NetworkX
     # Добавляем вершины с номерами от 1 до num_vertices
     for i in range(1, num_vertices + 1):
         G.add_node(i)
 
-    all_edges = []
-    # Добавляем все ребра исходного графа (по верхнему треугольнику матрицы)
-    for i in range(num_vertices):
-        for j in range(i + 1, num_vertices):
-            if adjacency_matrix[i][j] == 1:
-                all_edges.append((i + 1, j + 1))
+    # Все ребра исходного графа (каждое один раз, u < v), с номерами от 1
+    all_edges = [(u + 1, v + 1) for u, v in graph.edges()]
 
     tree_edges = []
     # Если переданы ребра остовного дерева, преобразуем их для визуализации
@@ -75,30 +139,22 @@ def draw_bfs_graph(result_matrix, adjacency_matrix, num_vertices, bfs_edges=None
         # Сдвигаем индексы на +1, т.к. в NetworkX вершины нумеруются с 1
         tree_edges = [(u + 1, v + 1) for u, v in bfs_edges]
 
-    # Генерируем координаты вершин для визуализации
-    pos = nx.spring_layout(G, seed=42)
-    plt.figure(figsize=(6, 6))
-
-    # Рисуем все ребра исходного графа серым цветом
-    nx.draw_networkx_edges(G, pos, edgelist=all_edges, edge_color='gray', width=1.5)
-    # Если есть ребра остовного дерева, рисуем их красным цветом поверх
-    if tree_edges:
-        nx.draw_networkx_edges(G, pos, edgelist=tree_edges, edge_color='red', width=2.5)
-
-    # Рисуем вершины светло-голубого цвета
-    nx.draw_networkx_nodes(G, pos, node_color='lightblue', node_size=1000)
-    # Добавляем подписи к вершинам (номера вершин)
-    labels = {i: str(i) for i in G.nodes}
-    nx.draw_networkx_labels(G, pos, labels=labels, font_size=14)
-    plt.title("Spanning Tree (red edges)")
-    plt.tight_layout()
-
-    # Создаем папки для сохранения файла, если их нет
-    static_path = 'static/dynamic/graphs/spanning_tree.png'
-    os.makedirs(os.path.dirname(static_path), exist_ok=True)
-    # Сохраняем рисунок в файл
-    plt.savefig(static_path)
-    plt.close()
+    # Координаты вершин: ярусы остовного дерева от стартовой вершины (первое ребро BFS
+    # начинается в ней), без дерева - закрытая формула для малых графов
+    pos = spanning_tree_layout(G.nodes, all_edges, tree_edges)
+    return G, pos, all_edges, tree_edges
 
-    # Возвращаем путь к сохраненному файлу (для использования, например, на вебе)
-    return f"/{static_path}"
+
+def _render_bfs_svg(graph, num_vertices, bfs_edges=None):
+    # Рисуем тот же граф без matplotlib: SVG собирается прямо из координат
+    G, pos, all_edges, tree_edges = _bfs_drawing(graph, num_vertices, bfs_edges)
+    return render_svg(pos, all_edges, tree_edges, title="Spanning Tree (red edges)").encode('utf-8')
+
+
+def _render_bfs_png(graph, num_vertices, bfs_edges=None):
+    # Рисуем через собственный Figure (без глобального состояния pyplot),
+    # поэтому рендер можно безопасно вызывать из нескольких потоков
+    G, pos, all_edges, tree_edges = _bfs_drawing(graph, num_vertices, bfs_edges)
+    # Все ребра исходного графа - серым, ребра остовного дерева - красным поверх,
+    # вершины светло-голубые с номерами
+    return render_png(pos, all_edges, tree_edges, title="Spanning Tree (red edges)")
@@ -1,56 +1,101 @@
-import networkx as nx
-import matplotlib.pyplot as plt
-import numpy as np
 from bottle import request
 import random
 import os
 import json
+import time
 
 from logics.json_utils import save_algorithm_record
+from logics.lazy_imports import lazy_import
+from methods.render_cache import render_key, cached_render_path
+from methods.svg_render import render_svg, renderer_for
+from methods.graph_render import render_png
+from methods.render_pool import offloaded, RenderTimeout
+from methods.graph_layout import spanning_tree_layout
+from methods.graph import Graph, as_graph
 
+# networkx is loaded on the first DFS request, not when the app starts
+nx = lazy_import('networkx')
 
-def create_spanning_tree(adj_matrix, start_vertex):
+
+def dfs_tree(adjacency, start_vertex):
     """
-    Create a spanning tree using DFS from the adjacency matrix.
+    Iterative depth-first search with an explicit stack, in one O(V + E) pass.
+
+    Neighbours are tried in ascending order, as nx.dfs_edges does on the graphs
+    built here, so the tree and the preorder are the ones networkx gives.
+
+    Parameters:
+        adjacency: Graph (methods/graph.py) or anything with len() whose items are
+            the neighbours of a vertex in ascending order.
+        start_vertex (int): Start vertex (0-based).
+
+    Returns:
+        tuple: (order, edges) - the reached vertices in preorder and the tree edges
+        (parent, child) in discovery order. The graph is connected if and only if
+        len(order) == len(adjacency).
     """
-    n = len(adj_matrix)
-    G_full = nx.Graph()
+    visited = [False] * len(adjacency)
+    visited[start_vertex] = True
+    order = [start_vertex]
+    edges = []
+    # Each stack entry is a vertex and the iterator over its remaining neighbours
+    stack = [(start_vertex, iter(adjacency[start_vertex]))]
+    while stack:
+        parent, children = stack[-1]
+        for child in children:
+            if not visited[child]:
+                visited[child] = True
+                order.append(child)
+                edges.append((parent, child))
+                stack.append((child, iter(adjacency[child])))
+                break
+        else:
+            stack.pop()  # All neighbours of parent are visited: backtrack
+    return order, edges
 
-    # Add all nodes to the full graph
-    G_full.add_nodes_from(range(n))
 
-    # Add edges to the graph, skipping self-loops (i == j)
-    for i in range(n):
-        for j in range(i + 1, n):
-            if adj_matrix[i][j] == 1:
-                G_full.add_edge(i, j)
+def create_spanning_tree(adj_matrix, start_vertex):
+    """
+    Create a spanning tree using DFS from the adjacency matrix (or a Graph, see methods/graph.py).
+
+    A single pass of dfs_tree gives the tree edges, the visit order and whether the
+    graph is connected; networkx is only used to hand the graphs to the caller.
+    """
+    graph = as_graph(adj_matrix)
+    n = len(graph)
+    # The undirected graph of the upper triangle, the same one G_full holds: the form
+    # matrix is not checked for symmetry, and the rows of a one-sided matrix would
+    # otherwise be walked as directed edges
+    undirected = Graph.from_edges(n, graph.edges())
 
     start_vertex = start_vertex - 1  # Convert to 0-based indexing
+    if not 0 <= start_vertex < n:
+        return None, None, None, None, f"Start vertex {start_vertex + 1} is not in the graph"
+
+    # Perform DFS to get the visit order and the edges of the spanning tree
+    visited_order, dfs_edges = dfs_tree(undirected, start_vertex)
 
-    # Check if the graph is connected
-    if not nx.is_connected(G_full):
+    # The graph is connected if DFS reached every vertex
+    if len(visited_order) != n:
         return None, None, None, None, "Graph is not connected"
 
-    try:
-        # Perform DFS to get the edges of the spanning tree
-        dfs_edges = list(nx.dfs_edges(G_full, source=start_vertex))  
-        T_tree = nx.Graph()  
-        T_tree.add_nodes_from(range(n))  # Add nodes to the spanning tree
-        T_tree.add_edges_from(dfs_edges)  # Add edges to the spanning tree
+    # Full graph and spanning tree for the caller and the drawing
+    G_full = nx.Graph()
+    G_full.add_nodes_from(range(n))
+    G_full.add_edges_from(undirected.edges())  # Each edge once, self-loops skipped
+    T_tree = nx.Graph()
+    T_tree.add_nodes_from(range(n))  # Add nodes to the spanning tree
+    T_tree.add_edges_from(dfs_edges)  # Add edges to the spanning tree
 
-        # Track the order of visited vertices
-        visited_order = list(nx.dfs_preorder_nodes(G_full, source=start_vertex))
+    # Adjacency matrix of the spanning tree, straight from its edges
+    tree_matrix = [[0] * n for _ in range(n)]
+    for u, v in dfs_edges:
+        tree_matrix[u][v] = tree_matrix[v][u] = 1
 
-        # Convert the spanning tree to an adjacency matrix
-        tree_matrix = nx.to_numpy_array(T_tree, dtype=int).tolist()  
-        
-        # Update vertices_list to match the DFS visit order (1-based indexing)
-        vertices_list = [node + 1 for node in visited_order]  # 1-based index
+    # Update vertices_list to match the DFS visit order (1-based indexing)
+    vertices_list = [node + 1 for node in visited_order]  # 1-based index
 
-        return G_full, T_tree, tree_matrix, vertices_list, None  # Return results
-    except nx.NetworkXError as e:
-        # If an error occurs during DFS, return the error message
-        return None, None, None, None, str(e)
+    return G_full, T_tree, tree_matrix, vertices_list, None  # Return results
 
 
 
@@ -96,39 +141,72 @@ def generate_random_matrix(n, extra_edges=2):
 
 
 
-def save_graph_image(G_full, T_tree, filename="static/dynamic/graphs/spanning_tree_dfs_1.png"):
+def save_graph_image(G_full, T_tree, filename=None, root=None):
     """
-    Save graph to a PNG file with red edges for the spanning tree.
+    Save graph to an image file (PNG or SVG) with red edges for the spanning tree.
 
     This function visualizes the full graph with gray edges and the spanning tree with red edges. 
-    It saves the graph image as a PNG file.
+    The image is stored in the render cache under a name derived from the graph and the tree,
+    so every result gets its own path and repeated renders are not drawn again.
+    If filename is given, the image is additionally written to that file.
+    root is the start vertex (0-based) the tree is layered from.
+    Returns None if rendering took longer than RENDER_TIMEOUT.
     """
-    plt.figure(figsize=(6, 6))  # Set the size of the figure
+    # Node and edge order affect the layout, so the key keeps them as given
+    key = render_key(
+        'dfs',
+        nodes=list(G_full.nodes),
+        edges=[list(edge) for edge in G_full.edges],
+        tree_nodes=list(T_tree.nodes),
+        tree_edges=[list(edge) for edge in T_tree.edges],
+        root=root
+    )
+    # The image format (matplotlib PNG or lightweight SVG) is set by GRAPH_RENDERER / GRAPH_RENDERER_DFS
+    fmt = renderer_for('dfs')
+    # PNG is drawn in the render pool (methods/render_pool.py), SVG right here
+    render = _render_graph_svg if fmt == 'svg' else offloaded(_render_graph_png)
+    try:
+        path = cached_render_path(key, lambda: render(G_full, T_tree, root), fmt)
+    except RenderTimeout:
+        return None  # Rendering took too long: the page is shown without the image
+    if filename is None:
+        return path  # Return the path to the cached image
+
+    # Save a copy of the image under the requested name
+    os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+    with open(path, 'rb') as src, open(filename, 'wb') as dst:
+        dst.write(src.read())
+
+    return filename  # Return the path to the saved image
 
-    # Generate node positions for visualization
-    pos = nx.spring_layout(G_full, seed=42)
 
-    # Draw the full graph with light gray edges
-    nx.draw_networkx_edges(G_full, pos, edge_color='lightgray', width=1)
+def _render_graph_svg(G_full, T_tree, root=None):
+    """
+    Draw the full graph and the spanning tree as SVG markup (no matplotlib) and return the bytes.
+    """
+    pos = spanning_tree_layout(G_full.nodes, G_full.edges, T_tree.edges, root)
+    labels = {node: node + 1 for node in G_full.nodes}
+    svg = render_svg(pos, G_full.edges(), T_tree.edges(), labels=labels, edge_color='lightgray')
+    return svg.encode('utf-8')
 
-    # Highlight the spanning tree with red edges
-    nx.draw_networkx_edges(T_tree, pos, edgelist=T_tree.edges(), edge_color='red', width=2)
 
-    # Draw nodes with light blue color
-    nx.draw_networkx_nodes(G_full, pos, node_color='lightblue', node_size=500)
+def _render_graph_png(G_full, T_tree, root=None):
+    """
+    Draw the full graph and the spanning tree with matplotlib and return the PNG bytes.
+    Uses its own Figure (no pyplot global state), so it is safe to call from several threads.
+    """
+    # Generate node positions for visualization (tree layered from the start vertex)
+    pos = spanning_tree_layout(G_full.nodes, G_full.edges, T_tree.edges, root)
 
     # Display labels (shift to 1-based index for readability)
     labels = {node: node + 1 for node in G_full.nodes}
-    nx.draw_networkx_labels(G_full, pos, labels=labels, font_size=12, font_weight='bold')
-
-    # Save the image
-    os.makedirs(os.path.dirname(filename), exist_ok=True)
-    plt.axis('off')  # Hide the axes
-    plt.tight_layout()  # Adjust layout for better fitting
-    plt.savefig(filename, format='png')  # Save as PNG
-    plt.close()  # Close the plot
 
-    return filename  # Return the path to the saved image
+    # Light gray graph edges, red spanning tree edges, light blue nodes, no axes
+    return render_png(
+        pos, G_full.edges(), T_tree.edges(), labels=labels,
+        node_size=500, font_size=12, font_weight='bold',
+        edge_color='lightgray', edge_width=1, tree_width=2, axis=False
+    )
 
 
 def validate_input(vertices, start_vertex, adj_matrix):
@@ -193,6 +271,7 @@ def process_dfs_request():
 
     # Check if it's a POST request (form submission)
     if request.method == 'POST':  
+        started = time.perf_counter()  # Processing time of the request for the history statistics
         try:
             # Retrieve the action (whether to build or generate a graph)
             action = request.forms.get('action')
@@ -232,13 +311,13 @@ def process_dfs_request():
             # If validation passed and the action is to build the spanning tree
             if not error and action == 'build':
                 # Attempt to create a spanning tree using DFS
-                G, T, tree_matrix, vertices_list, graph_error = create_spanning_tree(adj_matrix, start_vertex)
+                G, T, tree_matrix, vertices_list, graph_error = create_spanning_tree(Graph.from_matrix(adj_matrix), start_vertex)
 
                 if graph_error:
                     error = graph_error  # Set error if there's an issue with tree creation
                 elif G and T:
                     # Save the graph image and tree data if the spanning tree was created successfully
-                    graph_path = save_graph_image(G, T)
+                    graph_path = save_graph_image(G, T, root=start_vertex - 1)
                     
 
         except (ValueError, TypeError) as e:
@@ -255,7 +334,8 @@ def process_dfs_request():
             algorithm='dfs',
             input_data=input_data,
             result_matrix=tree_matrix if tree_matrix else None,
-            error_message=error
+            error_message=error,
+            duration_ms=(time.perf_counter() - started) * 1000
         )
 
     # If no adjacency matrix is provided, initialize it with zeros
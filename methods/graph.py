@@ -0,0 +1,181 @@
+"""
+Compact graph shared by the algorithms and the renderers.
+
+A request builds one Graph (from the adjacency matrix of a form, or from the
+edge list of an API job) and hands it to BFS, DFS, beam search, coloring and
+the drawing functions, instead of every step scanning or converting the n x n
+matrix again. The adjacency is stored in CSR form in array.array buffers
+(machine words): the neighbours of vertex v are
+
+    indices[offsets[v]:offsets[v + 1]]      (ascending)
+
+and the weight of each of those edges sits at the same position of weights.
+That is O(V + E) memory instead of the O(n^2) Python ints of a matrix.
+Matrices are still produced on demand (to_matrix, to_weight_matrix) for the
+pages and the run history.
+
+Vertices are numbered from 0. A graph built from a matrix keeps its rows as
+given (the algorithms validate symmetry where they need it); edges() and
+weighted_edges() report each pair once, from the row of its smaller vertex,
+like the upper-triangle loops over the matrix did.
+"""
+
+from array import array
+from bisect import bisect_left
+
+
+class Graph:
+    """
+    Graph in CSR form.
+
+    Parameters:
+        num_vertices (int): Number of vertices.
+        offsets (array): num_vertices + 1 positions into indices.
+        indices (array): Neighbours of all vertices, row after row, ascending within a row.
+        weights (array or None): Weight of every entry of indices, or None for an unweighted graph.
+    """
+
+    __slots__ = ('num_vertices', 'offsets', 'indices', 'weights')
+
+    def __init__(self, num_vertices, offsets, indices, weights=None):
+        self.num_vertices = num_vertices
+        self.offsets = offsets
+        self.indices = indices
+        self.weights = weights
+
+    @classmethod
+    def from_matrix(cls, adjacency_matrix, weight_matrix=None):
+        """
+        Builds the graph from an adjacency matrix: entry [i][j] == 1 makes j a neighbour
+        of i. With weight_matrix, weight_matrix[i][j] is the weight of that entry.
+        """
+        offsets = array('q', [0])
+        indices = array('i')
+        values = [] if weight_matrix is not None else None
+        for i, row in enumerate(adjacency_matrix):
+            neighbors = [j for j, value in enumerate(row) if value == 1]
+            indices.extend(neighbors)
+            offsets.append(len(indices))
+            if values is not None:
+                weight_row = weight_matrix[i]
+                values.extend(weight_row[j] for j in neighbors)
+        return cls(len(adjacency_matrix), offsets, indices, _weight_array(values))
+
+    @classmethod
+    def from_edges(cls, num_vertices, edges, weighted=False):
+        """
+        Builds an undirected graph from (u, v) pairs, or (u, v, weight) triples when
+        weighted. Self-loops are dropped; for repeated pairs the last weight is kept.
+        """
+        rows = [{} for _ in range(num_vertices)]
+        for edge in edges:
+            u, v = edge[0], edge[1]
+            if u != v:
+                weight = edge[2] if weighted else 1
+                rows[u][v] = weight
+                rows[v][u] = weight
+
+        offsets = array('q', [0])
+        indices = array('i')
+        values = [] if weighted else None
+        for row in rows:
+            neighbors = sorted(row)
+            indices.extend(neighbors)
+            offsets.append(len(indices))
+            if weighted:
+                values.extend(row[j] for j in neighbors)
+        return cls(num_vertices, offsets, indices, _weight_array(values))
+
+    def __len__(self):
+        return self.num_vertices
+
+    def __getitem__(self, vertex):
+        """Neighbours of the vertex (so a Graph can be used like a list of adjacency lists)."""
+        return self.indices[self.offsets[vertex]:self.offsets[vertex + 1]]
+
+    neighbors = __getitem__
+
+    def __eq__(self, other):
+        if not isinstance(other, Graph):
+            return NotImplemented
+        return (self.num_vertices == other.num_vertices and self.offsets == other.offsets
+                and self.indices == other.indices
+                and list(self.weights or ()) == list(other.weights or ()))
+
+    def __repr__(self):
+        kind = 'weighted ' if self.weights is not None else ''
+        return f'<{kind}Graph with {self.num_vertices} vertices and {len(self.indices)} adjacency entries>'
+
+    def degree(self, vertex):
+        return self.offsets[vertex + 1] - self.offsets[vertex]
+
+    def weight(self, u, v):
+        """Weight of the edge u-v (1 in an unweighted graph), or None if there is no such edge."""
+        start, end = self.offsets[u], self.offsets[u + 1]
+        position = bisect_left(self.indices, v, start, end)
+        if position == end or self.indices[position] != v:
+            return None
+        return self.weights[position] if self.weights is not None else 1
+
+    def edges(self):
+        """Yields every edge once as (u, v) with u < v, ordered by u, then v."""
+        offsets, indices = self.offsets, self.indices
+        for u in range(self.num_vertices):
+            for position in range(offsets[u], offsets[u + 1]):
+                v = indices[position]
+                if v > u:
+                    yield u, v
+
+    def weighted_edges(self):
+        """Yields every edge once as (u, v, weight) with u < v."""
+        offsets, indices, weights = self.offsets, self.indices, self.weights
+        for u in range(self.num_vertices):
+            for position in range(offsets[u], offsets[u + 1]):
+                v = indices[position]
+                if v > u:
+                    yield u, v, weights[position] if weights is not None else 1
+
+    def edge_list(self):
+        """[[u, v], ...] or [[u, v, weight], ...]: a compact, JSON-ready description (used in cache keys)."""
+        if self.weights is None:
+            return [[u, v] for u, v in self.edges()]
+        return [[u, v, weight] for u, v, weight in self.weighted_edges()]
+
+    def to_matrix(self):
+        """Dense 0/1 adjacency matrix (only for the pages and the run history)."""
+        matrix = [[0] * self.num_vertices for _ in range(self.num_vertices)]
+        for u in range(self.num_vertices):
+            row = matrix[u]
+            for v in self[u]:
+                row[v] = 1
+        return matrix
+
+    def to_weight_matrix(self):
+        """Dense weight matrix (0 where there is no edge), or None for an unweighted graph."""
+        if self.weights is None:
+            return None
+        matrix = [[0] * self.num_vertices for _ in range(self.num_vertices)]
+        offsets, indices, weights = self.offsets, self.indices, self.weights
+        for u in range(self.num_vertices):
+            for position in range(offsets[u], offsets[u + 1]):
+                matrix[u][indices[position]] = weights[position]
+        return matrix
+
+
+def _weight_array(values):
+    # Integer weights stay integers (results and records show 3, not 3.0)
+    if values is None:
+        return None
+    if all(type(value) is int for value in values):
+        return array('q', values)
+    return array('d', values)
+
+
+def as_graph(adjacency, weight_matrix=None):
+    """
+    Returns adjacency itself if it already is a Graph, otherwise the Graph of the
+    adjacency matrix (and weight_matrix). Lets the algorithms take either.
+    """
+    if isinstance(adjacency, Graph):
+        return adjacency
+    return Graph.from_matrix(adjacency, weight_matrix)
@@ -1,25 +1,33 @@
 # methods/graph_coloring_algorithm.py
 
-import networkx as nx
-import matplotlib.pyplot as plt
-from io import BytesIO
 import base64
+from logics.lazy_imports import lazy_import
+from methods.render_cache import render_key, cached_render
+from methods.svg_render import render_svg, renderer_for, palette
+from methods.graph_render import render_png, colormap_colors
+from methods.graph_layout import graph_layout
+from methods.render_pool import offloaded, RenderTimeout
+from methods.graph import as_graph
+
+# networkx is loaded on first use, not when the app starts
+nx = lazy_import('networkx')
 
 
 def greedy_graph_coloring(adjacency_matrix):
     """
     Performs greedy graph coloring using the largest-degree-first strategy.
 
-    :param adjacency_matrix: list of lists containing 0s and 1s representing the graph
+    :param adjacency_matrix: list of lists containing 0s and 1s representing the graph, or a Graph (methods/graph.py)
     :return: (coloring_dict, num_colors_used, adjacency_matrix)
     """
-    n = len(adjacency_matrix)
+    graph = as_graph(adjacency_matrix)
+    n = len(graph)
     if n == 0:
         # Return empty result if matrix is empty
         return {}, 0, adjacency_matrix
 
     # Calculate the degree (number of edges) of each vertex
-    degrees = {i: sum(adjacency_matrix[i]) for i in range(n)}
+    degrees = {i: graph.degree(i) for i in range(n)}
 
     # Sort vertices in descending order based on degree
     # This is the "largest degree first" heuristic
@@ -32,8 +40,8 @@ def greedy_graph_coloring(adjacency_matrix):
         # Get a set of colors used by the adjacent vertices of v
         used = {
             colors[u]
-            for u in range(n)
-            if adjacency_matrix[v][u] == 1 and u in colors
+            for u in graph[v]
+            if u in colors
         }
 
         # Find the smallest color ID that is not used by neighbors
@@ -54,78 +62,101 @@ def greedy_graph_coloring(adjacency_matrix):
 def draw_colored_graph(adjacency_matrix, coloring_result, num_colors_used):
     """
     Draws the graph with nodes colored based on the coloring result.
-    Returns a base64-encoded PNG image suitable for embedding in HTML.
+    Returns a base64-encoded PNG (or SVG, see GRAPH_RENDERER_COLORING) image suitable for embedding in HTML.
+    The same graph with the same coloring is rendered only once (see methods/render_cache.py).
 
-    :param adjacency_matrix: 2D list representing the graph structure
+    :param adjacency_matrix: 2D list representing the graph structure, or a Graph (methods/graph.py)
     :param coloring_result: dictionary mapping node index to color ID
     :param num_colors_used: number of distinct colors used
-    :return: base64-encoded PNG image as a data URI string
+    :return: base64-encoded image as a data URI string, or None if rendering timed out
     """
-    n = len(adjacency_matrix)
+    graph = as_graph(adjacency_matrix)
+    n = len(graph)
     if n == 0:
         # No graph to draw
         return None
 
+    key = render_key(
+        'coloring',
+        n=n,
+        edges=graph.edge_list(),
+        coloring=sorted(coloring_result.items()),
+        num_colors=num_colors_used
+    )
+    fmt = renderer_for('coloring')
+    # PNG is drawn in the render pool (methods/render_pool.py), SVG right here
+    render = _render_colored_svg if fmt == 'svg' else offloaded(_render_colored_png)
+    try:
+        image = cached_render(key, lambda: render(graph, coloring_result, num_colors_used), fmt)
+    except RenderTimeout:
+        return None  # Rendering took too long: the page is shown without the image
+
+    # Encode image to base64 so it can be used directly in HTML <img>
+    img_b64 = base64.b64encode(image).decode('utf-8')
+    mime = 'image/svg+xml' if fmt == 'svg' else 'image/png'
+    return f"data:{mime};base64,{img_b64}"
+
+
+def _colored_drawing(graph):
+    """
+    Builds the NetworkX graph from the Graph (methods/graph.py) and lays it out.
+    Returns the graph and the node positions.
+    """
     # Create a new undirected graph using NetworkX
     G = nx.Graph()
 
     # Add nodes labeled 0 to n-1
-    G.add_nodes_from(range(n))
-
-    # Add edges where the adjacency matrix has a 1
-    for i in range(n):
-        for j in range(i + 1, n):
-            if adjacency_matrix[i][j] == 1:
-                G.add_edge(i, j)
-
-    # Generate layout positions for all nodes (spring layout gives nice spacing)
-    pos = nx.spring_layout(G, seed=42)
-
-    # Create a color palette appropriate for the number of colors used
-    palette = []
-    if num_colors_used <= 10:
-        cmap = plt.cm.get_cmap('tab10')  # Up to 10 distinct colors
-        palette = [cmap(i) for i in range(num_colors_used)]
-    elif num_colors_used <= 20:
-        cmap = plt.cm.get_cmap('tab20')  # Up to 20 colors
-        palette = [cmap(i) for i in range(num_colors_used)]
-    else:
-        cmap = plt.cm.get_cmap('viridis')  # Continuous color map for more than 20
-        palette = [cmap(i / (num_colors_used - 1 if num_colors_used > 1 else 1)) for i in range(num_colors_used)]
+    G.add_nodes_from(range(len(graph)))
 
-    # Map each node to its corresponding color
-    node_colors = []
+    # Add the edges of the graph (each once)
+    G.add_edges_from(graph.edges())
+
+    # Layout positions for all nodes (closed-form for small graphs, cached by the edge set)
+    pos = graph_layout(G.nodes, G.edges)
+    return G, pos
+
+
+def _render_colored_svg(graph, coloring_result, num_colors_used):
+    """
+    Draws the colored graph as SVG markup (no matplotlib) and returns the bytes.
+    """
+    G, pos = _colored_drawing(graph)
+    colors = palette(num_colors_used)
+    node_colors = {}
     for node in G.nodes():
         cid = coloring_result.get(node, 0)
-        # Convert color ID to actual RGBA color from the palette
-        if cid > 0 and cid - 1 < len(palette):
-            node_colors.append(palette[cid - 1])
-        else:
-            node_colors.append('lightgrey')  # Default color for uncolored nodes
-
-    # Create a matplotlib figure for the graph
-    plt.figure(figsize=(7, 7))
-    labels = {i: i + 1 for i in G.nodes()}
-    nx.draw(
-        G, pos,
-        labels=labels,
-        node_color=node_colors,
-        node_size=700,
-        font_size=10,
-        font_weight='bold',
-        edge_color='gray',
-        width=1.5
+        node_colors[node] = colors[cid - 1] if 0 < cid <= len(colors) else 'lightgrey'
+    svg = render_svg(
+        pos, G.edges(), labels={i: i + 1 for i in G.nodes()}, node_colors=node_colors,
+        title=f"Graph Coloring (Largest First) – {num_colors_used} colors"
     )
+    return svg.encode('utf-8')
 
-    # Add a title showing the coloring strategy and color count
-    plt.title(f"Graph Coloring (Largest First) – {num_colors_used} colors", fontsize=14)
 
-    # Save the image to a BytesIO buffer in PNG format
-    buf = BytesIO()
-    plt.savefig(buf, format='png', bbox_inches='tight')
-    plt.close()
-    buf.seek(0)
+def _render_colored_png(graph, coloring_result, num_colors_used):
+    """
+    Draws the colored graph with matplotlib and returns the PNG bytes.
+    Uses its own Figure (no pyplot global state), so it is safe to call from several threads.
+    """
+    G, pos = _colored_drawing(graph)
 
-    # Encode image to base64 so it can be used directly in HTML <img>
-    img_b64 = base64.b64encode(buf.read()).decode('utf-8')
-    return f"data:image/png;base64,{img_b64}"
+    # Color palette appropriate for the number of colors used (tab10 / tab20 / viridis)
+    colors = colormap_colors(num_colors_used)
+
+    # Map each node to its corresponding color
+    node_colors = {}
+    for node in G.nodes():
+        cid = coloring_result.get(node, 0)
+        # Convert color ID to actual RGBA color from the palette
+        if cid > 0 and cid - 1 < len(colors):
+            node_colors[node] = colors[cid - 1]
+        else:
+            node_colors[node] = 'lightgrey'  # Default color for uncolored nodes
+
+    # Title shows the coloring strategy and color count; the image is cropped to its content
+    return render_png(
+        pos, G.edges(), labels={i: i + 1 for i in G.nodes()}, node_colors=node_colors,
+        title=f"Graph Coloring (Largest First) – {num_colors_used} colors", title_size=14,
+        figsize=(7, 7), node_size=700, font_size=10, font_weight='bold',
+        axis=False, full_axes=True, tight_bbox=True
+    )
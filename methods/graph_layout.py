@@ -0,0 +1,201 @@
+"""
+Node positions for the graph pictures.
+
+Small graphs (up to CLOSED_FORM_MAX_NODES vertices, i.e. everything the pages
+accept) are placed with a closed-form circular or shell layout, which costs a
+few trigonometric calls instead of networkx' iterative spring simulation.
+Every layout is cached by the graph's topology (number of vertices + edge set,
+independent of how the page labels its vertices), so the same graph drawn on
+another page or submitted again is never laid out twice.
+
+GRAPH_LAYOUT selects the layout: 'circular' (default), 'shell' or 'spring'.
+GRAPH_LAYOUT_CACHE_SIZE bounds the number of cached layouts.
+
+Spanning-tree pictures are laid out from the tree itself instead (tree_layout):
+depth from the start vertex on the vertical axis, order of the vertex among
+the leaves on the horizontal one, in O(V + E) for any size of graph.
+GRAPH_TREE_LAYOUT=off switches them back to the layouts above.
+"""
+
+import os
+import math
+from functools import lru_cache
+
+from logics.lazy_imports import lazy_import
+
+# networkx is only needed for the spring layout; loaded on first use
+nx = lazy_import('networkx')
+
+LAYOUTS = ('circular', 'shell', 'spring')
+CLOSED_FORM_MAX_NODES = 8
+
+LAYOUT_MODE = os.environ.get('GRAPH_LAYOUT', 'circular').lower()
+if LAYOUT_MODE not in LAYOUTS:
+    LAYOUT_MODE = 'circular'
+
+TREE_LAYOUT = os.environ.get('GRAPH_TREE_LAYOUT', 'on').lower() not in ('0', 'off', 'false', 'no')
+
+try:
+    LAYOUT_CACHE_SIZE = int(os.environ.get('GRAPH_LAYOUT_CACHE_SIZE', '1024'))
+except ValueError:
+    LAYOUT_CACHE_SIZE = 1024
+
+
+def _ring(indices, radius, positions, offset=0.0):
+    # Evenly spaced on a circle, first vertex at the top, clockwise
+    count = len(indices)
+    for k, index in enumerate(indices):
+        angle = math.pi / 2 - 2 * math.pi * k / count - offset
+        positions[index] = (radius * math.cos(angle), radius * math.sin(angle))
+
+
+def _circular(n):
+    positions = [None] * n
+    _ring(range(n), 1.0, positions)
+    return positions
+
+
+def _shell(n, edges):
+    # Best connected vertices go to the inner shell, the rest around them
+    degree = [0] * n
+    for u, v in edges:
+        degree[u] += 1
+        degree[v] += 1
+    order = sorted(range(n), key=lambda i: (-degree[i], i))
+    inner, outer = order[:n // 3], order[n // 3:]
+
+    positions = [None] * n
+    if len(inner) == 1:
+        positions[inner[0]] = (0.0, 0.0)
+    elif inner:
+        _ring(inner, 0.45, positions)
+    # Shift the outer ring by half a step so its vertices sit between the inner ones
+    _ring(outer, 1.0, positions, offset=math.pi / max(len(outer), 1))
+    return positions
+
+
+def _spring(n, edges):
+    G = nx.Graph()
+    G.add_nodes_from(range(n))
+    G.add_edges_from(edges)
+    pos = nx.spring_layout(G, seed=42)
+    return [(float(pos[i][0]), float(pos[i][1])) for i in range(n)]
+
+
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def _canonical_layout(mode, n, edges):
+    """Positions of vertices 0..n-1 (tuple indexed by vertex) for a sorted tuple of edges."""
+    if n > CLOSED_FORM_MAX_NODES:
+        mode = 'spring'
+    if mode == 'circular':
+        return tuple(_circular(n))
+    if mode == 'shell':
+        return tuple(_shell(n, edges))
+    return tuple(_spring(n, edges))
+
+
+def graph_layout(nodes, edges, mode=None):
+    """
+    Returns the positions of the nodes.
+
+    Parameters:
+        nodes (iterable): Vertices of the graph, in the order they should be placed.
+        edges (iterable): Pairs of vertices.
+        mode (str): Layout name from LAYOUTS; LAYOUT_MODE by default.
+
+    Returns:
+        dict: Vertex -> (x, y).
+    """
+    nodes = list(nodes)
+    mode = mode or LAYOUT_MODE
+    if mode == 'circular' and len(nodes) <= CLOSED_FORM_MAX_NODES:
+        # The circle depends on the number of vertices only
+        canonical_edges = ()
+    else:
+        index = {node: i for i, node in enumerate(nodes)}
+        canonical_edges = tuple(sorted({tuple(sorted((index[u], index[v]))) for u, v in edges}))
+    positions = _canonical_layout(mode, len(nodes), canonical_edges)
+    return dict(zip(nodes, positions))
+
+
+def tree_layout(nodes, tree_edges, root):
+    """
+    Layered layout of a spanning tree in O(V + E).
+
+    Every vertex is placed at the row of its depth below the root; leaves take
+    consecutive columns in depth-first order and an inner vertex is centered
+    above its first and last child. Vertices the tree does not reach (if any)
+    are lined up in an extra row at the bottom. Coordinates are scaled to [-1, 1].
+
+    Parameters:
+        nodes (iterable): Vertices of the graph.
+        tree_edges (iterable): Pairs of vertices forming the tree; children keep this order.
+        root: Start vertex of the traversal.
+
+    Returns:
+        dict: Vertex -> (x, y).
+    """
+    nodes = list(nodes)
+    neighbours = {node: [] for node in nodes}
+    for u, v in tree_edges:
+        neighbours[u].append(v)
+        neighbours[v].append(u)
+
+    # Breadth-first pass: depth and ordered children of every vertex
+    depth = {root: 0}
+    children = {node: [] for node in nodes}
+    order = [root]
+    for node in order:
+        for neighbour in neighbours[node]:
+            if neighbour not in depth:
+                depth[neighbour] = depth[node] + 1
+                children[node].append(neighbour)
+                order.append(neighbour)
+
+    # Depth-first post-order pass without recursion (trees may be thousands of levels deep)
+    column = {}
+    next_leaf = 0
+    stack = [(root, False)]
+    while stack:
+        node, finished = stack.pop()
+        kids = children[node]
+        if finished:
+            column[node] = (column[kids[0]] + column[kids[-1]]) / 2
+        elif not kids:
+            column[node] = next_leaf
+            next_leaf += 1
+        else:
+            stack.append((node, True))
+            stack.extend((kid, False) for kid in reversed(kids))
+
+    rows = max(depth.values())
+    unreached = [node for node in nodes if node not in depth]
+    if unreached:
+        rows += 1
+        for node in unreached:
+            depth[node] = rows
+            column[node] = next_leaf
+            next_leaf += 1
+
+    width = max(next_leaf - 1, 1)
+    height = max(rows, 1)
+    return {node: (2 * column[node] / width - 1, 1 - 2 * depth[node] / height) for node in nodes}
+
+
+def spanning_tree_layout(nodes, edges, tree_edges=None, root=None):
+    """
+    Positions for a spanning-tree picture: the layered tree layout when a tree is
+    given (and GRAPH_TREE_LAYOUT is on), graph_layout() of the whole graph otherwise.
+
+    Parameters:
+        nodes (iterable): Vertices of the graph.
+        edges (iterable): All edges of the graph.
+        tree_edges (iterable): Edges of the spanning tree, or None.
+        root: Start vertex of the tree; the first vertex of the first tree edge by default.
+    """
+    tree_edges = list(tree_edges or ())
+    if not TREE_LAYOUT or not tree_edges:
+        return graph_layout(nodes, edges)
+    if root is None:
+        root = tree_edges[0][0]
+    return tree_layout(nodes, tree_edges, root)
@@ -0,0 +1,105 @@
+"""
+Thread-safe PNG rendering of graphs with matplotlib's object-oriented API.
+
+Every call creates its own Figure with an Agg canvas and draws on its Axes
+directly, so nothing goes through the pyplot state machine (no current figure,
+no figure registry) and renders running in different threads cannot interfere.
+The signature mirrors methods/svg_render.render_svg.
+"""
+
+from io import BytesIO
+
+from logics.lazy_imports import lazy_import
+
+# matplotlib is loaded by the first render, not when the app starts
+matplotlib = lazy_import('matplotlib')
+mpl_figure = lazy_import('matplotlib.figure')
+mpl_backend_agg = lazy_import('matplotlib.backends.backend_agg')
+mpl_collections = lazy_import('matplotlib.collections')
+
+
+def colormap_colors(count):
+    """
+    Returns count distinct RGBA colors: 'tab10' for up to 10 colors, 'tab20' for up
+    to 20 and evenly spaced 'viridis' colors beyond that.
+    """
+    if count <= 10:
+        cmap = matplotlib.colormaps['tab10']
+        return [cmap(i) for i in range(count)]
+    if count <= 20:
+        cmap = matplotlib.colormaps['tab20']
+        return [cmap(i) for i in range(count)]
+    cmap = matplotlib.colormaps['viridis']
+    return [cmap(i / (count - 1)) for i in range(count)]
+
+
+def _draw_edges(ax, positions, edges, color, width):
+    segments = [(positions[u], positions[v]) for u, v in edges]
+    if segments:
+        ax.add_collection(mpl_collections.LineCollection(segments, colors=color, linewidths=width, zorder=1))
+
+
+def render_png(positions, edges, tree_edges=(), node_colors=None, labels=None, title=None,
+               figsize=(6, 6), node_size=1000, font_size=14, font_weight='normal', title_size=None,
+               edge_color='gray', edge_width=1.5, tree_color='red', tree_width=2.5,
+               node_color='lightblue', axis=True, full_axes=False, tight_bbox=False):
+    """
+    Draws a graph and returns the PNG bytes.
+
+    Parameters:
+        positions (dict): Node -> (x, y) coordinates.
+        edges (iterable): Pairs of nodes drawn as thin lines.
+        tree_edges (iterable): Pairs of nodes drawn on top as thick highlighted lines.
+        node_colors (dict): Node -> color; nodes without a color use node_color.
+        labels (dict): Node -> label text; defaults to the node itself.
+        title (str): Optional title above the graph.
+        axis (bool): Keep the frame around the graph (ticks are always hidden).
+        full_axes (bool): Let the axes fill the whole figure instead of the default margins.
+        tight_bbox (bool): Crop the saved image to its content (savefig bbox_inches='tight');
+            otherwise the figure layout is tightened before saving.
+
+    Returns:
+        bytes: The PNG image.
+    """
+    fig = mpl_figure.Figure(figsize=figsize)
+    mpl_backend_agg.FigureCanvasAgg(fig)
+    ax = fig.add_axes((0, 0, 1, 1)) if full_axes else fig.add_subplot()
+
+    nodes = list(positions)
+    _draw_edges(ax, positions, edges, edge_color, edge_width)
+    _draw_edges(ax, positions, tree_edges, tree_color, tree_width)
+
+    if nodes:
+        node_colors = node_colors or {}
+        ax.scatter(
+            [positions[node][0] for node in nodes],
+            [positions[node][1] for node in nodes],
+            s=node_size, c=[node_colors.get(node, node_color) for node in nodes], zorder=2
+        )
+        labels = labels or {}
+        for node in nodes:
+            x, y = positions[node]
+            ax.text(x, y, str(labels.get(node, node)), fontsize=font_size, fontweight=font_weight,
+                    ha='center', va='center', zorder=3)
+
+        # Same padding around the nodes as networkx' drawing functions use
+        xs = [positions[node][0] for node in nodes]
+        ys = [positions[node][1] for node in nodes]
+        pad_x = 0.05 * (max(xs) - min(xs))
+        pad_y = 0.05 * (max(ys) - min(ys))
+        ax.update_datalim(((min(xs) - pad_x, min(ys) - pad_y), (max(xs) + pad_x, max(ys) + pad_y)))
+        ax.autoscale_view()
+
+    ax.tick_params(axis='both', which='both', bottom=False, left=False, labelbottom=False, labelleft=False)
+    if not axis:
+        ax.set_axis_off()
+    if title:
+        ax.set_title(title, fontsize=title_size)
+
+    buf = BytesIO()
+    if tight_bbox:
+        fig.savefig(buf, format='png', bbox_inches='tight')
+    else:
+        fig.tight_layout()
+        fig.savefig(buf, format='png')
+    return buf.getvalue()
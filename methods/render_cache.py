@@ -0,0 +1,252 @@
+"""
+Content-addressed cache of rendered graph images.
+
+A render is identified by a hash of everything that affects the picture
+(algorithm, adjacency/weights, highlighted edges or coloring), so a repeated
+submission gets the already encoded PNG back without touching matplotlib.
+Images live on disk; when the cache grows past its size limit the least
+recently used files are removed (a cache hit refreshes the file's mtime).
+
+The cache directory is served as static files: every image has its own
+content-addressed URL, so the pages of concurrent users (or of several worker
+processes) never overwrite each other's picture, and the files can be served
+with an immutable Cache-Control header. Each process only knows the size of
+its own writes, so ImageSweeper rescans the directory periodically to keep the
+total bounded when several workers share it.
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import threading
+
+from methods import graph_layout
+
+DEFAULT_CACHE_DIR = 'static/dynamic/graphs'
+
+# Cache-Control for the cached images: a URL never changes its content
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Images younger than this (seconds) are never evicted, so a page that was just
+# rendered can still load its picture
+EVICT_MIN_AGE = 300
+
+try:
+    DEFAULT_MAX_BYTES = int(os.environ.get('RENDER_CACHE_BYTES', 64 * 1024 * 1024))
+except ValueError:
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Bump when the drawing code changes so old pictures are not served any more
+RENDER_VERSION = 4
+
+
+def render_key(algorithm, **parts):
+    """
+    Returns the cache key (hex) for a render.
+
+    Parameters:
+        algorithm (str): Name of the renderer ('bfs', 'dfs', 'beam', 'coloring').
+        **parts: JSON-serializable inputs of the picture (matrices, edge lists, coloring, ...).
+    """
+    payload = json.dumps(
+        {'algorithm': algorithm, 'version': RENDER_VERSION, 'layout': [graph_layout.LAYOUT_MODE, graph_layout.TREE_LAYOUT], 'parts': parts},
+        sort_keys=True, separators=(',', ':'), default=list
+    )
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class RenderCache:
+    """
+    Directory of PNG files named by their render key, with LRU eviction by total size.
+
+    Parameters:
+        directory (str): Directory holding the cached images.
+        max_bytes (int): Total size the directory is trimmed to.
+        suffix (str): File extension of the cached images.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, suffix='.png'):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._size = None  # Total size of the directory, computed on first put()
+        self._lock = threading.Lock()
+
+    def path(self, key):
+        # Forward slashes: the path doubles as the URL of the image
+        return f'{self.directory}/{key}{self.suffix}'
+
+    def touch(self, key):
+        """Marks a cached image as recently used; returns False if it is not cached."""
+        try:
+            os.utime(self.path(key))
+        except OSError:
+            return False
+        return True
+
+    def get(self, key):
+        """Returns the cached image bytes, or None on a miss. A hit counts as a recent use."""
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            return None
+        return data
+
+    def put(self, key, data):
+        """Stores the image under its key (atomically) and trims the cache if needed."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(key)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._directory_size()
+            else:
+                self._size += len(data)
+            if self._size > self.max_bytes:
+                self._size = self.evict(EVICT_MIN_AGE)
+        return path
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(self.suffix):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+        return entries
+
+    def _directory_size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self, min_age=0):
+        """
+        Removes least recently used images until the cache fits max_bytes; returns the new size.
+        Images used less than min_age seconds ago are kept even if the cache stays too big.
+        """
+        if not os.path.isdir(self.directory):
+            return 0
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        newest_allowed = time.time() - min_age
+        for mtime, size, name in entries:
+            if total <= self.max_bytes or mtime > newest_allowed:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+                total -= size
+            except OSError:
+                pass
+        return total
+
+    def sweep(self, min_age=EVICT_MIN_AGE):
+        """Recounts the directory (including other processes' writes) and evicts if needed."""
+        with self._lock:
+            self._size = self.evict(min_age)
+        return self._size
+
+
+class ImageSweeper:
+    """
+    Background thread that calls sweep() of the given caches every interval seconds.
+
+    Parameters:
+        *caches (RenderCache): Caches whose directories are kept bounded.
+        interval (float): Seconds between two sweeps.
+    """
+
+    def __init__(self, *caches, interval=60.0):
+        self.caches = caches
+        self.interval = interval
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='image-sweeper', daemon=True)
+            self._thread.start()
+        return self
+
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        while not self._stopping.wait(self.interval):
+            for cache in self.caches:
+                try:
+                    cache.sweep()
+                except OSError as e:
+                    print(f"Image sweep failed: {e}", file=sys.stderr)
+
+    def close(self, timeout=5.0):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+# Shared caches used by the drawing functions in methods/ (PNG from matplotlib,
+# SVG from methods/svg_render.py); both live in the same served directory
+default_cache = RenderCache()
+svg_cache = RenderCache(suffix='.svg')
+
+
+def _cache_for(fmt):
+    return svg_cache if fmt == 'svg' else default_cache
+
+
+def cached_render(key, render, fmt='png'):
+    """
+    Returns the image bytes for the key, calling render() only on a cache miss.
+
+    Parameters:
+        key (str): Key built with render_key().
+        render (callable): Function without arguments returning the image bytes.
+        fmt (str): Image format, 'png' or 'svg'.
+    """
+    cache = _cache_for(fmt)
+    data = cache.get(key)
+    if data is None:
+        data = render()
+        cache.put(key, data)
+    return data
+
+
+def cached_render_path(key, render, fmt='png'):
+    """
+    Returns the path of the cached image for the key (usable as its URL after a leading '/'),
+    calling render() only on a cache miss. A hit does not read the image at all.
+    """
+    cache = _cache_for(fmt)
+    if not cache.touch(key):
+        cache.put(key, render())
+    return cache.path(key)
+
+
+_sweeper = None
+
+
+def start_image_sweeper(interval=60.0):
+    """Starts the background sweeper of the shared caches (once per process) and returns it."""
+    global _sweeper
+    if _sweeper is None or not _sweeper.running():
+        _sweeper = ImageSweeper(default_cache, svg_cache, interval=interval).start()
+    return _sweeper
+
+
+def stop_image_sweeper():
+    global _sweeper
+    if _sweeper is not None:
+        _sweeper.close()
+        _sweeper = None
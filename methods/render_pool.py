@@ -0,0 +1,130 @@
+"""
+Pool of worker processes for rendering graph pictures.
+
+matplotlib rendering is CPU-bound and holds the GIL, so drawing in the request
+thread blocks every other request of the server. With the pool started (see
+app.py, RENDER_WORKERS), PNG renders run in separate processes that imported
+matplotlib/networkx and loaded their fonts once at start-up. A request waits at
+most RENDER_TIMEOUT seconds for its picture; after that it gets RenderTimeout
+and the page is shown without the image. A job that timed out still finishes in
+its worker (processes cannot be interrupted safely), it just is not waited for.
+
+Without a started pool (tests, command-line use) jobs run in the calling thread.
+"""
+
+import os
+import sys
+import functools
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    RENDER_TIMEOUT = float(os.environ.get('RENDER_TIMEOUT', '10'))
+except ValueError:
+    RENDER_TIMEOUT = 10.0
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+class RenderTimeout(Exception):
+    """Raised when a render job does not finish within the timeout."""
+
+
+def _warm_up():
+    # Runs once in every worker: imports the plotting stack and draws a tiny
+    # graph so the font cache and the Agg renderer are ready for the first job
+    from methods.graph_render import render_png
+    render_png({0: (0.0, 0.0), 1: (1.0, 1.0)}, [(0, 1)], [(0, 1)], title='warm-up')
+
+
+def _ping():
+    return os.getpid()
+
+
+def default_workers():
+    """Number of workers from RENDER_WORKERS ('auto' = up to 4, one per CPU; 0 = no pool)."""
+    value = os.environ.get('RENDER_WORKERS', 'auto').lower()
+    if value == 'auto':
+        return min(4, os.cpu_count() or 1)
+    try:
+        return max(0, int(value))
+    except ValueError:
+        return 0
+
+
+def start_render_pool(workers=None):
+    """
+    Starts the render pool (once per process) and waits until every worker is warm.
+    Returns the pool, or None when the configured number of workers is 0.
+
+    Start the pool before any other background thread: on Linux the workers
+    are forked from the current process.
+    """
+    global _pool, _pool_workers
+    workers = default_workers() if workers is None else workers
+    if workers <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers, initializer=_warm_up)
+            _pool_workers = workers
+            # Make every worker start (and run _warm_up) now instead of on the first request
+            for future in [_pool.submit(_ping) for _ in range(workers)]:
+                future.result()
+    return _pool
+
+
+def stop_render_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def forget_render_pool():
+    """
+    Drops the pool object inherited by a process forked from the server (e.g. a
+    batch worker) without touching the parent's workers: renders in that process
+    run inline.
+    """
+    global _pool
+    _pool = None
+
+
+def run_render(func, *args, timeout=None):
+    """
+    Runs func(*args) in the render pool and returns its result.
+
+    Parameters:
+        func (callable): Module-level function (it is pickled by reference).
+        *args: Picklable arguments.
+        timeout (float): Seconds to wait; RENDER_TIMEOUT by default.
+
+    Raises:
+        RenderTimeout: The job did not finish in time.
+    """
+    pool = _pool
+    if pool is None:
+        return func(*args)
+
+    try:
+        future = pool.submit(func, *args)
+        return future.result(timeout=RENDER_TIMEOUT if timeout is None else timeout)
+    except FutureTimeout:
+        future.cancel()
+        raise RenderTimeout(f"Rendering did not finish in {RENDER_TIMEOUT if timeout is None else timeout} s")
+    except BrokenProcessPool:
+        # A worker died (e.g. killed by the OS): replace the pool and draw this picture here
+        print("Render pool is broken, restarting it", file=sys.stderr)
+        stop_render_pool()
+        start_render_pool(_pool_workers)
+        return func(*args)
+
+
+def offloaded(func):
+    """Returns a function with the signature of func that runs it in the render pool."""
+    return functools.partial(run_render, func)
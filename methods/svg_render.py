@@ -0,0 +1,118 @@
+"""
+Lightweight SVG renderer for the small graphs shown on the algorithm pages.
+
+Takes node positions, the edges of the graph, the highlighted (tree) edges and
+optional per-node colors and writes the SVG markup directly, without
+matplotlib and without any global plotting state.
+
+Which renderer a page uses is configured through the environment:
+GRAPH_RENDERER sets the default ('png' or 'svg') and GRAPH_RENDERER_<PAGE>
+(e.g. GRAPH_RENDERER_BFS=svg) overrides it for one page.
+"""
+
+import os
+import colorsys
+from xml.sax.saxutils import escape
+
+RENDERER_FORMATS = ('png', 'svg')
+PAGES = ('bfs', 'dfs', 'beam', 'coloring')
+
+
+def _renderer_setting(name, default):
+    value = os.environ.get(name, default).lower()
+    return value if value in RENDERER_FORMATS else default
+
+
+DEFAULT_RENDERER = _renderer_setting('GRAPH_RENDERER', 'png')
+RENDERERS = {page: _renderer_setting(f'GRAPH_RENDERER_{page.upper()}', DEFAULT_RENDERER) for page in PAGES}
+
+# Same colors as matplotlib's 'tab10', so both renderers color graphs alike
+TAB10 = ('#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
+         '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf')
+
+
+def renderer_for(page):
+    """Returns the image format ('png' or 'svg') configured for a page."""
+    return RENDERERS.get(page, DEFAULT_RENDERER)
+
+
+def palette(count):
+    """Returns count distinct colors as '#rrggbb' strings."""
+    if count <= len(TAB10):
+        return list(TAB10[:count])
+    colors = []
+    for i in range(count):
+        r, g, b = colorsys.hsv_to_rgb(i / count, 0.65, 0.85)
+        colors.append(f'#{int(r * 255):02x}{int(g * 255):02x}{int(b * 255):02x}')
+    return colors
+
+
+def _fmt(value):
+    # Short, stable number formatting keeps the markup small and reproducible
+    return f'{value:.2f}'.rstrip('0').rstrip('.')
+
+
+def render_svg(positions, edges, tree_edges=(), node_colors=None, labels=None, title=None,
+               size=600, node_radius=22, edge_color='gray', tree_color='red', node_color='lightblue'):
+    """
+    Draws a graph as an SVG document.
+
+    Parameters:
+        positions (dict): Node -> (x, y); any coordinate range, it is scaled to the picture.
+        edges (iterable): Pairs of nodes drawn as thin gray lines.
+        tree_edges (iterable): Pairs of nodes drawn on top as thick highlighted lines.
+        node_colors (dict): Node -> fill color; nodes without a color use node_color.
+        labels (dict): Node -> label text; defaults to the node itself.
+        title (str): Optional caption above the graph.
+        size (int): Width and height of the picture in pixels.
+
+    Returns:
+        str: The SVG markup.
+    """
+    nodes = list(positions)
+    top = 40 if title else 0
+    margin = node_radius + 8
+
+    xs = [positions[node][0] for node in nodes] or [0.0]
+    ys = [positions[node][1] for node in nodes] or [0.0]
+    min_x, min_y = min(xs), min(ys)
+    span = max(max(xs) - min_x, max(ys) - min_y) or 1.0
+    scale = (size - 2 * margin) / span
+    # Center the drawing when it is narrower than high (or the other way round)
+    offset_x = margin + ((size - 2 * margin) - (max(xs) - min_x) * scale) / 2
+    offset_y = top + margin + ((size - 2 * margin) - (max(ys) - min_y) * scale) / 2
+
+    def point(node):
+        x, y = positions[node]
+        # SVG y grows downwards, layouts grow upwards
+        return offset_x + (x - min_x) * scale, offset_y + (max(ys) - y) * scale
+
+    height = size + top
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{height}" '
+        f'viewBox="0 0 {size} {height}">',
+        f'<rect width="{size}" height="{height}" fill="white"/>',
+    ]
+    if title:
+        parts.append(f'<text x="{_fmt(size / 2)}" y="28" font-family="sans-serif" font-size="18" '
+                     f'text-anchor="middle">{escape(str(title))}</text>')
+
+    for color, width, edge_list in ((edge_color, 1.5, edges), (tree_color, 2.5, tree_edges)):
+        for u, v in edge_list:
+            x1, y1 = point(u)
+            x2, y2 = point(v)
+            parts.append(f'<line x1="{_fmt(x1)}" y1="{_fmt(y1)}" x2="{_fmt(x2)}" y2="{_fmt(y2)}" '
+                         f'stroke="{color}" stroke-width="{width}"/>')
+
+    node_colors = node_colors or {}
+    labels = labels or {}
+    for node in nodes:
+        x, y = point(node)
+        fill = node_colors.get(node, node_color)
+        label = escape(str(labels.get(node, node)))
+        parts.append(f'<circle cx="{_fmt(x)}" cy="{_fmt(y)}" r="{node_radius}" fill="{fill}"/>')
+        parts.append(f'<text x="{_fmt(x)}" y="{_fmt(y)}" font-family="sans-serif" font-size="14" '
+                     f'font-weight="bold" text-anchor="middle" dominant-baseline="central">{label}</text>')
+
+    parts.append('</svg>')
+    return '\n'.join(parts)
@@ -14,8 +14,9 @@ from logics.greedy_utils import get_data as get_greedy_data
 from methods.dfs_spanning_tree import process_dfs_request
 from logics.beam_utils import get_data
 from logics.bfs_utils import get_bfs_data
-import matplotlib.pyplot as plt
-import matplotlib.colors
+from logics.history_utils import get_history_data, get_stats_data, get_history_page_data
+from logics.api_utils import get_api_data
+from logics.batch_utils import get_batch_data
 
 @route('/')
 @route('/home')
@@ -44,9 +45,7 @@ def section2():
 @route('/beam', method=['GET', 'POST'])
 @view('beam_method')
 def beam():
-    result = None
-    result_is_error = False
-    form_data, result, result_is_error = get_data(request)
+    form_data, result, result_is_error, image_path = get_data(request)
 
     theory_text = get_theory('static/theory/theory_beam_search.md')
 
@@ -54,6 +53,7 @@ def beam():
         year=datetime.now().year,
         result=result,
         result_is_error=result_is_error,
+        image_path=image_path,
         form_data=form_data,
         theory_text=theory_text
     )
@@ -79,6 +79,45 @@ def greedy_coloring_page():
         error_message=error_message
     )
 
+@route('/history')
+def history():
+    """Returns a filtered, paginated page of the algorithm run history as JSON."""
+    payload, status = get_history_data(request)
+    response.status = status
+    return payload
+
+@route('/history/<algorithm>')
+def history_browser(algorithm):
+    """Renders one page of an algorithm's run history, newest first (JSON with ?format=json)."""
+    payload, status = get_history_page_data(request, algorithm)
+    response.status = status
+    if request.query.get('format') == 'json':
+        return payload
+    return template('history', year=datetime.now().year, **payload)
+
+@route('/stats')
+def stats():
+    """Returns the incrementally maintained run history statistics as JSON."""
+    return get_stats_data()
+
+@route('/api/<algorithm>', method='POST')
+def api(algorithm):
+    """Runs bfs, dfs, beam or coloring on a JSON graph and returns the result as JSON,
+    without rendering a page (a picture only with "image": true)."""
+    payload, status = get_api_data(request, algorithm)
+    response.status = status
+    return payload
+
+@route('/api/<algorithm>/batch', method='POST')
+def api_batch(algorithm):
+    """Runs the algorithm on every line of an NDJSON body of jobs and streams one
+    JSON result line back per job."""
+    body, status = get_batch_data(request, algorithm)
+    response.status = status
+    if status == 200:
+        response.content_type = 'application/x-ndjson'
+    return body
+
 @route('/our_team')
 @view('our_team')
 def our_command():
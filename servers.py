@@ -0,0 +1,550 @@
+"""
+Production HTTP servers built on the standard library.
+
+bottle's 'wsgiref' server handles one HTTP/1.0 request at a time, so a slow
+render keeps every other user waiting. This module provides two alternatives
+(selected in app.py through SERVER_MODE):
+
+threaded
+    wsgiref with HTTP/1.1 keep-alive, where requests are served by a fixed
+    pool of threads (SERVER_THREADS). Connections waiting for their next
+    request hold no thread: they are parked in a selector and handed to the
+    pool once they are readable.
+
+prefork
+    The parent process imports the application once, binds the listening
+    socket and forks SERVER_WORKERS worker processes that each run the
+    threaded server on the inherited socket. The workers share the parent's
+    memory copy-on-write (imported modules, compiled theory pages). Crashed
+    workers are replaced. SIGHUP recycles the workers gracefully: a new
+    generation is forked first, then the old workers finish their in-flight
+    requests and exit. SIGTERM or SIGINT stops the server the same way.
+    Only available where os.fork exists.
+"""
+
+import os
+import sys
+import time
+import signal
+import socket
+import selectors
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.simple_server import WSGIServer, WSGIRequestHandler, ServerHandler
+
+import bottle
+
+# Seconds an idle keep-alive connection is kept open
+DEFAULT_KEEPALIVE_TIMEOUT = 5.0
+
+# Seconds the prefork parent waits for stopping workers before killing them
+WORKER_STOP_TIMEOUT = 30.0
+
+
+class RequestBody:
+    """
+    wsgi.input that reads no further than the Content-Length of the request, so
+    that the next request on a kept-alive connection is not consumed by mistake.
+    Whatever the application leaves unread is skipped by drain().
+    """
+
+    def __init__(self, stream, length):
+        self._stream = stream
+        self._remaining = length
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._stream.read(size) if size else b''
+        self._remaining -= len(data)
+        return data
+
+    def readline(self, size=-1):
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        line = self._stream.readline(size) if size else b''
+        self._remaining -= len(line)
+        return line
+
+    def readlines(self, hint=-1):
+        return list(iter(self.readline, b''))
+
+    def __iter__(self):
+        return iter(self.readline, b'')
+
+    def drain(self):
+        """Reads the rest of the body; returns False if the client sent less than announced."""
+        while self._remaining:
+            if not self.read(min(self._remaining, 65536)):
+                return False
+        return True
+
+
+class KeepAliveServerHandler(ServerHandler):
+    """
+    wsgiref response handler that speaks HTTP/1.1 and keeps the connection open
+    whenever the response length is known and the client did not ask to close.
+    """
+
+    http_version = '1.1'
+
+    def cleanup_headers(self):
+        super().cleanup_headers()
+        request_handler = self.request_handler
+        keep_alive = (not request_handler.close_connection
+                      and not request_handler.server.stopping
+                      and 'Content-Length' in self.headers
+                      and self.headers.get('Connection', '').lower() != 'close')
+        if keep_alive:
+            if request_handler.request_version == 'HTTP/1.0':
+                self.headers['Connection'] = 'keep-alive'
+        else:
+            request_handler.close_connection = True
+            self.headers['Connection'] = 'close'
+
+
+class KeepAliveRequestHandler(WSGIRequestHandler):
+    """
+    Request handler that serves any number of requests on one connection.
+
+    The handler does not wait for requests itself: after the connection is
+    accepted, and whenever it is idle between requests, it is left parked
+    (self.parked) and the server calls resume() in a pool thread once the next
+    request arrives. The server's keepalive_timeout limits how long an idle
+    connection is kept.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        self.timeout = self.server.keepalive_timeout
+        self.parked = False
+        super().setup()
+
+    def handle(self):
+        # Runs when the connection is accepted: wait for the first request in the server's selector
+        self.close_connection = False
+        self.parked = True
+
+    def resume(self):
+        """Serves the requests that have arrived; the connection is parked again when it goes idle."""
+        self.parked = False
+        try:
+            self.handle_one_request()
+            while not self.close_connection:
+                if not self._request_pending():
+                    self.parked = True
+                    return
+                # A pipelined request is already in the read buffer
+                self.handle_one_request()
+        finally:
+            if not self.parked:
+                self.finish()
+
+    def finish(self):
+        if not self.parked:
+            super().finish()
+
+    def _request_pending(self):
+        """Whether data of the next request can be read without waiting."""
+        self.connection.settimeout(0)
+        try:
+            # peek() returns the buffered bytes, or does one non-blocking read
+            return bool(self.rfile.peek(1))
+        except OSError:
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
+
+    def handle_one_request(self):
+        try:
+            self.raw_requestline = self.rfile.readline(65537)
+        except (TimeoutError, ConnectionError):
+            self.close_connection = True
+            return
+        if not self.raw_requestline:
+            self.close_connection = True
+            return
+        if len(self.raw_requestline) > 65536:
+            self.requestline = ''
+            self.request_version = ''
+            self.command = ''
+            self.send_error(414)
+            return
+
+        # parse_request sets close_connection from the version and the Connection header
+        if not self.parse_request():
+            return
+
+        environ = self.get_environ()
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0 or 'chunked' in self.headers.get('Transfer-Encoding', '').lower():
+            # The end of the body cannot be found, so the connection cannot be reused
+            self.close_connection = True
+            length = 0
+        body = RequestBody(self.rfile, length)
+
+        # The bounded body is the handler's stdin: setup_environ() puts stdin into
+        # wsgi.input, so the application never reads past this request
+        handler = KeepAliveServerHandler(
+            body, self.wfile, self.get_stderr(), environ,
+            multithread=True, multiprocess=self.server.multiprocess,
+        )
+        handler.request_handler = self
+        handler.run(self.server.get_app())
+        if not self.close_connection and not body.drain():
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class ThreadPoolWSGIServer(WSGIServer):
+    """
+    WSGI server that serves requests in a fixed pool of threads.
+
+    Idle connections (accepted, or kept alive between requests) are watched by
+    one selector thread and only take a pool thread while a request is served,
+    so idle keep-alive connections never delay requests on other connections.
+
+    Parameters:
+        server_address (tuple): (host, port) to bind.
+        threads (int): Number of requests served at the same time; further
+            requests wait until a thread is free.
+        keepalive_timeout (float): Seconds an idle connection is kept open.
+        multiprocess (bool): Whether other processes serve the same application.
+        quiet (bool): Do not log every request to stderr.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, server_address, handler_class=KeepAliveRequestHandler, threads=8,
+                 keepalive_timeout=DEFAULT_KEEPALIVE_TIMEOUT, multiprocess=False, quiet=False,
+                 bind_and_activate=True):
+        self.threads = max(1, threads)
+        self.keepalive_timeout = keepalive_timeout
+        self.multiprocess = multiprocess
+        self.quiet = quiet
+        self.stopping = False
+        self._executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix='http')
+        # Parked connections: handed to the selector thread through _parking
+        self._park_lock = threading.Lock()
+        self._parking = []
+        self._watcher = None
+        self._wakeup = None
+        super().__init__(server_address, handler_class, bind_and_activate)
+
+    def use_socket(self, listener):
+        """Serves on an already bound and listening socket (one inherited from the prefork parent)."""
+        self.socket.close()
+        self.socket = listener
+        self.server_address = listener.getsockname()
+        host, port = self.server_address[:2]
+        self.server_name = socket.getfqdn(host)
+        self.server_port = port
+        self.setup_environ()
+
+    def process_request(self, request, client_address):
+        # Only sets the handler up: it is parked until its first request arrives
+        try:
+            handler = self.RequestHandlerClass(request, client_address, self)
+        except Exception:
+            self.handle_error(request, client_address)
+            self.shutdown_request(request)
+            return
+        self._release(handler)
+
+    def _serve_connection(self, handler):
+        try:
+            handler.resume()
+        except Exception:
+            handler.parked = False
+            self.handle_error(handler.request, handler.client_address)
+        self._release(handler)
+
+    def _release(self, handler):
+        """Parks a connection that waits for its next request, closes any other."""
+        if handler.parked and self._park(handler):
+            return
+        self._close_connection(handler)
+
+    def _close_connection(self, handler):
+        if handler.parked:
+            handler.parked = False
+            try:
+                handler.finish()
+            except OSError:
+                pass
+        self.shutdown_request(handler.request)
+
+    def _park(self, handler):
+        with self._park_lock:
+            if self.stopping:
+                return False
+            if self._watcher is None:
+                self._wakeup = socket.socketpair()
+                self._watcher = threading.Thread(target=self._watch_parked, name='http-keepalive', daemon=True)
+                self._watcher.start()
+            handler.idle_since = time.monotonic()
+            self._parking.append(handler)
+            self._wake()
+        return True
+
+    def _wake(self):
+        try:
+            self._wakeup[1].send(b'\0')
+        except OSError:
+            pass  # The buffer is full, so a wake-up is pending anyway
+
+    def _watch_parked(self):
+        # Body of the selector thread: hands readable connections to the pool
+        # and closes the ones idle for longer than keepalive_timeout
+        selector = selectors.DefaultSelector()
+        receiver = self._wakeup[0]
+        receiver.setblocking(False)
+        selector.register(receiver, selectors.EVENT_READ)
+        try:
+            while True:
+                with self._park_lock:
+                    parking, self._parking = self._parking, []
+                    stopping = self.stopping
+                for handler in parking:
+                    selector.register(handler.connection, selectors.EVENT_READ, handler)
+
+                now = time.monotonic()
+                timeout = None
+                for key in list(selector.get_map().values()):
+                    handler = key.data
+                    if handler is None:
+                        continue
+                    expires = handler.idle_since + self.keepalive_timeout
+                    if stopping or expires <= now:
+                        selector.unregister(key.fileobj)
+                        self._close_connection(handler)
+                    else:
+                        timeout = expires - now if timeout is None else min(timeout, expires - now)
+                if stopping:
+                    return
+
+                for key, _ in selector.select(timeout):
+                    if key.data is None:
+                        try:
+                            while receiver.recv(4096):
+                                pass
+                        except BlockingIOError:
+                            pass
+                        continue
+                    selector.unregister(key.fileobj)
+                    try:
+                        self._executor.submit(self._serve_connection, key.data)
+                    except RuntimeError:
+                        # The pool has been shut down
+                        self._close_connection(key.data)
+        finally:
+            selector.close()
+
+    def _stop_watcher(self):
+        with self._park_lock:
+            self.stopping = True
+            watcher = self._watcher
+            if watcher is not None:
+                self._wake()
+        if watcher is not None and watcher is not threading.current_thread():
+            watcher.join()
+            for sock in self._wakeup:
+                sock.close()
+
+    def drain(self):
+        """
+        Waits for the requests in progress after serve_forever() returned.
+        Idle connections are closed at once, kept-alive connections after
+        their current request.
+        """
+        self._stop_watcher()
+        self._executor.shutdown(wait=True)
+
+    def server_close(self):
+        super().server_close()
+        self._stop_watcher()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def make_threaded_server(host, port, app, threads=8, keepalive_timeout=DEFAULT_KEEPALIVE_TIMEOUT, quiet=False):
+    """Returns a ThreadPoolWSGIServer bound to (host, port) that serves app."""
+    server = ThreadPoolWSGIServer((host, port), threads=threads,
+                                  keepalive_timeout=keepalive_timeout, quiet=quiet)
+    server.set_app(app)
+    return server
+
+
+def _run_worker(listener, app, threads, keepalive_timeout, quiet):
+    # Body of a forked worker process: serve until the parent sends SIGTERM
+    server = ThreadPoolWSGIServer(listener.getsockname(), threads=threads, keepalive_timeout=keepalive_timeout,
+                                  multiprocess=True, quiet=quiet, bind_and_activate=False)
+    server.use_socket(listener)
+    server.set_app(app)
+
+    def graceful_stop(signum, frame):
+        # shutdown() waits for serve_forever() to return, so it cannot run in the signal handler itself
+        server.stopping = True
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, graceful_stop)
+    # Ctrl-C reaches the whole process group; the parent decides how the workers stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+
+    server.serve_forever(poll_interval=0.5)
+    # The listening socket belongs to the parent and stays open for the other workers
+    server.drain()
+
+
+def serve_prefork(app, host, port, workers=2, threads=8, keepalive_timeout=DEFAULT_KEEPALIVE_TIMEOUT,
+                  quiet=False, on_worker_start=None, on_worker_exit=None):
+    """
+    Serves app from `workers` forked processes until SIGTERM or SIGINT.
+
+    Parameters:
+        app (callable): WSGI application, already imported in this process.
+        host (str), port (int): Address to listen on.
+        workers (int): Number of worker processes.
+        threads (int): Threads per worker process.
+        keepalive_timeout (float): Seconds an idle connection is kept open.
+        on_worker_start (callable): Called in every new worker as on_worker_start(worker_id)
+            before it serves requests, e.g. to start per-process background threads.
+            Worker ids ('w0a', 'w1a', ..., then 'w0b', ...) are reused by later generations, but two
+            workers running at the same time never share one.
+        on_worker_exit (callable): Called in a worker with its id after it stopped serving.
+    """
+    if not hasattr(os, 'fork'):
+        raise RuntimeError("The prefork server needs os.fork (not available on this platform)")
+
+    workers = max(1, workers)
+    listener = socket.create_server((host, port), backlog=ThreadPoolWSGIServer.request_queue_size)
+    listener.set_inheritable(True)
+
+    children = {}       # pid -> (index, generation) of the current generation
+    retiring = set()    # pids of stopping workers of older generations
+    events = []         # signals received by the parent, handled by the loop below
+    generation = 0
+
+    def spawn(index):
+        worker_id = f'w{index}{"ab"[generation % 2]}'
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                # Until the worker serves, SIGTERM simply ends it
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                signal.signal(signal.SIGINT, signal.SIG_IGN)
+                signal.signal(signal.SIGHUP, signal.SIG_IGN)
+                if on_worker_start is not None:
+                    on_worker_start(worker_id)
+                _run_worker(listener, app, threads, keepalive_timeout, quiet)
+                if on_worker_exit is not None:
+                    on_worker_exit(worker_id)
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                # Skip the parent's atexit handlers and finalizers
+                os._exit(code)
+        children[pid] = (index, generation)
+
+    def stop_workers(pids):
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    previous_handlers = {signum: signal.signal(signum, lambda signum, frame: events.append(signum))
+                         for signum in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT)}
+    try:
+        for index in range(workers):
+            spawn(index)
+        if not quiet:
+            print(f"Prefork server: {workers} workers x {threads} threads (parent pid {os.getpid()})",
+                  file=sys.stderr)
+
+        stopping = False
+        while children or retiring:
+            # Reap exited workers, replacing crashed ones of the current generation
+            while True:
+                try:
+                    pid, status = os.waitpid(-1, os.WNOHANG)
+                except ChildProcessError:
+                    pid = 0
+                if pid == 0:
+                    break
+                retiring.discard(pid)
+                if pid in children:
+                    index, _ = children.pop(pid)
+                    if not stopping:
+                        print(f"Worker {pid} exited unexpectedly (status {status}), starting a new one",
+                              file=sys.stderr)
+                        spawn(index)
+
+            while events:
+                signum = events.pop(0)
+                if signum == signal.SIGHUP and not stopping:
+                    if retiring:
+                        # The ids of the previous generation are still in use; retry once it has exited
+                        events.append(signum)
+                        break
+                    old = list(children)
+                    children.clear()
+                    generation += 1
+                    for index in range(workers):
+                        spawn(index)
+                    retiring.update(old)
+                    stop_workers(old)
+                elif signum in (signal.SIGTERM, signal.SIGINT) and not stopping:
+                    stopping = True
+                    deadline = time.monotonic() + WORKER_STOP_TIMEOUT
+                    retiring.update(children)
+                    children.clear()
+                    stop_workers(retiring)
+
+            if stopping and retiring and time.monotonic() > deadline:
+                for pid in retiring:
+                    try:
+                        os.kill(pid, signal.SIGKILL)
+                    except ProcessLookupError:
+                        pass
+                deadline = float('inf')
+            time.sleep(0.1)
+    finally:
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
+        stop_workers(list(children) + list(retiring))
+        listener.close()
+
+
+class ThreadedServer(bottle.ServerAdapter):
+    """bottle adapter for the threaded keep-alive server (options: threads, keepalive_timeout)."""
+
+    def run(self, handler):
+        server = make_threaded_server(self.host, self.port, handler, quiet=self.quiet, **self.options)
+        self.port = server.server_port
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+
+
+class PreforkServer(bottle.ServerAdapter):
+    """bottle adapter for the prefork server (options: see serve_prefork)."""
+
+    def run(self, handler):
+        serve_prefork(handler, self.host, self.port, quiet=self.quiet, **self.options)
@@ -0,0 +1,158 @@
+import io
+import os
+import json
+import unittest
+from unittest import mock
+
+from logics.api_utils import run_api_job, get_api_data, parse_graph, ApiError
+from logics import api_utils, json_utils
+from logics.record_codec import decode_matrix
+
+
+class FakeRequest:
+    def __init__(self, body):
+        self.body = io.BytesIO(body)
+        self.content_length = len(body)
+
+
+@mock.patch('logics.api_utils.save_algorithm_record')
+class TestApiUtils(unittest.TestCase):
+    """
+    Unit tests for the JSON API of the four algorithms.
+    """
+
+    def test_runApiJob_Bfs_TreeEdgesAndVisitOrder(self, save):
+        """
+        Test that BFS returns 1-based parent/child edges and the visit order, and logs the run.
+        """
+        payload, status = run_api_job('bfs', {'num_vertices': 4, 'edges': [[1, 2], [2, 3], [1, 4]], 'start_vertex': 2})
+        self.assertEqual(status, 200)
+        self.assertEqual(payload['visit_order'], [2, 1, 3, 4])
+        self.assertEqual(payload['tree_edges'], [[2, 1], [2, 3], [1, 4]])
+        self.assertNotIn('image', payload)
+        save.assert_called_once()
+        self.assertEqual(save.call_args.kwargs['algorithm'], 'bfs')
+
+    def test_runApiJob_Bfs_NoTreeMatrixBuilt(self, save):
+        """
+        Test that the API answers from the BFS edge list without building the n x n tree matrix.
+        """
+        with mock.patch('methods.bfs_spanning_tree.tree_matrix') as tree_matrix:
+            payload, status = run_api_job('bfs', {'num_vertices': 3, 'edges': [[1, 2], [2, 3]]})
+        self.assertEqual(status, 200)
+        self.assertEqual(payload['tree_edges'], [[1, 2], [2, 3]])
+        tree_matrix.assert_not_called()
+
+    def test_runApiJob_Dfs_EdgesInDiscoveryOrder(self, save):
+        """
+        Test that DFS tree edges are oriented from parent to child in discovery order.
+        """
+        matrix = [[0, 1, 1, 0], [1, 0, 0, 1], [1, 0, 0, 0], [0, 1, 0, 0]]
+        payload, status = run_api_job('dfs', {'adjacency_matrix': matrix, 'start_vertex': 1})
+        self.assertEqual(status, 200)
+        self.assertEqual(payload['visit_order'], [1, 2, 4, 3])
+        self.assertEqual(payload['tree_edges'], [[1, 2], [2, 4], [1, 3]])
+
+    def test_runApiJob_Beam_TotalWeight(self, save):
+        """
+        Test that beam search returns the weighted tree edges and their total weight.
+        """
+        payload, status = run_api_job('beam', {'num_vertices': 3, 'edges': [[1, 2, 4], [2, 3, 1], [1, 3, 2]]})
+        self.assertEqual(status, 200)
+        self.assertEqual(payload['tree_edges'], [[1, 3, 2], [2, 3, 1]])
+        self.assertEqual(payload['total_weight'], 3)
+
+    def test_runApiJob_Coloring_ColorPerVertex(self, save):
+        """
+        Test that coloring a triangle uses three colors.
+        """
+        payload, status = run_api_job('coloring', {'num_vertices': 3, 'edges': [[1, 2], [2, 3], [1, 3]]})
+        self.assertEqual(status, 200)
+        self.assertEqual(sorted(payload['colors']), [1, 2, 3])
+        self.assertEqual(payload['num_colors'], 3)
+
+    def test_runApiJob_DisconnectedGraph_Returns422(self, save):
+        """
+        Test that a graph without a spanning tree gives an error and is still logged.
+        """
+        payload, status = run_api_job('bfs', {'num_vertices': 3, 'edges': [[1, 2]]})
+        self.assertEqual(status, 422)
+        self.assertIn('disconnected', payload['error'])
+        self.assertIsNotNone(save.call_args.kwargs['error_message'])
+
+    def test_runApiJob_InvalidInput_Returns400WithoutLogging(self, save):
+        """
+        Test that invalid jobs are rejected before the algorithm runs.
+        """
+        for job in [{'num_vertices': 3, 'edges': [[1, 4]]},
+                    {'num_vertices': 0},
+                    {'adjacency_matrix': [[0, 1], [0, 0]]},
+                    {'num_vertices': 2, 'edges': [[1, 2]], 'start_vertex': 3},
+                    [1, 2]]:
+            payload, status = run_api_job('dfs', job)
+            self.assertEqual(status, 400, job)
+            self.assertIn('error', payload)
+        payload, status = run_api_job('beam', {'num_vertices': 2, 'edges': [[1, 2]]})
+        self.assertEqual(status, 400)
+        save.assert_not_called()
+
+    def test_parseGraph_EdgesAndMatrix_SameGraph(self, save):
+        """
+        Test that an edge list and the equivalent matrices describe the same graph.
+        """
+        from_edges = parse_graph({'num_vertices': 3, 'edges': [[1, 2, 5], [2, 3, 7]]}, 'beam')
+        from_matrix = parse_graph({
+            'adjacency_matrix': [[0, 1, 0], [1, 0, 1], [0, 1, 0]],
+            'weight_matrix': [[0, 5, 0], [5, 0, 7], [0, 7, 0]]
+        }, 'beam')
+        self.assertEqual(from_edges, from_matrix)
+        with self.assertRaises(ApiError) as error:
+            parse_graph({'num_vertices': 10 ** 6}, 'bfs')
+        self.assertEqual(error.exception.status, 413)
+
+    def test_runApiJob_BeamAboveVertexLimit_Returns413WithoutRunning(self, save):
+        """
+        Test that beam search, exponential in the number of vertices, only accepts small graphs.
+        """
+        if 'API_MAX_BEAM_VERTICES' not in os.environ:
+            self.assertEqual(api_utils.API_MAX_BEAM_VERTICES, 10)
+        n = api_utils.API_MAX_BEAM_VERTICES + 1
+        payload, status = run_api_job('beam', {'num_vertices': n, 'edges': [[i, i + 1, 1] for i in range(1, n)]})
+        self.assertEqual(status, 413)
+        self.assertIn(str(n - 1), payload['error'])
+        save.assert_not_called()
+
+    def test_runApiJob_LargeEdgeList_RecordStoredAsEdges(self, save):
+        """
+        Test that an edge-list job is logged with edge lists, which decode to the dense matrices.
+        """
+        n = 1000
+        payload, status = run_api_job('bfs', {'num_vertices': n, 'edges': [[i, i + 1] for i in range(1, n)]})
+        self.assertEqual(status, 200)
+        record = save.call_args.kwargs
+        path = [[i, i + 1] for i in range(n - 1)]
+        self.assertEqual(record['input_data']['adjacency_matrix'], {'n': n, 'symmetric': True, 'edges': path})
+        self.assertEqual(record['result_matrix'], {'n': n, 'symmetric': True, 'edges': path})
+        self.assertIsNone(record['input_data']['weight_matrix'])
+        with mock.patch.object(json_utils, 'RECORD_ENCODING', 'dense'):
+            _, dense = json_utils.build_algorithm_record(**record)
+        self.assertEqual(dense['input_data']['adjacency_matrix'], decode_matrix(record['input_data']['adjacency_matrix']))
+        self.assertNotIn('encoding', dense)
+
+        run_api_job('beam', {'num_vertices': 3, 'edges': [[1, 2, 4], [2, 3, 1], [1, 3, 2]]})
+        weights = decode_matrix(save.call_args.kwargs['input_data']['weight_matrix'])
+        self.assertEqual(weights, [[0, 4, 2], [4, 0, 1], [2, 1, 0]])
+
+    def test_getApiData_JsonBody_DecodedAndRun(self, save):
+        """
+        Test that the request body is decoded as JSON and malformed bodies give 400.
+        """
+        body = json.dumps({'num_vertices': 2, 'edges': [[1, 2]]}).encode()
+        payload, status = get_api_data(FakeRequest(body), 'coloring')
+        self.assertEqual((status, payload['colors']), (200, [1, 2]))
+        self.assertEqual(get_api_data(FakeRequest(b'{oops'), 'bfs')[1], 400)
+        self.assertEqual(get_api_data(FakeRequest(b'{}'), 'prim')[1], 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import io
+import os
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+
+from methods.batch import iter_sources, run, main
+
+
+class TestBatchRunner(unittest.TestCase):
+    """
+    Unit tests for the offline batch runner (python -m methods.batch).
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        with open(os.path.join(self.dir, 'a.jsonl'), 'w') as f:
+            f.write(json.dumps({'id': 'path', 'num_vertices': 3, 'edges': [[1, 2, 1], [2, 3, 2]]}) + '\n')
+            f.write('\n')
+            f.write(json.dumps({'id': 'split', 'num_vertices': 3, 'edges': [[1, 2, 1]]}) + '\n')
+        with open(os.path.join(self.dir, 'b.json'), 'w') as f:
+            json.dump([{'id': 'own', 'num_vertices': 2, 'edges': [[1, 2]], 'algorithm': 'coloring'}], f)
+        with open(os.path.join(self.dir, 'notes.txt'), 'w') as f:
+            f.write('not a graph')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_iterSources_Directory_JsonlLinesAndJsonLists(self):
+        """
+        Test that a directory yields every JSON Lines line and every item of a JSON list, with sources.
+        """
+        sources = [source for source, _ in iter_sources([self.dir])]
+        self.assertEqual([os.path.basename(source) for source in sources], ['a.jsonl:1', 'a.jsonl:3', 'b.json#0'])
+
+    def test_run_Inline_ResultPerGraphAndAlgorithm(self):
+        """
+        Test that every graph is run with every requested algorithm and the summary counts them.
+        """
+        output = io.StringIO()
+        summary = run([os.path.join(self.dir, 'a.jsonl')], ['bfs', 'beam'], output, workers=0).as_dict()
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+
+        self.assertEqual([(r['id'], r['algorithm'], r['status']) for r in results],
+                         [('path', 'bfs', 200), ('path', 'beam', 200), ('split', 'bfs', 422), ('split', 'beam', 422)])
+        self.assertEqual(results[1]['total_weight'], 3)
+        self.assertEqual((summary['runs'], summary['errors']), (4, 2))
+        self.assertEqual(summary['algorithms']['bfs']['runs'], 2)
+
+    def test_run_Pool_SameResultsAsInline(self):
+        """
+        Test that running in worker processes gives the same result lines.
+        """
+        def results(workers):
+            output = io.StringIO()
+            run([self.dir], ['dfs', 'coloring'], output, workers=workers, chunk_size=1)
+            lines = [json.loads(line) for line in output.getvalue().splitlines()]
+            for line in lines:
+                line.pop('duration_ms', None)
+            return sorted(lines, key=lambda line: (line['source'], line['algorithm']))
+
+        self.assertEqual(results(2), results(0))
+
+    def test_main_GraphAlgorithmField_WritesOutputAndSummary(self):
+        """
+        Test the command line: without --algorithm each graph names its own, and a JSON summary is written.
+        """
+        out_path = os.path.join(self.dir, 'out.jsonl')
+        summary_path = os.path.join(self.dir, 'summary.json')
+        with redirect_stderr(io.StringIO()) as stderr:
+            code = main([os.path.join(self.dir, 'b.json'), os.path.join(self.dir, 'a.jsonl'),
+                         '-o', out_path, '--summary', summary_path, '-w', '0'])
+        self.assertEqual(code, 0)
+        self.assertIn('3 runs (2 errors)', stderr.getvalue())
+
+        with open(out_path) as f:
+            results = [json.loads(line) for line in f]
+        self.assertEqual(results[0]['colors'], [1, 2])
+        self.assertIn('No algorithm', results[1]['error'])
+        with open(summary_path) as f:
+            self.assertEqual(json.load(f)['runs'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import io
+import json
+import unittest
+from unittest import mock
+from concurrent.futures.process import BrokenProcessPool
+
+from logics import batch_utils
+from logics.batch_utils import iter_body_lines, run_batch, start_batch_pool, stop_batch_pool
+
+
+def job_lines(count):
+    lines = []
+    for i in range(count):
+        edges = [[1, 2], [2, 3]] if i % 2 == 0 else [[1, 2]]
+        lines.append(json.dumps({'id': f'job{i}', 'num_vertices': 3, 'edges': edges}).encode() + b'\n')
+    return lines
+
+
+@mock.patch('logics.batch_utils.save_algorithm_record')
+class TestBatchUtils(unittest.TestCase):
+    """
+    Unit tests for streaming NDJSON batch runs.
+    """
+
+    def tearDown(self):
+        stop_batch_pool()
+
+    def test_iterBodyLines_ContentLength_StopsAtBodyEnd(self, save):
+        """
+        Test that only Content-Length bytes are read and blank lines are skipped.
+        """
+        stream = io.BytesIO(b'{"a": 1}\n\n{"b": 2}\nNEXT REQUEST')
+        self.assertEqual(list(iter_body_lines(stream, 19)), [b'{"a": 1}\n', b'{"b": 2}\n'])
+        self.assertEqual(stream.read(), b'NEXT REQUEST')
+
+    def test_iterBodyLines_OversizedLine_YieldsNoneAndContinues(self, save):
+        """
+        Test that an oversized line is skipped as a whole and the next line still read.
+        """
+        body = b'x' * 50 + b'\n{"ok": true}\n'
+        self.assertEqual(list(iter_body_lines(io.BytesIO(body), len(body), max_line=20)), [None, b'{"ok": true}\n'])
+
+    def test_runBatch_Inline_OneResultPerJobInOrder(self, save):
+        """
+        Test that every job, valid or not, gets one result line with its index and id.
+        """
+        lines = job_lines(4)
+        lines.insert(2, b'not json\n')
+        results = [json.loads(line) for line in run_batch('bfs', lines)]
+
+        self.assertEqual([result['index'] for result in results], [0, 1, 2, 3, 4])
+        self.assertEqual([result['status'] for result in results], [200, 422, 400, 200, 422])
+        self.assertEqual(results[0]['id'], 'job0')
+        self.assertEqual(results[0]['tree_edges'], [[1, 2], [2, 3]])
+        # Runs that reached the algorithm are saved to the history, the broken line is not
+        self.assertEqual(save.call_count, 4)
+
+    def test_runBatch_Lazy_ReadsJobsAsResultsAreConsumed(self, save):
+        """
+        Test that the batch is streamed: a result is produced before later jobs are read.
+        """
+        read = []
+
+        def lines():
+            for line in job_lines(3):
+                read.append(line)
+                yield line
+
+        results = run_batch('coloring', lines())
+        next(results)
+        self.assertEqual(len(read), 1)
+
+    def test_runBatch_Pool_SameResultsAsInline(self, save):
+        """
+        Test that running the jobs in worker processes gives the same results, in any order.
+        """
+        expected = sorted((json.loads(line) for line in run_batch('dfs', job_lines(20))), key=lambda r: r['index'])
+        start_batch_pool(2)
+        pooled = sorted((json.loads(line) for line in run_batch('dfs', job_lines(20))), key=lambda r: r['index'])
+
+        strip = lambda result: {key: value for key, value in result.items() if key != 'duration_ms'}
+        self.assertEqual([strip(r) for r in pooled], [strip(r) for r in expected])
+        self.assertEqual(save.call_count, 40)
+
+    def test_runBatch_BrokenPool_FailingJobBecomesErrorLine(self, save):
+        """
+        Test that after the pool broke, a job that raises gives an error line and the batch goes on.
+        """
+        pool = mock.Mock()
+        pool.submit.side_effect = BrokenProcessPool()
+        execute = batch_utils.execute_api_job
+
+        def failing_job(algorithm, job):
+            if job['id'] == 'job1':
+                raise RuntimeError('boom')
+            return execute(algorithm, job)
+
+        with mock.patch.object(batch_utils, '_pool', pool), mock.patch.object(batch_utils, '_pool_workers', 1), \
+                mock.patch.object(batch_utils, 'execute_api_job', side_effect=failing_job):
+            results = [json.loads(line) for line in run_batch('bfs', job_lines(3))]
+
+        self.assertEqual([r['status'] for r in results], [200, 500, 200])
+        self.assertEqual(results[1]['error'], 'Internal error: boom')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,8 @@
+import time
+import random
 import unittest
-from methods.bfs_spanning_tree import bfs_spanning_tree
+from methods.bfs_spanning_tree import bfs_spanning_tree, bfs_tree
+from methods.graph import Graph
 
 
 class TestBFS(unittest.TestCase):
@@ -109,6 +112,65 @@ class TestBFS(unittest.TestCase):
         self.assertEqual(len(edges1), 3)
         self.assertEqual(len(edges2), 3)
 
+    def test_bfsSpanningTree_RandomGraphs_SameAsMatrixScan(self):
+        # Сравнение с прежней реализацией (очередь-список и просмотр строки матрицы) на случайных графах.
+        def reference(n, adj, start):
+            visited, queue, order, edges = [False] * n, [start], [start], []
+            visited[start] = True
+            while queue:
+                current = queue.pop(0)
+                for neighbor in range(n):
+                    if adj[current][neighbor] == 1 and not visited[neighbor]:
+                        visited[neighbor] = True
+                        queue.append(neighbor)
+                        order.append(neighbor)
+                        edges.append((current, neighbor))
+            return order, edges
+
+        rng = random.Random(7)
+        for _ in range(50):
+            n = rng.randint(1, 12)
+            adj = [[0] * n for _ in range(n)]
+            for i in range(n):
+                for j in range(i + 1, n):
+                    if rng.random() < 0.4:
+                        adj[i][j] = adj[j][i] = 1
+            start = rng.randrange(n)
+            order, edges = reference(n, adj, start)
+            result, tree_vertices, tree_edges = bfs_spanning_tree(n, adj, start)
+            if len(order) == n:
+                self.assertEqual((tree_vertices, tree_edges), (order, edges))
+            else:
+                self.assertIsInstance(result, str)
+
+    def test_bfsTree_DisconnectedGraph_ReturnsParentArray(self):
+        # Проверка массива родителей: у стартовой вершины - она сама, у недостижимых - -1.
+        adjacency = Graph.from_matrix([
+            [0, 1, 0, 0],
+            [1, 0, 0, 0],
+            [0, 0, 0, 1],
+            [0, 0, 1, 0]
+        ])
+        parent, order, edges = bfs_tree(adjacency, 1)
+        self.assertEqual(parent, [1, 1, -1, -1])
+        self.assertEqual(order, [1, 0])
+        self.assertEqual(edges, [(1, 0)])
+
+    def test_bfsTree_LargeSparseGraph_LinearTime(self):
+        # Проверка на разреженном графе из 200 000 вершин без построения матрицы n x n.
+        n = 200_000
+        rng = random.Random(1)
+        edges = [(v, rng.randrange(v)) for v in range(1, n)] + [(0, 1), (1, 0), (5, 5)]
+        adjacency = Graph.from_edges(n, edges)
+        self.assertEqual(len(adjacency.indices), 2 * (n - 1))
+
+        started = time.perf_counter()
+        parent, order, tree_edges = bfs_tree(adjacency, 0)
+        self.assertLess(time.perf_counter() - started, 5)
+        self.assertEqual(len(order), n)
+        self.assertEqual(len(tree_edges), n - 1)
+        self.assertTrue(all(parent[v] == u for u, v in tree_edges))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,57 @@
+import random
+import unittest
+
+from methods.graph import Graph
+from methods.bfs_spanning_tree import bfs_tree, bfs_spanning_tree
+from methods.graph_coloring_algorithm import greedy_graph_coloring
+from methods.bitset_graph import (BitsetGraph, bitset_bfs_tree, bitset_bfs_spanning_tree,
+                                  bitset_greedy_coloring, random_dense_matrix, benchmark)
+
+
+class TestBitsetGraph(unittest.TestCase):
+    """
+    Unit tests for the bitset (bit mask) graph engine.
+    """
+
+    def test_bitsetGraph_FromMatrixAndFromGraph_SameMasks(self):
+        """
+        Test that both constructors set bit v of row u for every edge u-v.
+        """
+        matrix = [[0, 1, 1], [1, 0, 0], [1, 0, 0]]
+        self.assertEqual(BitsetGraph.from_matrix(matrix).rows, [0b110, 0b001, 0b001])
+        self.assertEqual(BitsetGraph.from_graph(Graph.from_matrix(matrix)).rows, [0b110, 0b001, 0b001])
+        self.assertEqual(BitsetGraph.from_matrix(matrix)[0], [1, 2])
+
+    def test_bitsetEngines_RandomGraphs_SameResultsAsListEngines(self):
+        """
+        Test that BFS and greedy coloring give exactly the results of the list-based code.
+        """
+        rng = random.Random(3)
+        for seed in range(40):
+            n = rng.randint(1, 40)
+            matrix = random_dense_matrix(n, rng.choice([0.05, 0.2, 0.6]), seed)
+            graph = Graph.from_matrix(matrix)
+            start = rng.randrange(n)
+            self.assertEqual(bitset_bfs_tree(matrix, start), bfs_tree(graph, start))
+            self.assertEqual(bitset_bfs_spanning_tree(n, graph, start), bfs_spanning_tree(n, graph, start))
+            self.assertEqual(bitset_greedy_coloring(graph)[:2], greedy_graph_coloring(graph)[:2])
+
+    def test_bitsetBfsTree_DisconnectedGraph_UnreachedHaveNoParent(self):
+        """
+        Test that vertices outside the start component keep parent -1.
+        """
+        matrix = [[0, 1, 0, 0], [1, 0, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]]
+        self.assertEqual(bitset_bfs_tree(matrix, 1), ([1, 1, -1, -1], [1, 0], [(1, 0)]))
+        self.assertIsInstance(bitset_bfs_spanning_tree(4, matrix, 1)[0], str)
+
+    def test_benchmark_SmallDenseGraphs_ReportsTimes(self):
+        """
+        Test that the benchmark runs both engines and reports a row per size.
+        """
+        rows = benchmark([30, 60], density=0.5)
+        self.assertEqual([row['vertices'] for row in rows], [30, 60])
+        self.assertTrue(all(row['bfs_bitset'] >= 0 for row in rows))
+
+
+if __name__ == '__main__':
+    unittest.main()
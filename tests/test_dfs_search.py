@@ -3,7 +3,7 @@ import unittest
 import networkx as nx
 import random
 
-from methods.dfs_spanning_tree import create_spanning_tree, generate_random_matrix, save_graph_image, validate_input
+from methods.dfs_spanning_tree import create_spanning_tree, dfs_tree, generate_random_matrix, save_graph_image, validate_input
 
 class TestGraphAlgorithms(unittest.TestCase):
     """
@@ -51,6 +51,64 @@ class TestGraphAlgorithms(unittest.TestCase):
         self.assertIsNone(vertices_list)
 
 
+    def test_createSpanningTree_RandomGraphs_SameAsNetworkx(self):
+        """
+        Test that the single-pass DFS gives the tree, visit order and tree matrix networkx gives.
+        """
+        rng = random.Random(11)
+        for _ in range(50):
+            n = rng.randint(1, 12)
+            adj_matrix = [[0] * n for _ in range(n)]
+            for i in range(n):
+                for j in range(i + 1, n):
+                    if rng.random() < 0.35:
+                        adj_matrix[i][j] = adj_matrix[j][i] = 1
+            start = rng.randrange(n)
+            G = nx.Graph()
+            G.add_nodes_from(range(n))
+            G.add_edges_from((i, j) for i in range(n) for j in range(i + 1, n) if adj_matrix[i][j])
+
+            order, edges = dfs_tree([[j for j in range(n) if adj_matrix[i][j]] for i in range(n)], start)
+            self.assertEqual(edges, list(nx.dfs_edges(G, source=start)))
+            self.assertEqual(order, list(nx.dfs_preorder_nodes(G, source=start)))
+
+            G_full, T_tree, tree_matrix, vertices_list, error = create_spanning_tree(adj_matrix, start + 1)
+            if nx.is_connected(G):
+                self.assertIsNone(error)
+                self.assertEqual(sorted(G_full.edges), sorted(G.edges))
+                self.assertEqual(sorted(map(sorted, T_tree.edges)), sorted(map(sorted, edges)))
+                self.assertEqual(tree_matrix, nx.to_numpy_array(T_tree, dtype=int).tolist())
+                self.assertEqual(vertices_list, [v + 1 for v in order])
+            else:
+                self.assertEqual(error, "Graph is not connected")
+
+    def test_createSpanningTree_AsymmetricMatrix_UsesUpperTriangle(self):
+        """
+        Test that an asymmetric matrix is read as the undirected graph of its upper triangle,
+        with every tree edge in the full graph.
+        """
+        G_full, T_tree, tree_matrix, vertices_list, error = create_spanning_tree([[0, 1, 0], [0, 0, 1], [0, 0, 0]], 3)
+        self.assertIsNone(error)
+        self.assertEqual(vertices_list, [3, 2, 1])
+        self.assertEqual(tree_matrix, [[0, 1, 0], [1, 0, 1], [0, 1, 0]])
+
+        G_full, T_tree, tree_matrix, vertices_list, error = create_spanning_tree([[0, 0, 0], [1, 0, 0], [0, 1, 0]], 3)
+        self.assertEqual(error, "Graph is not connected")
+
+        G_full, T_tree, tree_matrix, vertices_list, error = create_spanning_tree([[0, 1, 1], [0, 0, 0], [1, 1, 0]], 2)
+        self.assertIsNone(error)
+        self.assertTrue(all(G_full.has_edge(u, v) for u, v in T_tree.edges))
+
+    def test_dfsTree_LongPath_NoRecursionLimit(self):
+        """
+        Test that the explicit stack handles a path far deeper than the recursion limit.
+        """
+        n = 20000
+        adjacency = [[v for v in (u - 1, u + 1) if 0 <= v < n] for u in range(n)]
+        order, edges = dfs_tree(adjacency, 0)
+        self.assertEqual(order, list(range(n)))
+        self.assertEqual(edges[-1], (n - 2, n - 1))
+
     def test_generateRandomMatrix_3Vertices_ReturnsValidAdjacencyMatrix(self):
         """
         Test that a 3x3 random adjacency matrix contains only 0 or 1 values
@@ -0,0 +1,73 @@
+import pickle
+import unittest
+
+from methods.graph import Graph, as_graph
+
+
+class TestGraph(unittest.TestCase):
+    """
+    Unit tests for the compact (CSR) graph shared by the algorithms.
+    """
+
+    def setUp(self):
+        self.matrix = [
+            [0, 1, 1, 0],
+            [1, 0, 0, 1],
+            [1, 0, 0, 1],
+            [0, 1, 1, 0]
+        ]
+        self.weights = [
+            [0, 4, 2, 0],
+            [4, 0, 0, 7],
+            [2, 0, 0, 1],
+            [0, 7, 1, 0]
+        ]
+
+    def test_fromEdges_SameGraphAsFromMatrix(self):
+        """
+        Test that an edge list (in any order, with duplicates and self-loops) gives the graph of the matrix.
+        """
+        from_edges = Graph.from_edges(4, [(3, 2), (0, 1), (1, 3), (2, 0), (1, 0), (2, 2)])
+        self.assertEqual(from_edges, Graph.from_matrix(self.matrix))
+        self.assertEqual(list(from_edges[1]), [0, 3])
+        self.assertEqual([from_edges.degree(v) for v in range(4)], [2, 2, 2, 2])
+
+    def test_edges_EachEdgeOnceInUpperTriangleOrder(self):
+        """
+        Test that edges are reported once, ordered like an upper-triangle scan of the matrix.
+        """
+        graph = Graph.from_matrix(self.matrix, self.weights)
+        self.assertEqual(list(graph.edges()), [(0, 1), (0, 2), (1, 3), (2, 3)])
+        self.assertEqual(graph.edge_list(), [[0, 1, 4], [0, 2, 2], [1, 3, 7], [2, 3, 1]])
+
+    def test_weight_ExistingAndMissingEdges(self):
+        """
+        Test edge weight lookup, including the default weight 1 of an unweighted graph.
+        """
+        graph = Graph.from_matrix(self.matrix, self.weights)
+        self.assertEqual(graph.weight(3, 1), 7)
+        self.assertIsNone(graph.weight(0, 3))
+        self.assertEqual(Graph.from_matrix(self.matrix).weight(0, 1), 1)
+        self.assertEqual(Graph.from_edges(2, [(0, 1, 2.5)], weighted=True).weight(1, 0), 2.5)
+
+    def test_toMatrix_RoundTrip(self):
+        """
+        Test that the dense matrices are rebuilt exactly.
+        """
+        graph = Graph.from_matrix(self.matrix, self.weights)
+        self.assertEqual(graph.to_matrix(), self.matrix)
+        self.assertEqual(graph.to_weight_matrix(), self.weights)
+        self.assertIsNone(Graph.from_matrix(self.matrix).to_weight_matrix())
+
+    def test_asGraph_PicklableAndPassedThrough(self):
+        """
+        Test that a Graph survives pickling (render and batch pools) and that as_graph does not copy it.
+        """
+        graph = Graph.from_matrix(self.matrix, self.weights)
+        self.assertIs(as_graph(graph), graph)
+        self.assertEqual(pickle.loads(pickle.dumps(graph)), graph)
+        self.assertEqual(as_graph(self.matrix), Graph.from_matrix(self.matrix))
+
+
+if __name__ == '__main__':
+    unittest.main()
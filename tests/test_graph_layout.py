@@ -0,0 +1,106 @@
+import math
+import unittest
+from unittest import mock
+
+from methods import graph_layout
+from methods.graph_layout import graph_layout as layout, tree_layout, spanning_tree_layout
+
+
+class TestGraphLayout(unittest.TestCase):
+    """
+    Unit tests for the closed-form layouts, the topology-keyed layout cache and the tree layout.
+    """
+
+    def setUp(self):
+        graph_layout._canonical_layout.cache_clear()
+
+    def test_graphLayout_Circular_VerticesOnUnitCircleFromTop(self):
+        """
+        Test that the circular layout starts at the top and keeps every vertex on the circle.
+        """
+        pos = layout([1, 2, 3, 4], [(1, 2)], mode='circular')
+        self.assertAlmostEqual(pos[1][0], 0.0)
+        self.assertAlmostEqual(pos[1][1], 1.0)
+        self.assertAlmostEqual(pos[2][0], 1.0)
+        for x, y in pos.values():
+            self.assertAlmostEqual(math.hypot(x, y), 1.0)
+
+    def test_graphLayout_Shell_BestConnectedVertexInCenter(self):
+        """
+        Test that the shell layout puts the highest-degree vertex inside the outer ring.
+        """
+        pos = layout([0, 1, 2, 3], [(0, 2), (1, 2), (2, 3)], mode='shell')
+        self.assertEqual(pos[2], (0.0, 0.0))
+        for node in (0, 1, 3):
+            self.assertAlmostEqual(math.hypot(*pos[node]), 1.0)
+
+    def test_graphLayout_SameTopologyDifferentLabels_SpringComputedOnce(self):
+        """
+        Test that a 0-based and a 1-based page drawing the same graph share one spring layout.
+        """
+        with mock.patch('methods.graph_layout.nx.spring_layout', wraps=graph_layout.nx.spring_layout) as spring:
+            zero_based = layout(range(3), [(0, 1), (1, 2)], mode='spring')
+            one_based = layout(range(1, 4), [(3, 2), (2, 1)], mode='spring')
+        spring.assert_called_once()
+        self.assertEqual(list(zero_based.values()), list(one_based.values()))
+
+    def test_graphLayout_LargeGraph_FallsBackToSpring(self):
+        """
+        Test that closed-form layouts are only used up to CLOSED_FORM_MAX_NODES vertices.
+        """
+        n = graph_layout.CLOSED_FORM_MAX_NODES + 1
+        edges = [(i, i + 1) for i in range(n - 1)]
+        with mock.patch('methods.graph_layout.nx.spring_layout', wraps=graph_layout.nx.spring_layout) as spring:
+            layout(range(n), edges, mode='circular')
+            layout(range(n), edges, mode='circular')
+        spring.assert_called_once()
+
+    def test_graphLayout_CacheBounded_EvictsOldLayouts(self):
+        """
+        Test that the layout cache is an LRU of bounded size.
+        """
+        info = graph_layout._canonical_layout.cache_info()
+        self.assertEqual(info.maxsize, graph_layout.LAYOUT_CACHE_SIZE)
+        layout(range(4), [(0, 1)], mode='shell')
+        layout(range(4), [(0, 1)], mode='shell')
+        self.assertEqual(graph_layout._canonical_layout.cache_info().hits, 1)
+
+    def test_treeLayout_Tree_LayersByDepthAndCentersParents(self):
+        """
+        Test that rows follow the depth from the root and a parent sits above its children.
+        """
+        pos = tree_layout(range(5), [(0, 1), (0, 2), (1, 3), (1, 4)], root=0)
+        self.assertEqual(pos[0][1], 1.0)
+        self.assertEqual(pos[1][1], pos[2][1])
+        self.assertEqual(pos[3][1], -1.0)
+        self.assertEqual([pos[3][0], pos[4][0], pos[2][0]], [-1.0, 0.0, 1.0])
+        self.assertAlmostEqual(pos[1][0], (pos[3][0] + pos[4][0]) / 2)
+        self.assertAlmostEqual(pos[0][0], (pos[1][0] + pos[2][0]) / 2)
+
+    def test_treeLayout_DeepTree_NoRecursionLimit(self):
+        """
+        Test that a path of thousands of vertices is laid out iteratively.
+        """
+        n = 5000
+        pos = tree_layout(range(n), [(i, i + 1) for i in range(n - 1)], root=0)
+        self.assertEqual(len(pos), n)
+        self.assertEqual(pos[n - 1][1], -1.0)
+
+    def test_treeLayout_UnreachedVertex_PlacedInExtraRow(self):
+        """
+        Test that vertices outside the tree go to a row below the tree.
+        """
+        pos = tree_layout([1, 2, 3], [(1, 2)], root=1)
+        self.assertEqual(pos[3][1], -1.0)
+        self.assertGreater(pos[2][1], pos[3][1])
+
+    def test_spanningTreeLayout_NoTree_UsesGraphLayout(self):
+        """
+        Test the fallback to the regular layout when no tree was built, and the default root.
+        """
+        self.assertEqual(spanning_tree_layout(range(3), [(0, 1)]), layout(range(3), [(0, 1)]))
+        self.assertEqual(spanning_tree_layout(range(3), [], [(2, 0), (0, 1)])[2][1], 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
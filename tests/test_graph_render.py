@@ -0,0 +1,54 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from methods.graph_render import render_png, colormap_colors
+from methods.bfs_spanning_tree import _render_bfs_png
+from methods.graph_coloring_algorithm import _render_colored_png
+from methods.graph import Graph
+
+
+class TestGraphRender(unittest.TestCase):
+    """
+    Unit tests for the object-oriented (pyplot-free) PNG renderer.
+    """
+
+    def make_jobs(self):
+        adjacency = Graph.from_matrix([[0, 1, 1, 0], [1, 0, 1, 1], [1, 1, 0, 1], [0, 1, 1, 0]])
+        return [
+            lambda: _render_bfs_png(adjacency, 4, [(0, 1), (0, 2), (1, 3)]),
+            lambda: _render_bfs_png(adjacency, 4, [(3, 1), (3, 2), (1, 0)]),
+            lambda: _render_colored_png(adjacency, {0: 1, 1: 2, 2: 3, 3: 1}, 3),
+            lambda: render_png({0: (0, 0), 1: (1, 0)}, [(0, 1)], title='Edge', axis=False),
+        ]
+
+    def test_renderPng_Graph_ReturnsPngBytes(self):
+        """
+        Test that the renderer produces a PNG image.
+        """
+        data = render_png({0: (0, 0), 1: (1, 1), 2: (0, 1)}, [(0, 1), (1, 2)], [(0, 1)], title='Tree')
+        self.assertTrue(data.startswith(b'\x89PNG\r\n\x1a\n'))
+
+    def test_renderPng_ConcurrentThreads_ByteIdenticalToSerial(self):
+        """
+        Test that rendering from many threads at once gives exactly the serial results.
+        """
+        jobs = self.make_jobs()
+        serial = [job() for job in jobs]
+        self.assertEqual(len(set(serial)), len(jobs))
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = [(i, pool.submit(jobs[i])) for _ in range(8) for i in range(len(jobs))]
+            for i, future in futures:
+                self.assertEqual(future.result(), serial[i])
+
+    def test_colormapColors_Count_MatchesRequestedSize(self):
+        """
+        Test the palettes used for small and large numbers of colors.
+        """
+        self.assertEqual(len(colormap_colors(3)), 3)
+        self.assertEqual(len(set(colormap_colors(15))), 15)
+        self.assertEqual(len(set(colormap_colors(30))), 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
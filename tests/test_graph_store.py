@@ -0,0 +1,155 @@
+import os
+import json
+import tempfile
+import unittest
+
+from logics import json_utils
+from logics.graph_store import JsonlGraphStore, extract_graph, graph_hash
+from logics.history_store import SQLiteHistoryStore
+from logics.record_codec import encode_matrix
+
+
+class TestGraphStore(unittest.TestCase):
+    """
+    Unit tests for content-hash deduplication of input graphs.
+    """
+
+    ADJ = [
+        [0, 1, 1],
+        [1, 0, 0],
+        [1, 0, 0]
+    ]
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'graphs.jsonl')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_graphHash_DenseAndEncodedMatrix_ProduceSameHash(self):
+        """
+        Test that the hash depends on the graph, not on how its matrix was stored.
+        """
+        dense = extract_graph({'adjacency_matrix': self.ADJ, 'start_vertex': 1})
+        encoded = extract_graph({'adjacency_matrix': encode_matrix(self.ADJ), 'start_vertex': 3})
+        self.assertEqual(graph_hash(dense), graph_hash(encoded))
+        self.assertIsNone(extract_graph({'num_vertices': 3}))
+
+    def test_intern_RepeatedGraph_StoredOnce(self):
+        """
+        Test that a resubmitted graph adds nothing to the file.
+        """
+        store = JsonlGraphStore(self.path)
+        graph = extract_graph({'adjacency_matrix': self.ADJ})
+        first = store.intern(graph)
+        size = os.path.getsize(self.path)
+        second = store.intern(graph)
+        self.assertEqual(os.path.getsize(self.path), size)
+        other = store.intern(extract_graph({'adjacency_matrix': [[0, 1], [1, 0]]}))
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+
+        with open(self.path) as f:
+            entries = [json.loads(line) for line in f]
+        self.assertEqual([entry['hash'] for entry in entries], [first, other])
+        self.assertEqual((store.hits(first), store.hits(other)), (2, 1))
+
+        # A fresh store rebuilds the index from the file and finds the persisted counters
+        reopened = JsonlGraphStore(self.path)
+        self.assertEqual(reopened.get(first), graph)
+        self.assertEqual(reopened.hits(first), 2)
+
+    def test_get_GraphStoredByOtherWorker_FoundAfterFirstMiss(self):
+        """
+        Test that a store reads the lines other processes appended when it misses a hash.
+        """
+        graph = extract_graph({'adjacency_matrix': self.ADJ})
+        other = extract_graph({'adjacency_matrix': [[0, 1], [1, 0]]})
+        worker_a, worker_b = JsonlGraphStore(self.path), JsonlGraphStore(self.path)
+        self.assertIsNone(worker_b.get(graph_hash(graph)))
+
+        key = worker_a.intern(graph)
+        self.assertEqual(worker_b.get(key), graph)
+        # Neither store writes a graph the other one already wrote
+        worker_b.intern(graph)
+        worker_a.intern(other)
+        worker_b.intern(other)
+        with open(self.path) as f:
+            self.assertEqual(len(f.readlines()), 2)
+        self.assertEqual(worker_a.hits(key), 2)
+        self.assertEqual(worker_b.hits(graph_hash(other)), 2)
+
+    def test_hits_SameSubmissions_SameCountsAsSqliteStore(self):
+        """
+        Test that both graph stores count every intern() of a graph.
+        """
+        jsonl = JsonlGraphStore(self.path)
+        sqlite = SQLiteHistoryStore(os.path.join(self.tmp.name, 'history.db'))
+        graphs = [extract_graph({'adjacency_matrix': matrix})
+                  for matrix in (self.ADJ, [[0, 1], [1, 0]], self.ADJ, self.ADJ)]
+        for graph in graphs:
+            jsonl.intern(graph)
+            sqlite.intern(graph)
+        for graph in graphs[:2]:
+            key = graph_hash(graph)
+            self.assertEqual(jsonl.hits(key), sqlite.hits(key))
+        self.assertEqual(jsonl.hits(graph_hash(graphs[0])), 3)
+
+    def test_get_LegacyAndDamagedLines_GraphReadFromItsOffset(self):
+        """
+        Test old-style lines (graph first, one line per hit) and a torn line.
+        """
+        graph = extract_graph({'adjacency_matrix': self.ADJ})
+        key = graph_hash(graph)
+        with open(self.path, 'w') as f:
+            f.write('{"hash":"%s","gr' % ('0' * 32) + '\n')
+            f.write(json.dumps({'graph': graph, 'hash': key}, sort_keys=True) + '\n')
+            f.write(json.dumps({'hash': key}) + '\n')
+
+        store = JsonlGraphStore(self.path)
+        self.assertEqual(store.get(key), graph)
+        self.assertIsNone(store.get('0' * 32))
+        # Counters of the old format: one line per submission
+        self.assertEqual(store.hits(key), 2)
+
+        other = extract_graph({'adjacency_matrix': [[0, 1], [1, 0]]})
+        other_key = store.intern(other)
+        store.intern(graph)
+        reopened = JsonlGraphStore(self.path)
+        self.assertEqual(reopened.get(other_key), other)
+        self.assertEqual((reopened.hits(key), reopened.hits(other_key)), (3, 1))
+
+    def test_saveAlgorithmRecord_JsonlMode_RecordsReferenceGraphByHash(self):
+        """
+        Test that run records keep only the hash and are expanded when read back.
+        """
+        saved = (json_utils.LOG_MODE, json_utils.LOG_DIR, json_utils._graph_store,
+                 json_utils._record_writer, json_utils._history_stats)
+        json_utils.LOG_MODE = 'jsonl'
+        json_utils.LOG_DIR = os.path.join(self.tmp.name, 'runs')
+        json_utils._graph_store = None
+        json_utils._record_writer = None
+        json_utils._history_stats = None
+        try:
+            for start in (1, 2, 3):
+                json_utils.save_algorithm_record(
+                    'bfs', {'num_vertices': 3, 'adjacency_matrix': self.ADJ, 'start_vertex': start}, None, None)
+
+            with open(os.path.join(json_utils.LOG_DIR, 'bfs.jsonl')) as f:
+                raw = [json.loads(line) for line in f]
+            self.assertTrue(all('adjacency_matrix' not in r['input_data'] for r in raw))
+            key = raw[0]['input_data']['graph_hash']
+
+            records = json_utils.load_algorithm_records()['bfs']
+            self.assertEqual([r['input_data']['start_vertex'] for r in records], [1, 2, 3])
+            self.assertTrue(all(r['input_data']['adjacency_matrix'] == self.ADJ for r in records))
+            self.assertEqual(json_utils.load_graph(key)['hits'], 3)
+        finally:
+            (json_utils.LOG_MODE, json_utils.LOG_DIR, json_utils._graph_store,
+             json_utils._record_writer, json_utils._history_stats) = saved
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+import os
+import tempfile
+import threading
+import unittest
+from array import array
+
+from logics import run_log
+from logics.history_browser import browse_segments, encode_cursor, SegmentIndex
+
+
+class TestHistoryBrowser(unittest.TestCase):
+    """
+    Unit tests for newest-first, cursor-based paging over the run log.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log_dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_record(self, i):
+        return {'input_data': {'num_vertices': 3}, 'result_matrix': None,
+                'timestamp': f'2025-05-14T10:{i // 60:02d}:{i % 60:02d}', 'error_message': None, 'i': i}
+
+    def read_all_pages(self, algorithm_key, limit):
+        seen, cursor = [], None
+        while True:
+            records, cursor = browse_segments(algorithm_key, self.log_dir, cursor, limit)
+            seen.extend(r['i'] for r in records)
+            if cursor is None:
+                return seen
+
+    def test_browseSegments_RotatedSegments_ReturnsAllRecordsNewestFirst(self):
+        """
+        Test that paging walks across rotated segments without gaps or repeats.
+        """
+        for i in range(50):
+            run_log.append_records('bfs', [self.make_record(i)], self.log_dir, max_segment_bytes=600)
+        self.assertGreater(len(run_log.list_segments('bfs', self.log_dir)[0][1]), 2)
+
+        self.assertEqual(self.read_all_pages('bfs', 7), list(range(49, -1, -1)))
+
+    def test_browseSegments_PerWorkerSegments_MergedByTimestamp(self):
+        """
+        Test that records of several workers are interleaved by time.
+        """
+        for i in range(20):
+            run_log.append_records('dfs', [self.make_record(i)], self.log_dir, worker_id=f'w{i % 3}')
+
+        self.assertEqual(self.read_all_pages('dfs', 4), list(range(19, -1, -1)))
+
+    def test_browseSegments_AppendAndRotateBetweenPages_CursorStaysValid(self):
+        """
+        Test that new records and a rotation after page 1 do not disturb the following pages.
+        """
+        for i in range(10):
+            run_log.append_records('beam', [self.make_record(i)], self.log_dir)
+        first, cursor = browse_segments('beam', self.log_dir, None, 4)
+        self.assertEqual([r['i'] for r in first], [9, 8, 7, 6])
+
+        # Force a rotation of the active segment, then keep writing
+        for i in range(10, 15):
+            run_log.append_records('beam', [self.make_record(i)], self.log_dir, max_segment_bytes=1)
+
+        rest = []
+        while cursor:
+            records, cursor = browse_segments('beam', self.log_dir, cursor, 4)
+            rest.extend(r['i'] for r in records)
+        self.assertEqual(rest, [5, 4, 3, 2, 1, 0])
+
+    def test_segmentIndex_AppendedLines_IndexExtendedIncrementally(self):
+        """
+        Test that the offset index only scans new lines and ignores an unfinished last line.
+        """
+        run_log.append_records('coloring', [self.make_record(0), self.make_record(1)], self.log_dir)
+        path = run_log.segment_path('coloring', self.log_dir)
+        index = SegmentIndex(path)
+        self.assertEqual(index.refresh(), 2)
+
+        with open(path, 'a') as f:
+            f.write('{"partial": ')
+        self.assertEqual(index.refresh(), 2)
+
+        with open(path, 'a') as f:
+            f.write('true}\n')
+        self.assertEqual(index.refresh(), 3)
+        self.assertEqual(index.read(2), {'partial': True})
+        self.assertEqual(index.read(0)['i'], 0)
+        index.close()
+        self.assertEqual(os.path.getsize(path + '.idx'), 3 * 8)
+
+    def test_segmentIndex_ConcurrentFirstRefresh_EachLineIndexedOnce(self):
+        """
+        Test that requests opening the same unindexed segment at once do not duplicate offsets.
+        """
+        run_log.append_records('bfs', [self.make_record(i) for i in range(20000)], self.log_dir)
+        path = run_log.segment_path('bfs', self.log_dir)
+        barrier = threading.Barrier(8)
+        counts = []
+
+        def first_page():
+            barrier.wait()
+            index = SegmentIndex(path)
+            counts.append(index.refresh())
+            index.close()
+
+        threads = [threading.Thread(target=first_page) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(counts, [20000] * 8)
+        self.assertEqual(os.path.getsize(path + '.idx'), 20000 * 8)
+        self.assertEqual(self.read_all_pages('bfs', 5000), list(range(19999, -1, -1)))
+
+    def test_segmentIndex_DamagedIndex_Rebuilt(self):
+        """
+        Test that an index with repeated offsets or a torn entry is rebuilt from the segment.
+        """
+        run_log.append_records('dfs', [self.make_record(i) for i in range(10)], self.log_dir)
+        path = run_log.segment_path('dfs', self.log_dir)
+        index = SegmentIndex(path)
+        index.refresh()
+        with open(path + '.idx', 'rb') as f:
+            offsets = f.read()
+
+        for damaged in (offsets * 3, offsets + offsets[:3]):
+            with open(path + '.idx', 'wb') as f:
+                f.write(damaged)
+            index = SegmentIndex(path)
+            self.assertEqual(index.refresh(), 10)
+            self.assertEqual([index.read(k)['i'] for k in range(10)], list(range(10)))
+            index.close()
+            with open(path + '.idx', 'rb') as f:
+                self.assertEqual(array('Q', f.read()), array('Q', offsets))
+
+    def test_browseSegments_TamperedCursor_RaisesValueError(self):
+        """
+        Test that positions outside the segments are rejected instead of failing on read.
+        """
+        for i in range(5):
+            run_log.append_records('bfs', [self.make_record(i)], self.log_dir)
+        for positions in ({'': [1, 99]}, {'': [1, -1]}, {'': [7, 0]}):
+            with self.assertRaises(ValueError):
+                browse_segments('bfs', self.log_dir, encode_cursor(positions))
+        records, _ = browse_segments('bfs', self.log_dir, encode_cursor({'': [1, 5]}), 2)
+        self.assertEqual([r['i'] for r in records], [4, 3])
+
+    def test_browseSegments_InvalidCursorOrEmptyLog_HandledCleanly(self):
+        """
+        Test an empty log and a malformed cursor.
+        """
+        self.assertEqual(browse_segments('bfs', self.log_dir), ([], None))
+        with self.assertRaises(ValueError):
+            browse_segments('bfs', self.log_dir, cursor='not-a-cursor')
+
+
+if __name__ == '__main__':
+    unittest.main()
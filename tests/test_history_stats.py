@@ -0,0 +1,177 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from logics import json_utils, run_log
+from logics.history_stats import HistoryStats
+
+
+class TestHistoryStats(unittest.TestCase):
+    """
+    Unit tests for the incrementally maintained history statistics.
+    """
+
+    def make_record(self, n, duration_ms, error=None):
+        return {'input_data': {'num_vertices': n}, 'result_matrix': None,
+                'timestamp': '2025-05-14T10:00:00', 'error_message': error, 'duration_ms': duration_ms}
+
+    def test_snapshot_MixedRuns_ReturnsCountsRatesAndAverages(self):
+        """
+        Test runs, error rate and average vertex count per algorithm and in total.
+        """
+        stats = HistoryStats()
+        stats.update('bfs', self.make_record(3, 10))
+        stats.update('bfs', self.make_record('5', 20, error='disconnected'))
+        stats.update('dfs', self.make_record('abc', None, error='bad input'))
+
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot['algorithms']['bfs']['runs'], 2)
+        self.assertEqual(snapshot['algorithms']['bfs']['error_rate'], 0.5)
+        self.assertEqual(snapshot['algorithms']['bfs']['avg_vertices'], 4)
+        self.assertIsNone(snapshot['algorithms']['dfs']['avg_vertices'])
+        self.assertEqual(snapshot['total']['runs'], 3)
+        self.assertEqual(snapshot['total']['errors'], 2)
+
+    def test_snapshot_ManyRuntimes_P95WithinBucketError(self):
+        """
+        Test that the p95 estimate from the histogram is close to the exact value.
+        """
+        stats = HistoryStats()
+        for ms in range(1, 1001):
+            stats.update('beam', self.make_record(4, ms))
+
+        p95 = stats.snapshot()['algorithms']['beam']['p95_runtime_ms']
+        self.assertGreaterEqual(p95, 950)
+        self.assertLessEqual(p95, 950 * 1.1)
+
+    def test_saveLoadMerge_TwoWorkers_CountersAdd(self):
+        """
+        Test persistence and merging of the counters of two workers.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            first, second = HistoryStats(), HistoryStats()
+            first.update('coloring', self.make_record(3, 5))
+            second.update('coloring', self.make_record(5, 7, error='x'))
+            first.save(os.path.join(tmp, 'stats-w1.json'))
+
+            merged = HistoryStats.load(os.path.join(tmp, 'stats-w1.json')).merge(second)
+            summary = merged.snapshot()['algorithms']['coloring']
+            self.assertEqual(summary['runs'], 2)
+            self.assertEqual(summary['avg_vertices'], 4)
+            self.assertIsNone(HistoryStats.load(os.path.join(tmp, 'missing.json')))
+
+    def test_getHistoryStats_MissingStatsFile_RebuiltFromLog(self):
+        """
+        Test that the aggregates are rebuilt from the run log when stats.json is missing.
+        """
+        saved = (json_utils.LOG_MODE, json_utils.LOG_DIR, json_utils._graph_store,
+                 json_utils._record_writer, json_utils._history_stats)
+        with tempfile.TemporaryDirectory() as tmp:
+            json_utils.LOG_MODE = 'jsonl'
+            json_utils.LOG_DIR = tmp
+            json_utils._graph_store = None
+            json_utils._record_writer = None
+            json_utils._history_stats = None
+            try:
+                for n in (3, 4, 5):
+                    json_utils.save_algorithm_record(
+                        'dfs', {'num_vertices': n, 'adjacency_matrix': [[0] * n for _ in range(n)]}, None, None, 2.0)
+                self.assertEqual(json_utils.load_history_stats_snapshot()['total']['runs'], 3)
+
+                os.remove(os.path.join(tmp, 'stats.json'))
+                json_utils._history_stats = None
+                snapshot = json_utils.load_history_stats_snapshot()
+                self.assertEqual(snapshot['algorithms']['dfs']['runs'], 3)
+                self.assertEqual(snapshot['algorithms']['dfs']['avg_vertices'], 4)
+            finally:
+                (json_utils.LOG_MODE, json_utils.LOG_DIR, json_utils._graph_store,
+                 json_utils._record_writer, json_utils._history_stats) = saved
+
+    def test_loadHistoryStatsSnapshot_AfterPreforkRun_WorkerRunsCountedOnce(self):
+        """
+        Test that a single-process start after a prefork run does not count worker segments
+        both in the rebuilt stats.json and in the merged worker stats files.
+        """
+        saved = (json_utils.LOG_MODE, json_utils.LOG_DIR, json_utils._graph_store,
+                 json_utils._record_writer, json_utils._history_stats, json_utils.LOG_WORKER_ID)
+        with tempfile.TemporaryDirectory() as tmp:
+            json_utils.LOG_MODE = 'jsonl'
+            json_utils.LOG_DIR = tmp
+            json_utils._record_writer = None
+            try:
+                for worker_id, runs in (('w0a', 2), ('w1a', 1)):
+                    json_utils.set_log_worker(worker_id)
+                    for _ in range(runs):
+                        json_utils.save_algorithm_record('bfs', {'num_vertices': 3}, None, None, 1.0)
+
+                json_utils.set_log_worker(None)
+                self.assertEqual(json_utils.load_history_stats_snapshot()['total']['runs'], 3)
+                json_utils.save_algorithm_record('bfs', {'num_vertices': 3}, None, None, 1.0)
+                self.assertEqual(json_utils.load_history_stats_snapshot()['total']['runs'], 4)
+            finally:
+                (json_utils.LOG_MODE, json_utils.LOG_DIR, json_utils._graph_store,
+                 json_utils._record_writer, json_utils._history_stats, json_utils.LOG_WORKER_ID) = saved
+
+    def test_saveAlgorithmRecord_HyphenatedWorkerId_SegmentsAreListed(self):
+        """
+        Test that runs logged under a worker id such as 'node-1w0a' land in segments the readers list.
+        """
+        saved = (json_utils.LOG_MODE, json_utils.LOG_DIR, json_utils._graph_store,
+                 json_utils._record_writer, json_utils._history_stats, json_utils.LOG_WORKER_ID)
+        with tempfile.TemporaryDirectory() as tmp:
+            json_utils.LOG_MODE = 'jsonl'
+            json_utils.LOG_DIR = tmp
+            json_utils._record_writer = None
+            try:
+                json_utils.set_log_worker('node-1w0a')
+                json_utils.save_algorithm_record('bfs', {'num_vertices': 3}, None, None, 1.0)
+
+                self.assertEqual(json_utils.LOG_WORKER_ID, 'node_1w0a')
+                self.assertEqual([worker for worker, _ in run_log.list_segments('bfs', tmp)], ['node_1w0a'])
+                self.assertEqual(len(run_log.load_records(tmp)['bfs']), 1)
+                json_utils.set_log_worker(None)
+                self.assertEqual(json_utils.load_history_stats_snapshot()['total']['runs'], 1)
+            finally:
+                (json_utils.LOG_MODE, json_utils.LOG_DIR, json_utils._graph_store,
+                 json_utils._record_writer, json_utils._history_stats, json_utils.LOG_WORKER_ID) = saved
+
+    def test_writeAlgorithmRecords_ConcurrentThreads_AllCounted(self):
+        """
+        Test that writes from many threads of one process neither fail nor lose counts.
+        """
+        saved = (json_utils.LOG_MODE, json_utils.LOG_DIR, json_utils._graph_store,
+                 json_utils._record_writer, json_utils._history_stats, json_utils.MAX_SEGMENT_BYTES)
+        with tempfile.TemporaryDirectory() as tmp:
+            json_utils.LOG_MODE = 'jsonl'
+            json_utils.LOG_DIR = tmp
+            json_utils._graph_store = None
+            json_utils._record_writer = None
+            json_utils._history_stats = None
+            json_utils.MAX_SEGMENT_BYTES = 2000  # Rotate often
+            errors = []
+
+            def write():
+                try:
+                    for _ in range(25):
+                        json_utils.save_algorithm_record('bfs', {'num_vertices': 2}, None, None, 1.0)
+                except Exception as e:
+                    errors.append(e)
+
+            try:
+                threads = [threading.Thread(target=write) for _ in range(8)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                self.assertEqual(errors, [])
+                self.assertEqual(json_utils.get_history_stats().snapshot()['total']['runs'], 200)
+                self.assertEqual(len(json_utils.load_algorithm_records()['bfs']), 200)
+                self.assertEqual(HistoryStats.load(os.path.join(tmp, 'stats.json')).snapshot()['total']['runs'], 200)
+            finally:
+                (json_utils.LOG_MODE, json_utils.LOG_DIR, json_utils._graph_store,
+                 json_utils._record_writer, json_utils._history_stats, json_utils.MAX_SEGMENT_BYTES) = saved
+
+
+if __name__ == '__main__':
+    unittest.main()
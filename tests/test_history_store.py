@@ -0,0 +1,91 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from logics.history_store import SQLiteHistoryStore
+
+
+class TestSQLiteHistoryStore(unittest.TestCase):
+    """
+    Unit tests for the indexed SQLite run history.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = SQLiteHistoryStore(os.path.join(self.tmp.name, 'history.sqlite3'))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def make_record(self, second, n, error=None):
+        return {
+            'input_data': {'num_vertices': n},
+            'result_matrix': None if error else [[0, 1], [1, 0]],
+            'timestamp': f'2025-05-14T10:00:{second:02d}',
+            'error_message': error
+        }
+
+    def fill(self):
+        self.store.append_records('bfs', [self.make_record(1, 3), self.make_record(2, 5, 'disconnected')])
+        self.store.append_records('dfs', [self.make_record(3, '7'), self.make_record(4, 'abc', 'bad input')])
+        self.store.append_records('beam', [self.make_record(5, 6)])
+
+    def test_journalMode_NewStore_UsesWal(self):
+        """
+        Test that the database runs in WAL mode.
+        """
+        mode = self.store._connection().execute('PRAGMA journal_mode').fetchone()[0]
+        self.assertEqual(mode.lower(), 'wal')
+
+    def test_query_ErrorFilter_ReturnsFailedRunsNewestFirst(self):
+        """
+        Test filtering by the error flag and the newest-first order.
+        """
+        self.fill()
+        page = self.store.query(is_error=True)
+        self.assertEqual(page['total'], 2)
+        self.assertEqual([r['algorithm'] for r in page['records']], ['dfs', 'bfs'])
+        self.assertEqual(page['records'][1]['error_message'], 'disconnected')
+
+    def test_query_VertexBoundsAndPagination_ReturnsRequestedPage(self):
+        """
+        Test vertex bounds (numeric strings are indexed too) and limit/offset.
+        """
+        self.fill()
+        page = self.store.query(min_vertices=5, limit=2, offset=0)
+        self.assertEqual(page['total'], 3)
+        self.assertEqual([r['timestamp'][-2:] for r in page['records']], ['05', '03'])
+
+        page = self.store.query(min_vertices=5, limit=2, offset=2)
+        self.assertEqual([r['timestamp'][-2:] for r in page['records']], ['02'])
+
+    def test_query_AlgorithmAndTimeRange_ReturnsMatchingRuns(self):
+        """
+        Test filtering by algorithm combined with a time range.
+        """
+        self.fill()
+        page = self.store.query(algorithm='bfs', since='2025-05-14T10:00:02')
+        self.assertEqual(page['total'], 1)
+        self.assertEqual(page['records'][0]['input_data']['num_vertices'], 5)
+
+    def test_appendRecords_SeveralThreads_AllRowsStored(self):
+        """
+        Test that concurrent writers (one connection per thread) do not lose rows.
+        """
+        def worker(k):
+            for i in range(10):
+                self.store.append_records('coloring', [self.make_record(i, k)])
+
+        threads = [threading.Thread(target=worker, args=(k,)) for k in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(self.store.load_records()['coloring']), 40)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import sys
+import subprocess
+import tempfile
+import unittest
+from unittest import mock
+
+from logics.lazy_imports import LazyModule, lazy_import, parse_importtime
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestLazyImports(unittest.TestCase):
+    """
+    Unit tests for deferred imports and the import-time report.
+    """
+
+    def test_lazyModule_FirstAttributeAccess_ImportsOnce(self):
+        """
+        Test that the module is imported on first use only, and only once.
+        """
+        module = LazyModule('json')
+        with mock.patch('logics.lazy_imports.importlib.import_module', wraps=__import__('importlib').import_module) as imp:
+            self.assertIn('not loaded', repr(module))
+            imp.assert_not_called()
+            self.assertEqual(module.dumps([1]), '[1]')
+            self.assertEqual(module.loads('2'), 2)
+        imp.assert_called_once_with('json')
+
+    def test_lazyImport_AlreadyImported_ReturnsRealModule(self):
+        """
+        Test that no proxy is created for a module that is already loaded.
+        """
+        self.assertIs(lazy_import('os'), os)
+        self.assertIsInstance(lazy_import('not_imported_yet_module'), LazyModule)
+
+    def test_parseImporttime_Output_ModulesWithDepth(self):
+        """
+        Test parsing of `python -X importtime` lines, including nesting.
+        """
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |     _json\n"
+            "import time:       300 |        420 |   json.decoder\n"
+            "import time:       500 |        920 | json\n"
+        )
+        self.assertEqual(parse_importtime(output), [
+            ('_json', 120, 120, 2),
+            ('json.decoder', 300, 420, 1),
+            ('json', 500, 920, 0),
+        ])
+
+    def test_importRoutes_ColdStart_DoesNotLoadPlottingLibraries(self):
+        """
+        Test that importing the application does not import matplotlib, networkx or numpy.
+        """
+        code = "import sys, routes; print(sorted(m for m in ('matplotlib', 'networkx', 'numpy') if m in sys.modules))"
+        output = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), '[]')
+
+    def test_greedyGetData_SvgRenderer_DoesNotLoadMatplotlib(self):
+        """
+        Test that a coloring form submission with the SVG renderer builds its table colors without matplotlib.
+        """
+        code = (
+            "import sys, types\n"
+            "from logics import greedy_utils\n"
+            "greedy_utils.save_algorithm_record = lambda **record: None\n"
+            "forms = {'num_vertices': '3', 'edge_0_1': '1', 'edge_1_0': '1', 'edge_1_2': '1', 'edge_2_1': '1'}\n"
+            "request = types.SimpleNamespace(method='POST', forms=forms)\n"
+            "table = greedy_utils.get_data(request)[1]\n"
+            "print([row['hex_color'] for row in table], 'matplotlib' in sys.modules)"
+        )
+        env = dict(os.environ, GRAPH_RENDERER='svg', PYTHONPATH=PROJECT_ROOT)
+        with tempfile.TemporaryDirectory() as tmp:
+            output = subprocess.run([sys.executable, '-c', code], cwd=tmp, env=env,
+                                    capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), "['#ff7f0e', '#1f77b4', '#ff7f0e'] False")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import random
+import unittest
+
+from methods.graph import Graph
+from methods.bfs_spanning_tree import bfs_tree, bfs_spanning_tree
+from methods.bitset_graph import random_dense_matrix
+from methods.numpy_bfs import bfs_from_starts, benchmark, numpy_bfs_tree, numpy_bfs_spanning_tree
+
+
+class TestNumpyBfs(unittest.TestCase):
+    """
+    Unit tests for the vectorized (NumPy) BFS and its all-start-vertices mode.
+    """
+
+    def setUp(self):
+        # Path 0-1-2-3 with the chord 1-3, and the isolated vertex 4
+        self.matrix = [
+            [0, 1, 0, 0, 0],
+            [1, 0, 1, 1, 0],
+            [0, 1, 0, 1, 0],
+            [0, 1, 1, 0, 0],
+            [0, 0, 0, 0, 0]
+        ]
+
+    def test_bfsFromStarts_RandomGraphs_SameTreesAsBfsTree(self):
+        """
+        Test that every batched tree equals the queue-based BFS from that start, also in small groups.
+        """
+        rng = random.Random(5)
+        for seed in range(30):
+            n = rng.randint(1, 30)
+            graph = Graph.from_matrix(random_dense_matrix(n, rng.choice([0.05, 0.15, 0.5]), seed))
+            trees, _ = bfs_from_starts(graph, max_cells=rng.choice([1, 200, None]))
+            self.assertEqual([(tree['parent'], tree['order'], tree['edges']) for tree in trees],
+                             [bfs_tree(graph, start) for start in range(n)])
+
+    def test_bfsFromStarts_ArraysMatchTreeDicts(self):
+        """
+        Test that the returned arrays hold the same trees as the per-start dicts built from them.
+        """
+        trees, _ = bfs_from_starts(Graph.from_matrix(self.matrix), starts=[2, 4])
+        self.assertEqual(len(trees), 2)
+        self.assertEqual(trees.parent.tolist(), [trees[0]['parent'], trees[-1]['parent']])
+        self.assertEqual(trees.order[0, :trees.reached[0]].tolist(), trees[0]['order'])
+        self.assertEqual(trees.eccentricity.tolist(), [2, 0])
+        with self.assertRaises(IndexError):
+            trees[2]
+
+    def test_benchmark_SparseGraph_BatchedFasterThanSeparateRuns(self):
+        """
+        Test that one batched call beats a bfs_tree run per start vertex (benchmark checks the trees agree).
+        """
+        row, = benchmark([600], density=0.01)
+        self.assertGreater(row['separate'], 1.5 * row['batched'])
+
+    def test_bfsFromStarts_ChosenStarts_DepthStatistics(self):
+        """
+        Test the per-start depths and the summary over a chosen set of starts.
+        """
+        matrix = [row[:4] for row in self.matrix[:4]]
+        trees, stats = bfs_from_starts(matrix, [0, 1])
+        self.assertEqual([tree['start'] for tree in trees], [0, 1])
+        self.assertEqual(trees[0]['depth'], [0, 1, 2, 2])
+        self.assertEqual((trees[0]['eccentricity'], trees[0]['level_sizes']), (2, [1, 1, 2]))
+        self.assertAlmostEqual(trees[0]['mean_depth'], 5 / 3)
+        self.assertEqual(stats, {'connected': True, 'radius': 1, 'diameter': 2, 'center': [1],
+                                 'mean_depth': (5 / 3 + 1) / 2})
+
+    def test_bfsFromStarts_DisconnectedGraph_UnreachedVertices(self):
+        """
+        Test that vertices outside the component of a start keep depth and parent -1.
+        """
+        trees, stats = bfs_from_starts(self.matrix)
+        self.assertFalse(stats['connected'])
+        self.assertEqual(trees[4]['order'], [4])
+        self.assertEqual(trees[0]['depth'][4], -1)
+        self.assertEqual(trees[0]['parent'][4], -1)
+        self.assertEqual(trees[0]['reached'], 4)
+
+    def test_numpyBfsSpanningTree_SameResultAsBfsSpanningTree(self):
+        """
+        Test the single-start drop-in functions, including the disconnected case.
+        """
+        graph = Graph.from_matrix(self.matrix)
+        self.assertEqual(numpy_bfs_tree(graph, 2), bfs_tree(graph, 2))
+        self.assertEqual(numpy_bfs_spanning_tree(5, graph, 0), bfs_spanning_tree(5, graph, 0))
+        connected = [row[:4] for row in self.matrix[:4]]
+        self.assertEqual(numpy_bfs_spanning_tree(4, connected, 3), bfs_spanning_tree(4, connected, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
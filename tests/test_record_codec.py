@@ -0,0 +1,85 @@
+import json
+import unittest
+
+from logics.record_codec import encode_matrix, encode_edges, decode_matrix, encode_record, decode_record
+
+
+class TestRecordCodec(unittest.TestCase):
+    """
+    Unit tests for the compact edge-list encoding of run records.
+    """
+
+    def test_encodeMatrix_SymmetricAdjacency_StoresUpperTrianglePairs(self):
+        """
+        Test that a symmetric 0/1 matrix becomes a sorted list of vertex pairs.
+        """
+        adj = [
+            [0, 1, 1, 0],
+            [1, 0, 0, 1],
+            [1, 0, 0, 1],
+            [0, 1, 1, 0]
+        ]
+        encoded = encode_matrix(adj)
+        self.assertEqual(encoded, {'n': 4, 'symmetric': True, 'edges': [[0, 1], [0, 2], [1, 3], [2, 3]]})
+        self.assertEqual(decode_matrix(encoded), adj)
+
+    def test_encodeMatrix_WeightedAsymmetric_StoresTriplesAndRoundTrips(self):
+        """
+        Test that weighted and asymmetric matrices survive the round trip.
+        """
+        weights = [
+            [0, 5, 0],
+            [2, 0, 4],
+            [0, 4, 7]
+        ]
+        encoded = encode_matrix(weights)
+        self.assertFalse(encoded['symmetric'])
+        self.assertEqual(encoded['edges'][0], [0, 1, 5])
+        self.assertEqual(decode_matrix(encoded), weights)
+
+    def test_encodeEdges_UpperTriangleEntries_SameAsEncodedMatrix(self):
+        """
+        Test that encoding the entries of a symmetric matrix gives the encoding of the matrix.
+        """
+        weights = [[0, 2, 0], [2, 0, 1], [0, 1, 0]]
+        self.assertEqual(encode_edges(3, [(0, 1, 2), (1, 2, 1)]), encode_matrix(weights))
+        self.assertEqual(encode_edges(3, [(0, 1, 1), (1, 2, 1)]), encode_matrix([[0, 1, 0], [1, 0, 1], [0, 1, 0]]))
+
+    def test_encodeMatrix_NonMatrixValues_ReturnedUnchanged(self):
+        """
+        Test that values which are not square integer matrices are left alone.
+        """
+        for value in (None, [], 'error', [[0, 1]], [[0, '1'], [1, 0]], [{'vertex': 0, 'color_id': 1}]):
+            self.assertEqual(encode_matrix(value), value)
+
+    def test_encodeRecord_FullRecord_DecodesToOriginal(self):
+        """
+        Test that a complete record is restored exactly and is smaller when serialized.
+        """
+        n = 8
+        chain = [[1 if abs(i - j) == 1 else 0 for j in range(n)] for i in range(n)]
+        record = {
+            'input_data': {'num_vertices': n, 'adjacency_matrix': chain, 'start_vertex': 1},
+            'result_matrix': chain,
+            'timestamp': '2025-05-14T10:00:00',
+            'error_message': None
+        }
+        encoded = encode_record(record)
+
+        self.assertEqual(encoded['encoding'], 'edges')
+        self.assertLess(len(json.dumps(encoded)), len(json.dumps(record)))
+        self.assertEqual(decode_record(json.loads(json.dumps(encoded))), record)
+        # The original record is not modified
+        self.assertEqual(record['result_matrix'], chain)
+
+    def test_decodeRecord_LegacyRecord_ReturnedAsIs(self):
+        """
+        Test that records written before the compact encoding are read unchanged.
+        """
+        record = {'input_data': {'num_vertices': 2, 'adjacency_matrix': [[0, 1], [1, 0]]},
+                  'result_matrix': None, 'timestamp': '', 'error_message': 'x'}
+        self.assertIs(decode_record(record), record)
+
+
+if __name__ == '__main__':
+    unittest.main()
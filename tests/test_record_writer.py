@@ -0,0 +1,87 @@
+import threading
+import unittest
+
+from logics.record_writer import RecordWriter
+
+
+class TestRecordWriter(unittest.TestCase):
+    """
+    Unit tests for the background write-behind of run records.
+    """
+
+    def setUp(self):
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def write_batch(self, algorithm_key, records):
+        with self.lock:
+            self.batches.append((algorithm_key, list(records)))
+
+    def written(self, algorithm_key):
+        return [r for key, records in self.batches if key == algorithm_key for r in records]
+
+    def test_submit_ManyRecords_WritesThemInGroupsAndKeepsOrder(self):
+        """
+        Test that queued records are committed in groups and in submission order.
+        """
+        writer = RecordWriter(self.write_batch, flush_interval=0.2, flush_size=50).start()
+        for i in range(120):
+            writer.submit('bfs' if i % 2 else 'dfs', {'i': i})
+        self.assertTrue(writer.flush(timeout=5))
+
+        self.assertEqual([r['i'] for r in self.written('dfs')], list(range(0, 120, 2)))
+        self.assertEqual([r['i'] for r in self.written('bfs')], list(range(1, 120, 2)))
+        self.assertLess(len(self.batches), 120)
+        writer.close()
+
+    def test_close_PendingRecords_DrainsQueue(self):
+        """
+        Test that close() writes every record that was still queued.
+        """
+        writer = RecordWriter(self.write_batch, flush_interval=10, flush_size=1000).start()
+        for i in range(30):
+            writer.submit('beam', {'i': i})
+        writer.close()
+
+        self.assertFalse(writer.running)
+        self.assertEqual(len(self.written('beam')), 30)
+
+    def test_submit_AfterClose_WritesSynchronously(self):
+        """
+        Test that a stopped writer still persists records in the calling thread.
+        """
+        writer = RecordWriter(self.write_batch).start()
+        writer.close()
+        writer.submit('coloring', {'i': 1})
+        self.assertEqual(self.written('coloring'), [{'i': 1}])
+
+    def test_submit_QueueFullWithDropPolicy_CountsDroppedRecords(self):
+        """
+        Test the 'drop' backpressure policy while the writer is stuck on a slow write.
+        """
+        release = threading.Event()
+
+        def slow_write(algorithm_key, records):
+            release.wait(5)
+            self.write_batch(algorithm_key, records)
+
+        writer = RecordWriter(slow_write, max_queue_size=2, flush_interval=0.01,
+                              flush_size=1, on_full='drop').start()
+        for i in range(20):
+            writer.submit('bfs', {'i': i})
+        release.set()
+        writer.close()
+
+        self.assertGreater(writer.dropped, 0)
+        self.assertEqual(len(self.written('bfs')) + writer.dropped, 20)
+
+    def test_init_UnknownPolicy_RaisesValueError(self):
+        """
+        Test that an unknown backpressure policy is rejected.
+        """
+        with self.assertRaises(ValueError):
+            RecordWriter(self.write_batch, on_full='explode')
+
+
+if __name__ == '__main__':
+    unittest.main()
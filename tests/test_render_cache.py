@@ -0,0 +1,135 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from methods import render_cache
+from methods.render_cache import RenderCache, ImageSweeper, render_key, cached_render, cached_render_path
+from methods.graph_coloring_algorithm import draw_colored_graph
+
+
+class TestRenderCache(unittest.TestCase):
+    """
+    Unit tests for the content-addressed PNG render cache.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = RenderCache(self.tmp.name, max_bytes=1000)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_renderKey_SameInputs_SameKey(self):
+        """
+        Test that the key depends on the inputs only, not on keyword order.
+        """
+        first = render_key('bfs', adjacency=[[0, 1], [1, 0]], tree_edges=[[0, 1]])
+        second = render_key('bfs', tree_edges=[[0, 1]], adjacency=[[0, 1], [1, 0]])
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, render_key('dfs', adjacency=[[0, 1], [1, 0]], tree_edges=[[0, 1]]))
+        self.assertNotEqual(first, render_key('bfs', adjacency=[[0, 1], [1, 0]], tree_edges=[]))
+
+    def test_putGet_StoredImage_ReturnedOnHit(self):
+        """
+        Test that a stored image is returned by key and a miss returns None.
+        """
+        self.cache.put('abc', b'png-bytes')
+        self.assertEqual(self.cache.get('abc'), b'png-bytes')
+        self.assertIsNone(self.cache.get('missing'))
+
+    def test_put_OverSizeLimit_EvictsLeastRecentlyUsed(self):
+        """
+        Test that eviction removes the image used longest ago, keeping recently read ones.
+        """
+        for i, key in enumerate(('a', 'b', 'c')):
+            self.cache.put(key, b'x' * 400)
+            os.utime(self.cache.path(key), (i, i))
+        # 'c' is over the limit and evicted 'a'; reading 'b' marks it as recently used
+        self.assertIsNone(self.cache.get('a'))
+        self.cache.get('b')
+        self.cache.put('d', b'x' * 400)
+
+        self.assertIsNotNone(self.cache.get('b'))
+        self.assertIsNone(self.cache.get('c'))
+        self.assertIsNotNone(self.cache.get('d'))
+
+    def test_cachedRender_RepeatedKey_RendersOnce(self):
+        """
+        Test that the render function is called only on a cache miss.
+        """
+        render = mock.Mock(return_value=b'png-bytes')
+        with mock.patch.object(render_cache, 'default_cache', self.cache):
+            self.assertEqual(cached_render('key', render), b'png-bytes')
+            self.assertEqual(cached_render('key', render), b'png-bytes')
+        render.assert_called_once()
+
+    def test_drawColoredGraph_RepeatedSubmission_SkipsMatplotlib(self):
+        """
+        Test that the second identical coloring is served from the cache without drawing.
+        """
+        cache = RenderCache(self.tmp.name, max_bytes=10 ** 7)
+        adjacency = [[0, 1, 1], [1, 0, 0], [1, 0, 0]]
+        coloring = {0: 1, 1: 2, 2: 2}
+        with mock.patch.object(render_cache, 'default_cache', cache):
+            first = draw_colored_graph(adjacency, coloring, 2)
+            with mock.patch('methods.graph_coloring_algorithm.render_png') as render:
+                second = draw_colored_graph(adjacency, coloring, 2)
+        render.assert_not_called()
+        self.assertTrue(first.startswith('data:image/png;base64,'))
+        self.assertEqual(first, second)
+
+    def test_cachedRenderPath_DifferentResults_DistinctPaths(self):
+        """
+        Test that every result gets its own file and a repeated result reuses it without rendering.
+        """
+        render = mock.Mock(side_effect=[b'first', b'second'])
+        with mock.patch.object(render_cache, 'default_cache', self.cache):
+            first = cached_render_path(render_key('bfs', tree_edges=[[0, 1]]), render)
+            second = cached_render_path(render_key('bfs', tree_edges=[[1, 2]]), render)
+            again = cached_render_path(render_key('bfs', tree_edges=[[0, 1]]), render)
+        self.assertNotEqual(first, second)
+        self.assertEqual(first, again)
+        self.assertEqual(render.call_count, 2)
+        with open(first, 'rb') as f:
+            self.assertEqual(f.read(), b'first')
+
+    def test_evict_MinAge_KeepsRecentImages(self):
+        """
+        Test that images younger than min_age survive eviction even over the size limit.
+        """
+        cache = RenderCache(self.tmp.name, max_bytes=100)
+        with open(cache.path('old'), 'wb') as f:
+            f.write(b'x' * 400)
+        os.utime(cache.path('old'), (0, 0))
+        with open(cache.path('new'), 'wb') as f:
+            f.write(b'x' * 400)
+
+        self.assertEqual(cache.evict(min_age=300), 400)
+        self.assertIsNone(cache.get('old'))
+        self.assertIsNotNone(cache.get('new'))
+
+    def test_imageSweeper_FilesWrittenElsewhere_TrimmedInBackground(self):
+        """
+        Test that the sweeper bounds the directory even when another process wrote the files.
+        """
+        for i in range(5):
+            path = self.cache.path(f'k{i}')
+            with open(path, 'wb') as f:
+                f.write(b'x' * 400)
+            os.utime(path, (i, i))
+
+        sweeper = ImageSweeper(self.cache, interval=0.01).start()
+        try:
+            for _ in range(200):
+                if self.cache._directory_size() <= self.cache.max_bytes:
+                    break
+                time.sleep(0.01)
+        finally:
+            sweeper.close()
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ['k3.png', 'k4.png'])
+
+
+if __name__ == '__main__':
+    unittest.main()
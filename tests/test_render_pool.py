@@ -0,0 +1,74 @@
+import os
+import time
+import tempfile
+import unittest
+from unittest import mock
+
+from methods import render_cache, render_pool
+from methods.render_cache import RenderCache
+from methods.render_pool import run_render, start_render_pool, stop_render_pool, RenderTimeout
+from methods.bfs_spanning_tree import _render_bfs_png
+from methods.graph_coloring_algorithm import draw_colored_graph
+from methods.graph import Graph
+
+
+class TestRenderPool(unittest.TestCase):
+    """
+    Unit tests for rendering in a pool of worker processes.
+    """
+
+    def tearDown(self):
+        stop_render_pool()
+
+    def test_runRender_NoPool_RunsInCallingProcess(self):
+        """
+        Test that without a started pool the job runs inline.
+        """
+        self.assertEqual(run_render(os.getpid), os.getpid())
+
+    def test_runRender_Pool_RendersInWorkerWithSameResult(self):
+        """
+        Test that a render job runs in another process and gives the same PNG as inline rendering.
+        """
+        args = (Graph.from_matrix([[0, 1, 1], [1, 0, 0], [1, 0, 0]]), 3, [(0, 1), (0, 2)])
+        inline = _render_bfs_png(*args)
+
+        self.assertIsNotNone(start_render_pool(1))
+        self.assertNotEqual(run_render(os.getpid), os.getpid())
+        self.assertEqual(run_render(_render_bfs_png, *args), inline)
+
+    def test_runRender_SlowJob_RaisesRenderTimeout(self):
+        """
+        Test that a job running longer than the timeout is given up.
+        """
+        start_render_pool(1)
+        started = time.perf_counter()
+        with self.assertRaises(RenderTimeout):
+            run_render(time.sleep, 5, timeout=0.2)
+        self.assertLess(time.perf_counter() - started, 2)
+
+    def test_startRenderPool_ZeroWorkers_NoPool(self):
+        """
+        Test that RENDER_WORKERS=0 keeps rendering in the request.
+        """
+        with mock.patch.dict(os.environ, {'RENDER_WORKERS': '0'}):
+            self.assertIsNone(start_render_pool())
+        self.assertIsNone(render_pool._pool)
+
+    def test_drawColoredGraph_RenderTimeout_ReturnsNoImage(self):
+        """
+        Test that a timed-out render leaves the page without an image instead of failing.
+        """
+        def timing_out(func):
+            def run(*args):
+                raise RenderTimeout("too slow")
+            return run
+
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.object(render_cache, 'default_cache', RenderCache(tmp)), \
+                mock.patch('methods.graph_coloring_algorithm.offloaded', timing_out):
+            self.assertIsNone(draw_colored_graph([[0, 1], [1, 0]], {0: 1, 1: 2}, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
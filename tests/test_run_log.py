@@ -0,0 +1,99 @@
+import os
+import json
+import tempfile
+import unittest
+
+from logics import run_log
+
+
+class TestRunLog(unittest.TestCase):
+    """
+    Unit tests for the append-only JSON Lines run log.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log_dir = os.path.join(self.tmp.name, 'runs')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_record(self, i, error=None):
+        return {
+            'input_data': {'num_vertices': 3, 'adjacency_matrix': [[0, 1, 0], [1, 0, 1], [0, 1, 0]]},
+            'result_matrix': None,
+            'timestamp': f'2025-05-14T10:00:{i:02d}',
+            'error_message': error
+        }
+
+    def test_appendRecords_TwoBatches_WritesOneLinePerRecord(self):
+        """
+        Test that each record becomes exactly one line and the order is preserved.
+        """
+        run_log.append_records('bfs', [self.make_record(0), self.make_record(1)], self.log_dir)
+        run_log.append_records('bfs', [self.make_record(2)], self.log_dir)
+
+        with open(run_log.segment_path('bfs', self.log_dir)) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 3)
+
+        records = list(run_log.iter_records('bfs', self.log_dir))
+        self.assertEqual([r['timestamp'][-2:] for r in records], ['00', '01', '02'])
+
+    def test_appendRecords_SegmentLimitExceeded_RotatesAndKeepsOrder(self):
+        """
+        Test that a full segment is rotated and reading returns records in write order.
+        """
+        for i in range(10):
+            run_log.append_records('dfs', [self.make_record(i)], self.log_dir, max_segment_bytes=300)
+
+        groups = run_log.list_segments('dfs', self.log_dir)
+        self.assertEqual(len(groups), 1)
+        self.assertGreater(len(groups[0][1]), 1)
+
+        records = list(run_log.iter_records('dfs', self.log_dir))
+        self.assertEqual([int(r['timestamp'][-2:]) for r in records], list(range(10)))
+
+    def test_loadRecords_PerWorkerSegments_MergesByTimestamp(self):
+        """
+        Test that records from several worker segments are merged into the legacy view.
+        """
+        run_log.append_records('beam', [self.make_record(1), self.make_record(4)], self.log_dir, worker_id='w1')
+        run_log.append_records('beam', [self.make_record(2), self.make_record(3)], self.log_dir, worker_id='w2')
+        run_log.append_records('coloring', [self.make_record(5, error='boom')], self.log_dir)
+
+        data = run_log.load_records(self.log_dir)
+        self.assertEqual(sorted(data), ['beam', 'coloring'])
+        self.assertEqual([int(r['timestamp'][-2:]) for r in data['beam']], [1, 2, 3, 4])
+        self.assertEqual(data['coloring'][0]['error_message'], 'boom')
+
+    def test_iterSegment_TruncatedLine_SkipsIt(self):
+        """
+        Test that a partially written line does not break reading.
+        """
+        run_log.append_records('bfs', [self.make_record(0)], self.log_dir)
+        with open(run_log.segment_path('bfs', self.log_dir), 'a') as f:
+            f.write('{"input_data": {"num_ver')
+
+        self.assertEqual(len(list(run_log.iter_records('bfs', self.log_dir))), 1)
+
+    def test_migrateJsonLog_LegacyFile_MovesRecordsIntoSegments(self):
+        """
+        Test that the legacy input_data.json is migrated once and renamed afterwards.
+        """
+        json_path = os.path.join(self.tmp.name, 'input_data.json')
+        legacy = {'bfs': [self.make_record(0), self.make_record(1)], 'dfs': [self.make_record(2)]}
+        with open(json_path, 'w') as f:
+            json.dump(legacy, f, indent=4)
+
+        counts = run_log.migrate_json_log(json_path, self.log_dir)
+
+        self.assertEqual(counts, {'bfs': 2, 'dfs': 1})
+        self.assertFalse(os.path.exists(json_path))
+        self.assertTrue(os.path.exists(json_path + '.migrated'))
+        self.assertEqual(run_log.load_records(self.log_dir), legacy)
+        self.assertEqual(run_log.migrate_json_log(json_path, self.log_dir), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
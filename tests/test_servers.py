@@ -0,0 +1,204 @@
+import os
+import sys
+import time
+import signal
+import socket
+import threading
+import subprocess
+import http.client
+import unittest
+
+from servers import make_threaded_server
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PREFORK_SCRIPT = """
+import os, sys
+from servers import serve_prefork
+
+def app(environ, start_response):
+    body = str(os.getpid()).encode()
+    start_response('200 OK', [('Content-Type', 'text/plain'), ('Content-Length', str(len(body)))])
+    return [body]
+
+serve_prefork(app, '127.0.0.1', int(sys.argv[1]), workers=2, threads=2, keepalive_timeout=0.5, quiet=True)
+"""
+
+
+def echo_app(environ, start_response):
+    if environ['PATH_INFO'] == '/slow':
+        time.sleep(0.5)
+    if environ['PATH_INFO'] == '/stream':
+        # A generator has no known length, so the connection must be closed after it
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        return (part for part in [b'a', b'b'])
+    body = environ['PATH_INFO'].encode()
+    if environ['PATH_INFO'] == '/echo':
+        body = environ['wsgi.input'].read(int(environ.get('CONTENT_LENGTH') or 0))
+    start_response('200 OK', [('Content-Type', 'text/plain'), ('Content-Length', str(len(body)))])
+    return [body]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class TestServers(unittest.TestCase):
+    """
+    Unit tests for the threaded keep-alive server and the prefork server.
+    """
+
+    def setUp(self):
+        self.server = make_threaded_server('127.0.0.1', 0, echo_app, threads=4, keepalive_timeout=2, quiet=True)
+        self.port = self.server.server_port
+        thread = threading.Thread(target=self.server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+        thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_threadedServer_TwoRequests_ReuseOneConnection(self):
+        """
+        Test that an HTTP/1.1 client gets both responses over the same connection,
+        even when the application does not read the request body.
+        """
+        connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=5)
+        connection.request('POST', '/first', body=b'unread body')
+        response = connection.getresponse()
+        self.assertEqual(response.read(), b'/first')
+        self.assertEqual(response.version, 11)
+        first_socket = connection.sock
+
+        connection.request('GET', '/second')
+        response = connection.getresponse()
+        self.assertEqual(response.read(), b'/second')
+        self.assertIs(connection.sock, first_socket)
+        connection.close()
+
+    def test_threadedServer_BodyReadByApp_NextRequestOnSameConnection(self):
+        """
+        Test that a body read by the application is not read again from the connection,
+        so the following request on it is served normally.
+        """
+        connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=5)
+        connection.request('POST', '/echo', body=b'a=1',
+                           headers={'Content-Type': 'application/x-www-form-urlencoded'})
+        response = connection.getresponse()
+        self.assertEqual(response.read(), b'a=1')
+        first_socket = connection.sock
+
+        connection.request('GET', '/second')
+        response = connection.getresponse()
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.read(), b'/second')
+        self.assertIs(connection.sock, first_socket)
+        connection.close()
+
+    def test_threadedServer_UnknownLength_ClosesConnection(self):
+        """
+        Test that a response without Content-Length is ended by closing the connection.
+        """
+        connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=5)
+        connection.request('GET', '/stream')
+        response = connection.getresponse()
+        self.assertEqual(response.getheader('Connection'), 'close')
+        self.assertEqual(response.read(), b'ab')
+        connection.close()
+
+    def test_threadedServer_SlowRequests_ServedConcurrently(self):
+        """
+        Test that slow requests on separate connections run in parallel threads.
+        """
+        results = []
+
+        def fetch():
+            connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=5)
+            connection.request('GET', '/slow')
+            results.append(connection.getresponse().read())
+            connection.close()
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=fetch) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [b'/slow'] * 4)
+        self.assertLess(time.perf_counter() - started, 1.5)
+
+    def test_threadedServer_IdleKeepAliveConnections_DoNotHoldThreads(self):
+        """
+        Test that more idle keep-alive connections than threads do not delay a new request,
+        and that a parked connection is served again and closed after the keep-alive timeout.
+        """
+        idle = []
+        for _ in range(6):
+            connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=5)
+            connection.request('GET', '/first')
+            self.assertEqual(connection.getresponse().read(), b'/first')
+            idle.append(connection)
+        # A connection that never sends a request (a browser's preconnect)
+        silent = socket.create_connection(('127.0.0.1', self.port))
+
+        started = time.perf_counter()
+        connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=5)
+        connection.request('GET', '/new')
+        self.assertEqual(connection.getresponse().read(), b'/new')
+        self.assertLess(time.perf_counter() - started, 0.5)
+        connection.close()
+
+        idle[0].request('GET', '/again')
+        self.assertEqual(idle[0].getresponse().read(), b'/again')
+
+        # The server closes the silent connection once keepalive_timeout has passed
+        silent.settimeout(5)
+        started = time.perf_counter()
+        self.assertEqual(silent.recv(1), b'')
+        self.assertLess(time.perf_counter() - started, 4)
+        silent.close()
+        for connection in idle:
+            connection.close()
+
+    @unittest.skipUnless(hasattr(os, 'fork'), "prefork needs os.fork")
+    def test_preforkServer_Sighup_ReplacesWorkersAndSigtermStops(self):
+        """
+        Test that the prefork server answers from worker processes, replaces them on
+        SIGHUP and exits cleanly on SIGTERM.
+        """
+        port = free_port()
+        process = subprocess.Popen([sys.executable, '-c', PREFORK_SCRIPT, str(port)], cwd=PROJECT_ROOT)
+        try:
+            def worker_pid():
+                for _ in range(100):
+                    try:
+                        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+                        connection.request('GET', '/')
+                        pid = int(connection.getresponse().read())
+                        connection.close()
+                        return pid
+                    except (ConnectionError, OSError):
+                        time.sleep(0.05)
+                self.fail("prefork server does not answer")
+
+            first = worker_pid()
+            self.assertNotEqual(first, process.pid)
+
+            process.send_signal(signal.SIGHUP)
+            deadline = time.monotonic() + 10
+            while worker_pid() == first or os.path.exists(f'/proc/{first}'):
+                self.assertLess(time.monotonic(), deadline, "old worker was not replaced")
+                time.sleep(0.1)
+
+            process.send_signal(signal.SIGTERM)
+            self.assertEqual(process.wait(timeout=10), 0)
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+
+
+if __name__ == '__main__':
+    unittest.main()
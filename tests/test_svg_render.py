@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from unittest import mock
+
+from methods import render_cache, svg_render
+from methods.render_cache import RenderCache
+from methods.svg_render import render_svg, renderer_for, palette
+from methods.bfs_spanning_tree import draw_bfs_graph
+
+SVG_NS = '{http://www.w3.org/2000/svg}'
+
+
+class TestSvgRender(unittest.TestCase):
+    """
+    Unit tests for the pure-Python SVG graph renderer.
+    """
+
+    def test_renderSvg_Graph_DrawsEveryNodeAndEdge(self):
+        """
+        Test that the markup is valid XML with one circle per node and one line per edge.
+        """
+        positions = {1: (0.0, 0.0), 2: (1.0, 0.0), 3: (0.5, 1.0)}
+        svg = render_svg(positions, [(1, 2), (2, 3), (1, 3)], [(1, 2)], title='Tree')
+
+        root = ET.fromstring(svg)
+        lines = root.findall(f'{SVG_NS}line')
+        self.assertEqual(len(root.findall(f'{SVG_NS}circle')), 3)
+        self.assertEqual(len(lines), 4)
+        self.assertEqual([line.get('stroke') for line in lines].count('red'), 1)
+        self.assertIn('Tree', [text.text for text in root.findall(f'{SVG_NS}text')])
+
+    def test_renderSvg_ColorsAndLabels_UsedAndEscaped(self):
+        """
+        Test per-node colors, the default color and escaping of label text.
+        """
+        svg = render_svg({0: (0, 0), 1: (1, 1)}, [(0, 1)], node_colors={0: '#ff0000'}, labels={0: '<a>', 1: 'b'})
+
+        root = ET.fromstring(svg)
+        fills = [circle.get('fill') for circle in root.findall(f'{SVG_NS}circle')]
+        self.assertEqual(fills, ['#ff0000', 'lightblue'])
+        self.assertIn('<a>', [text.text for text in root.findall(f'{SVG_NS}text')])
+
+    def test_renderSvg_SingleNode_StaysInsidePicture(self):
+        """
+        Test that a graph without extent is centered instead of dividing by zero.
+        """
+        root = ET.fromstring(render_svg({0: (0.3, 0.3)}, [], size=200))
+        circle = root.find(f'{SVG_NS}circle')
+        self.assertEqual((circle.get('cx'), circle.get('cy')), ('100', '100'))
+
+    def test_palette_ManyColors_AllDistinct(self):
+        """
+        Test that the palette matches tab10 for few colors and stays distinct beyond it.
+        """
+        self.assertEqual(palette(2), ['#1f77b4', '#ff7f0e'])
+        self.assertEqual(len(set(palette(25))), 25)
+
+    def test_rendererFor_Environment_PerPageOverride(self):
+        """
+        Test the default renderer and the per-page override, ignoring unknown values.
+        """
+        env = {'GRAPH_RENDERER': 'svg', 'GRAPH_RENDERER_BFS': 'png', 'GRAPH_RENDERER_DFS': 'gif'}
+        with mock.patch.dict(os.environ, env):
+            default = svg_render._renderer_setting('GRAPH_RENDERER', 'png')
+            self.assertEqual(default, 'svg')
+            self.assertEqual(svg_render._renderer_setting('GRAPH_RENDERER_BFS', default), 'png')
+            self.assertEqual(svg_render._renderer_setting('GRAPH_RENDERER_DFS', default), 'svg')
+        self.assertEqual(renderer_for('unknown'), svg_render.DEFAULT_RENDERER)
+
+    def test_drawBfsGraph_SvgRenderer_SkipsMatplotlib(self):
+        """
+        Test that a page configured for SVG writes an .svg image without touching matplotlib.
+        """
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.dict(svg_render.RENDERERS, {'bfs': 'svg'}), \
+                mock.patch.object(render_cache, 'svg_cache', RenderCache(os.path.relpath(tmp), suffix='.svg')), \
+                mock.patch('methods.bfs_spanning_tree.render_png') as render_png:
+            path = draw_bfs_graph(None, [[0, 1], [1, 0]], 2, [(0, 1)])
+            self.assertTrue(path.endswith('.svg'))
+            with open(path[1:]) as f:
+                self.assertTrue(f.read().startswith('<svg'))
+        render_png.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
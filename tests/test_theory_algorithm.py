@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import theory_algorithm
+from theory_algorithm import get_theory, prebuild_theory
+
+
+class TestTheoryCache(unittest.TestCase):
+    """
+    Unit tests for the compiled theory cache.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'theory.md')
+        with open(self.path, 'w') as f:
+            f.write('# BFS\n\nBreadth-first search.')
+        theory_algorithm._theory_cache.clear()
+
+    def tearDown(self):
+        theory_algorithm._theory_cache.clear()
+        self.tmp.cleanup()
+
+    def test_getTheory_RepeatedCalls_CompilesMarkdownOnce(self):
+        """
+        Test that the Markdown conversion runs only for the first request.
+        """
+        with mock.patch('theory_algorithm.markdown.markdown', wraps=theory_algorithm.markdown.markdown) as md:
+            first = get_theory(self.path)
+            second = get_theory(self.path)
+        self.assertIn('<h1>BFS</h1>', first)
+        self.assertEqual(first, second)
+        self.assertEqual(md.call_count, 1)
+
+    def test_getTheory_FileChanged_RecompilesTheory(self):
+        """
+        Test that a newer modification time invalidates the cached HTML.
+        """
+        get_theory(self.path)
+        with open(self.path, 'w') as f:
+            f.write('# DFS')
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        self.assertIn('<h1>DFS</h1>', get_theory(self.path))
+
+    def test_getTheory_MtimeCheckDisabled_SkipsStat(self):
+        """
+        Test that with CHECK_MTIME off a cached page is served without touching the disk.
+        """
+        get_theory(self.path)
+        with mock.patch.object(theory_algorithm, 'CHECK_MTIME', False), \
+                mock.patch('theory_algorithm.os.stat') as stat:
+            self.assertIn('<h1>BFS</h1>', get_theory(self.path))
+        stat.assert_not_called()
+
+    def test_prebuildTheory_Directory_CachesEveryMarkdownFile(self):
+        """
+        Test that prebuilding compiles all .md files under the paths used by the routes.
+        """
+        with open(os.path.join(self.tmp.name, 'notes.txt'), 'w') as f:
+            f.write('not theory')
+        self.assertEqual(prebuild_theory(self.tmp.name), 1)
+        self.assertIn(f'{self.tmp.name}/theory.md', theory_algorithm._theory_cache)
+
+    def test_prebuildTheory_BrokenFileOrMissingDirectory_ReportedNotRaised(self):
+        """
+        Test that a file that fails to compile is skipped and left to get_theory,
+        and that a missing theory directory does not stop the start-up.
+        """
+        with open(os.path.join(self.tmp.name, 'broken.md'), 'w') as f:
+            f.write('# Broken')
+        convert = theory_algorithm.markdown.markdown
+
+        def failing_markdown(text):
+            if 'Broken' in text:
+                raise ValueError("cannot convert")
+            return convert(text)
+
+        with mock.patch('theory_algorithm.markdown.markdown', side_effect=failing_markdown), \
+                mock.patch('sys.stderr'):
+            self.assertEqual(prebuild_theory(self.tmp.name), 1)
+            self.assertEqual(get_theory(f'{self.tmp.name}/broken.md'), "Error loading theory: cannot convert")
+            self.assertEqual(prebuild_theory(os.path.join(self.tmp.name, 'missing')), 0)
+        self.assertIn(f'{self.tmp.name}/theory.md', theory_algorithm._theory_cache)
+        self.assertIn('<h1>Broken</h1>', get_theory(f'{self.tmp.name}/broken.md'))
+
+    def test_getTheory_MissingFile_ReturnsErrorMessage(self):
+        """
+        Test that a missing file still produces the error text instead of an exception.
+        """
+        self.assertTrue(get_theory(os.path.join(self.tmp.name, 'missing.md')).startswith('Error loading theory'))
+
+
+if __name__ == '__main__':
+    unittest.main()
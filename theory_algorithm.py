@@ -1,8 +1,51 @@
+import os
+import sys
+import threading
 import markdown  # Импортируем модуль для преобразования Markdown в HTML
 
+# Папка с Markdown-файлами теории
+THEORY_DIR = 'static/theory'
+
+# Проверять ли время изменения файла при каждом запросе.
+# В продакшене файлы теории не меняются, проверку можно отключить: THEORY_CHECK_MTIME=0
+CHECK_MTIME = os.environ.get('THEORY_CHECK_MTIME', '1').lower() not in ('0', 'off', 'false', 'no')
+
+# Кэш скомпилированной теории: путь к файлу -> (время изменения, HTML)
+_theory_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _compile_theory(pathToFile):
+    """
+    Читает Markdown-файл, преобразует его в HTML и кладёт результат в кэш.
+
+    Вход:
+        pathToFile (str): Путь к .md файлу с теорией.
+
+    Выход:
+        str: HTML-версия текста.
+    """
+    # Время изменения берём до чтения: если файл поменяют во время чтения,
+    # следующий запрос увидит новое время и перекомпилирует теорию
+    mtime = os.stat(pathToFile).st_mtime_ns
+
+    # Открываем файл в режиме чтения
+    with open(pathToFile) as file:
+        theory_md = file.read()  # Считываем весь текст из файла
+
+    # Преобразуем Markdown-текст в HTML
+    theory_html = markdown.markdown(theory_md)
+
+    with _cache_lock:
+        _theory_cache[pathToFile] = (mtime, theory_html)
+    return theory_html
+
+
 def get_theory(pathToFile):
     """
     Читает содержимое Markdown-файла по указанному пути и возвращает его в виде HTML.
+    Скомпилированный HTML кэшируется по пути и времени изменения файла, поэтому
+    Markdown преобразуется заново только после изменения файла.
 
     Вход:
         pathToFile (str): Путь к .md файлу с теорией.
@@ -12,15 +55,48 @@ def get_theory(pathToFile):
              Сообщение об ошибке, если произошёл сбой при чтении или парсинге.
     """
     try:
-        # Открываем файл в режиме чтения
-        with open(pathToFile) as file:
-            theory_md = file.read()  # Считываем весь текст из файла
+        cached = _theory_cache.get(pathToFile)
 
-        # Преобразуем Markdown-текст в HTML
-        theory_html = markdown.markdown(theory_md)
+        if cached is not None:
+            # Без проверки времени изменения отдаём кэш сразу, даже без обращения к диску
+            if not CHECK_MTIME or os.stat(pathToFile).st_mtime_ns == cached[0]:
+                return cached[1]
 
-        return theory_html  # Возвращаем HTML-версию теории
+        return _compile_theory(pathToFile)  # Возвращаем HTML-версию теории
 
     except Exception as e:
         # В случае любой ошибки возвращаем её описание
         return f"Error loading theory: {e}"
+
+
+def prebuild_theory(directory=THEORY_DIR):
+    """
+    Заранее компилирует все .md файлы из папки с теорией (вызывается при старте приложения),
+    чтобы преобразование Markdown не попадало во время обработки запросов.
+    Ошибки не останавливают запуск: они выводятся в stderr, а файл, который не удалось
+    скомпилировать, компилируется при первом запросе (get_theory вернёт текст ошибки).
+
+    Вход:
+        directory (str): Папка с Markdown-файлами.
+
+    Выход:
+        int: Количество скомпилированных файлов.
+    """
+    try:
+        names = sorted(os.listdir(directory))
+    except OSError as e:
+        print(f"Theory is not prebuilt: {e}", file=sys.stderr)
+        return 0
+
+    count = 0
+    for name in names:
+        if name.endswith('.md'):
+            # Пути в том же виде, в каком их передают маршруты: 'static/theory/<файл>.md'
+            path = f'{directory}/{name}'
+            try:
+                _compile_theory(path)
+            except Exception as e:
+                print(f"Theory {path} is not prebuilt: {e}", file=sys.stderr)
+                continue
+            count += 1
+    return count
@@ -113,7 +113,11 @@
                             </div>
                             <div class="graph-plot">
                                 <h3>Tree Visualization</h3>
-                                <img src="/static/dynamic/graphs/spanning_tree.png?{{ year }}" alt="Spanning Tree">
+                                % if image_path:
+                                    <img src="/{{ image_path }}" alt="Spanning Tree">
+                                % else:
+                                    <p>The picture took too long to render and is not shown. Please try again.</p>
+                                % end
                             </div>
                         % end
                     % else:
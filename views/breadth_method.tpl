@@ -116,6 +116,9 @@
                             % if graph_image_path:
                                 <!-- Изображение построенного графа -->
                                 <img src="{{ graph_image_path }}" alt="Graph" id="graph-image">
+                            % elif result_matrix:
+                                <!-- Дерево построено, но рисунок не успел отрисоваться -->
+                                <p>The picture took too long to render and is not shown. Please try again.</p>
                             % else:
                                 <p>Graph will be displayed here after processing.</p>
                             % end
@@ -101,6 +101,9 @@
                             <p class="error">{{error}}</p>
                         % elif graph_path:
                             <img src="/{{graph_path}}" alt="Spanning Tree">
+                        % elif tree_matrix:
+                            <!-- Tree is ready but the picture timed out -->
+                            <p>The picture took too long to render and is not shown. Please try again.</p>
                         % else:
                             <p>Graph will be displayed here after processing.</p>
                         % end
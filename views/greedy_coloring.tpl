@@ -76,6 +76,9 @@
                             <!-- Display generated graph image or fallback text -->
                             % if graph_image_base64:
                                 <img src="{{ graph_image_base64 }}" alt="Colored Graph">
+                            % elif coloring_result_table:
+                                <!-- Coloring is ready but the picture timed out -->
+                                <p>The picture took too long to render and is not shown. Please try again.</p>
                             % else:
                                 <p>Graph will be displayed here after processing.</p>
                             % end
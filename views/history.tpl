@@ -0,0 +1,48 @@
+% rebase('layout.tpl', title='History', year=year)
+
+<div class="main-container">
+    <div class="description-container">
+        <h1 class="description-header">Run history: {{ algorithm.upper() }}</h1>
+
+        % if get('error'):
+            <p class="error-message">{{ error }}</p>
+        % else:
+            <!-- Newest runs first; every page is read straight from the run log -->
+            <table class="colors-table">
+                <thead>
+                    <tr>
+                        <th>Time</th>
+                        <th>Vertices</th>
+                        <th>Start vertex</th>
+                        <th>Duration, ms</th>
+                        <th>Result</th>
+                    </tr>
+                </thead>
+                <tbody>
+                    % for record in records:
+                    % input_data = record.get('input_data') or {}
+                    <tr>
+                        <td>{{ record.get('timestamp', '') }}</td>
+                        <td>{{ input_data.get('num_vertices', '') }}</td>
+                        <td>{{ input_data.get('start_vertex') if input_data.get('start_vertex') is not None else '—' }}</td>
+                        <td>{{ record.get('duration_ms', '—') }}</td>
+                        <td>{{ record['error_message'] if record.get('error_message') else 'OK' }}</td>
+                    </tr>
+                    % end
+                    % if not records:
+                    <tr>
+                        <td colspan="5">No runs recorded yet.</td>
+                    </tr>
+                    % end
+                </tbody>
+            </table>
+
+            <p>
+                <a href="/history/{{ algorithm }}?limit={{ limit }}" class="button">Newest</a>
+                % if next_cursor:
+                    <a href="/history/{{ algorithm }}?limit={{ limit }}&cursor={{ next_cursor }}" class="button">Older</a>
+                % end
+            </p>
+        % end
+    </div>
+</div>